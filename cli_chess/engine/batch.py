@@ -0,0 +1,63 @@
+from typing import Sequence
+
+import numpy as np
+
+from engine.evaluation import EG_SQUARE_SCORES, MAX_PHASE, MG_SQUARE_SCORES, PHASE_WEIGHTS
+from objects.board import Board
+from objects.enums import Color
+
+PLANE_COUNT = 12
+# Boards are converted and evaluated in chunks of this size, so that memory of the planes stays bounded.
+BATCH_CHUNK_SIZE = 16384
+
+# Plane of the square code: color * 6 + piece type, empty squares and chess pieces without a type
+# go to the extra plane PLANE_COUNT that is dropped.
+_PLANE_BY_CODE = np.full(16, PLANE_COUNT, dtype=np.intp)
+for _color in Color:
+    for _piece_type in range(6):
+        _PLANE_BY_CODE[(_color << 3) + _piece_type + 1] = _color * 6 + _piece_type
+
+# Weights of the planes flattened to 12 * 64 rows, columns are the middlegame score, the endgame score and the phase.
+_WEIGHTS = np.array(
+    [
+        (
+            MG_SQUARE_SCORES[color][piece_type][index],
+            EG_SQUARE_SCORES[color][piece_type][index],
+            PHASE_WEIGHTS[piece_type],
+        )
+        for color in Color
+        for piece_type in range(6)
+        for index in range(64)
+    ],
+    dtype=np.int32,
+)
+
+
+def get_piece_planes(boards: Sequence[Board]) -> np.ndarray:
+    """
+    Returns the tensor of shape (len(boards), 12, 64), where plane color * 6 + piece type has 1 on squares
+    of the chess pieces of the color and the type.
+    """
+    board_count = len(boards)
+    codes = np.frombuffer(b''.join(board.get_square_codes() for board in boards), dtype=np.uint8)
+    planes = np.zeros((board_count, PLANE_COUNT + 1, 64), dtype=np.int8)
+    rows = np.arange(board_count)[:, np.newaxis]
+    squares = np.arange(64)[np.newaxis, :]
+    planes[rows, _PLANE_BY_CODE[codes.reshape(board_count, 64)], squares] = 1
+    return planes[:, :PLANE_COUNT]
+
+
+def evaluate_batch(boards: Sequence[Board]) -> np.ndarray:
+    """
+    Returns material and piece-square scores of the boards in centipawns from the point of view of the moving
+    color, as evaluate() without the pawn structure. Scores are computed from piece planes by one dot product.
+    """
+    scores = np.empty(len(boards), dtype=np.int32)
+    for start in range(0, len(boards), BATCH_CHUNK_SIZE):
+        chunk = boards[start : start + BATCH_CHUNK_SIZE]
+        terms = get_piece_planes(chunk).reshape(len(chunk), PLANE_COUNT * 64).astype(np.int32) @ _WEIGHTS
+        phases = np.minimum(terms[:, 2], MAX_PHASE)
+        chunk_scores = (terms[:, 0] * phases + terms[:, 1] * (MAX_PHASE - phases)) // MAX_PHASE
+        signs = np.fromiter((1 - 2 * board.moving_pieces_color for board in chunk), dtype=np.int32, count=len(chunk))
+        scores[start : start + len(chunk)] = chunk_scores * signs
+    return scores
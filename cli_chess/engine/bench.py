@@ -0,0 +1,67 @@
+import sys
+from dataclasses import replace
+from typing import Iterable
+
+from engine.search import SearchOptions, search
+from engine.transposition import TranspositionTable
+from objects.board import Board
+
+# Positions of the node-count comparison: the opening, middlegames with tactics and endgames.
+BENCH_FENS = (
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8',
+    'r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 w - - 0 8',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+    '6k1/5ppp/8/8/8/8/5PPP/3R2K1 b - - 0 1',
+)
+
+# Each technique alone and all of them together against the plain alpha-beta search.
+_PLAIN_OPTIONS = SearchOptions(null_move=False, lmr=False, futility=False, pvs=False, aspiration_delta=0)
+BENCH_OPTIONS = {
+    'alpha-beta': _PLAIN_OPTIONS,
+    'null move': replace(_PLAIN_OPTIONS, null_move=True),
+    'lmr': replace(_PLAIN_OPTIONS, lmr=True),
+    'futility': replace(_PLAIN_OPTIONS, futility=True),
+    'pvs': replace(_PLAIN_OPTIONS, pvs=True),
+    'aspiration': replace(_PLAIN_OPTIONS, aspiration_delta=SearchOptions.aspiration_delta),
+    'all': SearchOptions(),
+}
+
+
+def count_nodes(options: SearchOptions, depth: int, fens: Iterable[str] = BENCH_FENS) -> int:
+    """
+    Returns the number of nodes searched to the depth in all positions, each with a new transposition table.
+    """
+    return sum(
+        search(Board.from_fen(fen), depth=depth, tt=TranspositionTable(1), options=options).stats.nodes for fen in fens
+    )
+
+
+def get_effective_branching_factor(nodes: int, depth: int, position_count: int) -> float:
+    """
+    Returns the average number of nodes per ply that gives the number of nodes per position at the depth.
+    """
+    return (nodes / position_count) ** (1 / depth)
+
+
+def compare_options(depth: int, fens: Iterable[str] = BENCH_FENS) -> dict[str, int]:
+    """
+    Returns the number of nodes of every options of BENCH_OPTIONS.
+    """
+    fens = tuple(fens)
+    return {name: count_nodes(options, depth, fens) for name, options in BENCH_OPTIONS.items()}
+
+
+def main(argv: list[str]):
+    depth = int(argv[0]) if argv else 4
+    nodes_by_name = compare_options(depth)
+    base_nodes = nodes_by_name['alpha-beta']
+    sys.stdout.write(f'{"options":<12}{"nodes":>10}{"ratio":>8}{"ebf":>8}\n')
+    for name, nodes in nodes_by_name.items():
+        ebf = get_effective_branching_factor(nodes, depth, len(BENCH_FENS))
+        sys.stdout.write(f'{name:<12}{nodes:>10}{nodes / base_nodes:>8.2f}{ebf:>8.2f}\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
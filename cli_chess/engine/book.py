@@ -0,0 +1,180 @@
+import mmap
+import random
+import struct
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from errors import BookError, CustomError
+from objects.board import Board
+from objects.game import GameRecord
+from objects.move import Move
+from objects.pgn import read_pgn
+
+BOOK_MAGIC = b'CLBK'
+BOOK_VERSION = 1
+# Header of a book file: magic and version.
+_HEADER = struct.Struct('<4sI')
+# Record of a book file: Zobrist key of the position, packed move and weight, sorted by key.
+_RECORD = struct.Struct('<QHH')
+RECORD_SIZE = _RECORD.size
+# Moves of the first plies of games are added to the book.
+DEFAULT_BOOK_PLIES = 24
+# Weights of a move by the result of the game for the moving color.
+WIN_WEIGHT = 2
+DRAW_WEIGHT = 1
+MAX_WEIGHT = 0xFFFF
+
+
+class BookMove(NamedTuple):
+    move: Move
+    weight: int
+
+
+class OpeningBook:
+    """
+    Opening book of a file of sorted fixed-size records, memory-mapped read-only and probed by binary search
+    over the keys, so nothing is parsed when it's opened. Keys are the Zobrist keys of the board.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'rb') as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise BookError(f'Cannot open book {self.path}: {error}') from error
+        if len(self._mmap) < _HEADER.size or _HEADER.unpack_from(self._mmap) != (BOOK_MAGIC, BOOK_VERSION):
+            self._mmap.close()
+            raise BookError(f'{self.path} is not a book file of version {BOOK_VERSION}.')
+        self._size, remainder = divmod(len(self._mmap) - _HEADER.size, RECORD_SIZE)
+        if remainder:
+            self._mmap.close()
+            raise BookError(f'Book {self.path} is truncated.')
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        self._mmap.close()
+
+    def _get_key(self, index: int) -> int:
+        return struct.unpack_from('<Q', self._mmap, _HEADER.size + index * RECORD_SIZE)[0]
+
+    def get_moves(self, key: int) -> list[BookMove]:
+        """
+        Returns moves of the position key with their weights, the heaviest first.
+        """
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        for index in range(low, self._size):
+            record_key, move, weight = _RECORD.unpack_from(self._mmap, _HEADER.size + index * RECORD_SIZE)
+            if record_key != key:
+                break
+            moves.append(BookMove(Move.from_int(move), weight))
+        return moves
+
+    def probe(self, board: Board) -> list[BookMove]:
+        """
+        Returns book moves of the position that are legal on the board, a key collision can't return
+        a move of another position.
+        """
+        legal_moves = set(board.get_legal_moves())
+        return [book_move for book_move in self.get_moves(board.key) if book_move.move in legal_moves]
+
+    def choose_move(self, board: Board, rng: Optional[random.Random] = None) -> Optional[Move]:
+        """
+        Returns a book move of the position chosen at random in proportion to the weights,
+        None if the position isn't in the book.
+        """
+        book_moves = self.probe(board)
+        if not book_moves:
+            return None
+        rng = rng or random.Random()
+        return rng.choices([move for move, _ in book_moves], [weight for _, weight in book_moves])[0]
+
+
+def get_result_weights(result: str) -> tuple[int, int]:
+    """
+    Returns weights of moves of white and black in the game with the result.
+    """
+    if result == '1-0':
+        return WIN_WEIGHT, 0
+    if result == '0-1':
+        return 0, WIN_WEIGHT
+    return DRAW_WEIGHT, DRAW_WEIGHT
+
+
+def build_book(games: Iterable[tuple[GameRecord, str]], path: str | Path, max_plies: int = DEFAULT_BOOK_PLIES) -> int:
+    """
+    Writes the book of the first plies of the games, given as (record, result), returns the number of records.
+    A move weighs WIN_WEIGHT for every won game and DRAW_WEIGHT for every drawn or unfinished one,
+    moves only lost with are left out. Weights are scaled down to fit into 16 bits.
+    """
+    weights: Counter[tuple[int, int]] = Counter()
+    for record, result in games:
+        board = Board.from_fen(record.fen)
+        color_weights = get_result_weights(result)
+        for move in record.moves[:max_plies]:
+            weights[board.key, move] += color_weights[board.moving_pieces_color]
+            board.make_move(move)
+
+    max_weight = max(weights.values(), default=0)
+    scale = MAX_WEIGHT / max_weight if max_weight > MAX_WEIGHT else 1
+    records = sorted(
+        ((key, move, max(int(weight * scale), 1)) for (key, move), weight in weights.items() if weight),
+        key=lambda record: (record[0], -record[2], record[1]),
+    )
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(BOOK_MAGIC, BOOK_VERSION))
+        file.write(b''.join(_RECORD.pack(*record) for record in records))
+    return len(records)
+
+
+def read_pgn_games(path: str | Path) -> tuple[list[tuple[GameRecord, str]], int]:
+    """
+    Returns (record, result) of the games of the PGN file and the number of skipped games with illegal moves.
+    """
+    games = []
+    skipped = 0
+    with open(path, encoding='utf-8', errors='replace') as file:
+        for game in read_pgn(file):
+            try:
+                games.append((game.get_record(), game.result))
+            except CustomError:
+                skipped += 1
+    return games, skipped
+
+
+def build_book_from_pgn(pgn_path: str | Path, book_path: str | Path, max_plies: int = DEFAULT_BOOK_PLIES) -> int:
+    """
+    Writes the book of the games of the PGN file, returns the number of records.
+    """
+    games, _ = read_pgn_games(pgn_path)
+    return build_book(games, book_path, max_plies)
+
+
+def main(argv: list[str]):
+    if len(argv) not in (2, 3):
+        sys.stderr.write('usage: python -m engine.book <pgn> <book> [max plies]\n')
+        sys.exit(2)
+    games, skipped = read_pgn_games(argv[0])
+    count = build_book(games, argv[1], int(argv[2]) if len(argv) == 3 else DEFAULT_BOOK_PLIES)
+    sys.stdout.write(f'{count} records from {len(games)} games, {skipped} skipped\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,266 @@
+from array import array
+from typing import Optional
+
+from engine.pawns import PawnHashTable, evaluate_pawns
+from errors import EvaluationError
+from objects.board import Board
+from objects.enums import Color, PieceType
+
+DEFAULT_EVAL_CACHE_SIZE = 1 << 16
+
+# Values of chess pieces in centipawns, indexed by PieceType.
+PIECE_VALUES: tuple[int, ...] = (100, 320, 330, 500, 900, 0)
+
+# Material of the middlegame and the endgame, indexed by PieceType.
+MG_PIECE_VALUES = (82, 337, 365, 477, 1025, 0)
+EG_PIECE_VALUES = (94, 281, 297, 512, 936, 0)
+
+# Game phase of the chess pieces: the phase is MAX_PHASE with all pieces on the board and 0 with only
+# kings and pawns, the score is blended from the middlegame score to the endgame score by it.
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24
+
+# Piece-square tables of white chess pieces as seen from white's side, the first row is the 8th rank.
+# Black chess pieces use the mirrored tables.
+# fmt: off
+MG_TABLES = (
+    (  # pawn
+        0,   0,   0,   0,   0,   0,   0,   0,
+        50,  50,  50,  50,  50,  50,  50,  50,
+        10,  10,  20,  30,  30,  20,  10,  10,
+        5,   5,  10,  25,  25,  10,   5,   5,
+        0,   0,   0,  20,  20,   0,   0,   0,
+        5,  -5, -10,   0,   0, -10,  -5,   5,
+        5,  10,  10, -20, -20,  10,  10,   5,
+        0,   0,   0,   0,   0,   0,   0,   0,
+    ),
+    (  # knight
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    (  # bishop
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    (  # rook
+        0,   0,   0,   0,   0,   0,   0,   0,
+        5,  10,  10,  10,  10,  10,  10,   5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        0,   0,   0,   5,   5,   0,   0,   0,
+    ),
+    (  # queen
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+        -5,   0,   5,   5,   5,   5,   0,  -5,
+        0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+    ),
+    (  # king
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20,  20,   0,   0,   0,   0,  20,  20,
+        20,  30,  10,   0,   0,  10,  30,  20,
+    ),
+)
+
+EG_TABLES = (
+    (  # pawn
+        0,   0,   0,   0,   0,   0,   0,   0,
+        80,  80,  80,  80,  80,  80,  80,  80,
+        50,  50,  50,  50,  50,  50,  50,  50,
+        30,  30,  30,  30,  30,  30,  30,  30,
+        15,  15,  15,  15,  15,  15,  15,  15,
+        5,   5,   5,   5,   5,   5,   5,   5,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+    ),
+    MG_TABLES[PieceType.KNIGHT],
+    MG_TABLES[PieceType.BISHOP],
+    (  # rook
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+        0,   0,   0,   0,   0,   0,   0,   0,
+    ),
+    MG_TABLES[PieceType.QUEEN],
+    (  # king
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10,   0,   0, -10, -20, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -30,   0,   0,   0,   0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50,
+    ),
+)
+# fmt: on
+
+
+def _get_square_scores(tables: tuple[tuple[int, ...], ...], values: tuple[int, ...]) -> tuple:
+    """
+    Returns material plus piece-square scores by [color][piece type][square index] from white's point of view.
+    """
+    white_scores = tuple(
+        tuple(value + table[(7 - (index >> 3)) * 8 + (index & 7)] for index in range(64))
+        for table, value in zip(tables, values)
+    )
+    black_scores = tuple(tuple(-scores[index ^ 56] for index in range(64)) for scores in white_scores)
+    return white_scores, black_scores
+
+
+MG_SQUARE_SCORES = _get_square_scores(MG_TABLES, MG_PIECE_VALUES)
+EG_SQUARE_SCORES = _get_square_scores(EG_TABLES, EG_PIECE_VALUES)
+
+
+def get_tapered_score(mg_score: int, eg_score: int, phase: int) -> int:
+    """
+    Returns the score blended from the middlegame and endgame scores by the game phase.
+    """
+    phase = min(phase, MAX_PHASE)
+    return (mg_score * phase + eg_score * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def evaluate(board: Board) -> int:
+    """
+    Returns the score of the position in centipawns from the point of view of the moving color.
+    All chess pieces are scanned, Evaluator gives the same score from incrementally updated terms.
+    """
+    mg_score, eg_score = evaluate_pawns(board)
+    phase = 0
+    for color, pieces in board.pieces_by_color.items():
+        for pos, piece in pieces.items():
+            if piece.TYPE is not None:
+                mg_score += MG_SQUARE_SCORES[color][piece.TYPE][pos.index]
+                eg_score += EG_SQUARE_SCORES[color][piece.TYPE][pos.index]
+                phase += PHASE_WEIGHTS[piece.TYPE]
+    score = get_tapered_score(mg_score, eg_score, phase)
+    return score if board.moving_pieces_color == Color.WHITE else -score
+
+
+class EvalCache:
+    """
+    Fixed-size direct-mapped cache of evaluation scores by the position key, preallocated as arrays,
+    so that a lookup neither allocates nor grows it.
+    """
+
+    def __init__(self, size: int = DEFAULT_EVAL_CACHE_SIZE):
+        if size < 1 or size & (size - 1):
+            raise EvaluationError(f'Evaluation cache size must be a power of two, but got {size}.')
+        self._mask = size - 1
+        self._keys = array('Q', bytes(8 * size))
+        self._scores = array('i', bytes(4 * size))
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys[:] = array('Q', bytes(8 * len(self._keys)))
+        self._scores[:] = array('i', bytes(4 * len(self._scores)))
+        self.hits = self.misses = 0
+
+    def probe(self, key: int) -> Optional[int]:
+        """
+        Returns the score of the position key or None if the cache has no score of it.
+        """
+        index = key & self._mask
+        if self._keys[index] == key:
+            self.hits += 1
+            return self._scores[index]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, score: int):
+        index = key & self._mask
+        self._keys[index] = key
+        self._scores[index] = score
+
+
+class Evaluator:
+    """
+    Evaluation of material and piece-square tables kept up to date by made and unmade moves of the board,
+    so that a position is evaluated in constant time. It listens to the board until close() is called.
+    The pawn structure is evaluated through the pawn hash table, since it changes rarely.
+    Scores are looked up in the evaluation cache first, if it is given.
+    """
+
+    def __init__(
+        self, board: Board, pawn_table: Optional[PawnHashTable] = None, eval_cache: Optional[EvalCache] = None
+    ):
+        self._board = board
+        self.pawn_table = pawn_table if pawn_table is not None else PawnHashTable()
+        self.eval_cache = eval_cache
+        self.mg_score = 0
+        self.eg_score = 0
+        self.phase = 0
+        for color, pieces in board.pieces_by_color.items():
+            for pos, piece in pieces.items():
+                if piece.TYPE is not None:
+                    self.put_piece(color, piece.TYPE, pos.index)
+        board.add_listener(self)
+
+    def close(self):
+        self._board.remove_listener(self)
+
+    def put_piece(self, color: Color, piece_type: PieceType, index: int):
+        self.mg_score += MG_SQUARE_SCORES[color][piece_type][index]
+        self.eg_score += EG_SQUARE_SCORES[color][piece_type][index]
+        self.phase += PHASE_WEIGHTS[piece_type]
+
+    def take_piece(self, color: Color, piece_type: PieceType, index: int):
+        self.mg_score -= MG_SQUARE_SCORES[color][piece_type][index]
+        self.eg_score -= EG_SQUARE_SCORES[color][piece_type][index]
+        self.phase -= PHASE_WEIGHTS[piece_type]
+
+    def evaluate(self) -> int:
+        """
+        Returns the score of the position in centipawns from the point of view of the moving color.
+        """
+        board = self._board
+        eval_cache = self.eval_cache
+        if eval_cache is not None:
+            key = board.key
+            cached_score = eval_cache.probe(key)
+            if cached_score is not None:
+                return cached_score
+
+        pawn_mg_score, pawn_eg_score = self.pawn_table.evaluate(board)
+        phase = min(self.phase, MAX_PHASE)
+        score = (
+            (self.mg_score + pawn_mg_score) * phase + (self.eg_score + pawn_eg_score) * (MAX_PHASE - phase)
+        ) // MAX_PHASE
+        if board.moving_pieces_color != Color.WHITE:
+            score = -score
+        if eval_cache is not None:
+            eval_cache.store(key, score)
+        return score
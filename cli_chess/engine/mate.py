@@ -0,0 +1,208 @@
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from errors import SearchError
+from objects.board import Board
+from objects.move import Move
+
+# Proof and disproof numbers of proven and disproven nodes.
+INFINITY = 10**9
+DEFAULT_MAX_NODES = 200_000
+DEFAULT_MAX_TABLE_SIZE = 1_000_000
+
+
+class MateStatus(Enum):
+    PROVEN = 'proven'
+    DISPROVEN = 'disproven'
+    # The node budget ran out before the search proved or disproved the mate.
+    UNKNOWN = 'unknown'
+
+
+class MateResult(NamedTuple):
+    status: MateStatus
+    # Number of moves of the attacker to mate, None if the mate isn't proven.
+    mate_in: Optional[int]
+    pv: list[Move]
+    nodes: int
+
+
+class _NodeBudgetExceeded(Exception):
+    pass
+
+
+class MateSolver:
+    """
+        Depth-first proof-number search of forced mates. The attacker (the moving color at the root) tries
+        only checks, the defender tries all evasions. Nodes are stored in the transposition table by the position
+        key and the number of attacker moves left, so positions reached by other move orders share their proof
+        and disproof numbers, and the table is kept between solves of the solver. The table is cleared before a solve once it has more
+    than max_table_size entries, a solve stores at most max_nodes entries.
+
+        Numbers are stored as (phi, delta) of the moving color: phi is the proof number at attacker nodes and
+        the disproof number at defender nodes, delta is the other one.
+    """
+
+    def __init__(self, max_nodes: int = DEFAULT_MAX_NODES, max_table_size: int = DEFAULT_MAX_TABLE_SIZE):
+        if max_nodes < 1:
+            raise SearchError(f'Node budget must be positive, but got {max_nodes}.')
+        if max_table_size < 1:
+            raise SearchError(f'Table size must be positive, but got {max_table_size}.')
+        self.max_nodes = max_nodes
+        self.max_table_size = max_table_size
+        self._table: dict[tuple[int, int, bool], tuple[int, int]] = {}
+        self._nodes = 0
+
+    def clear(self):
+        self._table.clear()
+
+    def solve(self, board: Board, max_moves: int) -> MateResult:
+        """
+        Returns the shortest forced mate of the moving color in at most max_moves moves, mates of every length
+        are searched in turn. The node budget is shared by all lengths.
+        """
+        if max_moves < 1:
+            raise SearchError(f'Mate length must be positive, but got {max_moves}.')
+        if len(self._table) > self.max_table_size:
+            self._table.clear()
+        self._nodes = 0
+        try:
+            for moves in range(1, max_moves + 1):
+                phi, _ = self._search(board, moves, True, INFINITY, INFINITY)
+                if phi == 0:
+                    return MateResult(MateStatus.PROVEN, moves, self._get_pv(board, moves), self._nodes)
+        except _NodeBudgetExceeded:
+            return MateResult(MateStatus.UNKNOWN, None, [], self._nodes)
+        return MateResult(MateStatus.DISPROVEN, None, [], self._nodes)
+
+    def _get_moves(self, board: Board, remaining: int, is_attacker: bool) -> list[int]:
+        """
+        Returns checks of the attacker or evasions of the defender, the attacker has no moves
+        when no attacker moves are left.
+        """
+        if not is_attacker:
+            return list(board.get_legal_moves())
+        if not remaining:
+            return []
+        checks: list[int] = []
+        for move in board.get_legal_moves():
+            board.make_move(move)
+            if board.is_in_check():
+                checks.append(move)
+            board.unmake_move()
+        return checks
+
+    def _get_child_numbers(self, board: Board, move: int, remaining: int, is_attacker: bool) -> tuple[int, int]:
+        board.make_move(move)
+        numbers = self._table.get((board.key, remaining, not is_attacker), (1, 1))
+        board.unmake_move()
+        return numbers
+
+    def _search(
+        self, board: Board, remaining: int, is_attacker: bool, phi_limit: int, delta_limit: int
+    ) -> tuple[int, int]:
+        """
+        Searches the node until its phi or delta reaches the limit, returns and stores (phi, delta).
+        Children of the attacker keep the number of attacker moves left, children of the defender have one less.
+        """
+        self._nodes += 1
+        if self._nodes > self.max_nodes:
+            raise _NodeBudgetExceeded
+
+        key = (board.key, remaining, is_attacker)
+        moves = self._get_moves(board, remaining, is_attacker)
+        if not moves:
+            # The attacker without checks and the mated defender lose, the stalemated defender holds.
+            numbers = (INFINITY, 0) if is_attacker or board.is_in_check() else (0, INFINITY)
+            self._table[key] = numbers
+            return numbers
+
+        child_remaining = remaining if is_attacker else remaining - 1
+        # Moves transposing to the same position are counted once.
+        children: dict[int, int] = {}
+        for move in moves:
+            board.make_move(move)
+            children.setdefault(board.key, move)
+            board.unmake_move()
+        child_moves = list(children.values())
+
+        while True:
+            phi = INFINITY
+            delta = 0
+            best_move = 0
+            best_delta = second_delta = INFINITY
+            best_phi = 0
+            for move in child_moves:
+                child_phi, child_delta = self._get_child_numbers(board, move, child_remaining, is_attacker)
+                phi = min(phi, child_delta)
+                delta = min(delta + child_phi, INFINITY)
+                if child_delta < best_delta:
+                    second_delta = best_delta
+                    best_delta, best_phi, best_move = child_delta, child_phi, move
+                elif child_delta < second_delta:
+                    second_delta = child_delta
+            if phi >= phi_limit or delta >= delta_limit:
+                self._table[key] = (phi, delta)
+                return phi, delta
+
+            board.make_move(best_move)
+            try:
+                self._search(
+                    board,
+                    child_remaining,
+                    not is_attacker,
+                    min(delta_limit - delta + best_phi, INFINITY),
+                    min(phi_limit, second_delta + 1),
+                )
+            finally:
+                board.unmake_move()
+
+    def _get_pv(self, board: Board, remaining: int) -> list[Move]:
+        """
+        Returns the proven line: proven checks of the attacker and, at defender nodes, the evasion
+        that needs the most attacker moves to mate. The line ends early if the table has no proven check.
+        """
+        pv: list[Move] = []
+        is_attacker = True
+        while True:
+            moves = self._get_moves(board, remaining, is_attacker)
+            if not moves:
+                break
+            child_remaining = remaining if is_attacker else remaining - 1
+            if is_attacker:
+                checks = (
+                    move for move in moves if self._get_child_numbers(board, move, child_remaining, is_attacker)[1] == 0
+                )
+                move = next(checks, 0)
+                if not move:
+                    break
+            else:
+                move = max(moves, key=lambda move: self._get_mate_length(board, move, child_remaining))
+            board.make_move(move)
+            pv.append(Move.from_int(move))
+            remaining = child_remaining
+            is_attacker = not is_attacker
+        for _ in pv:
+            board.unmake_move()
+        return pv
+
+    def _get_mate_length(self, board: Board, move: int, remaining: int) -> int:
+        """
+        Returns the least number of attacker moves left with which the mate after the defender move
+        is proven in the table.
+        """
+        board.make_move(move)
+        try:
+            for moves in range(remaining + 1):
+                if self._table.get((board.key, moves, True), (1, 1))[0] == 0:
+                    return moves
+            return remaining
+        finally:
+            board.unmake_move()
+
+
+def solve_mate(board: Board, max_moves: int, max_nodes: int = DEFAULT_MAX_NODES) -> MateResult:
+    """
+    Returns the shortest forced mate of the moving color in at most max_moves moves.
+    :param max_nodes: node budget, the status is UNKNOWN if it runs out.
+    """
+    return MateSolver(max_nodes).solve(board, max_moves)
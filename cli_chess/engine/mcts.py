@@ -0,0 +1,246 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+from engine.evaluation import evaluate
+from engine.smp import DEFAULT_WORKER_COUNT
+from errors import SearchError
+from objects.board import Board
+from objects.move import FLAGS_SHIFT, Move
+
+# Number of playouts if neither playouts nor time are limited.
+DEFAULT_PLAYOUTS = 1000
+# Exploration constant of UCT, the square root of 2 balances exploration and exploitation for rewards in [0, 1].
+DEFAULT_EXPLORATION = math.sqrt(2)
+# Visits added along the path of a leaf whose playout is pending, counted as losses, so that other leaves
+# of the same batch are selected from other paths.
+VIRTUAL_LOSS = 1
+# Playouts are stopped after this number of plies and scored by the evaluation, since random games of chess
+# seldom end by themselves.
+PLAYOUT_MAX_PLIES = 32
+# Probability that a playout move is a capture or a promotion, if there is any.
+CAPTURE_PROBABILITY = 0.5
+
+
+def get_win_probability(score: int) -> float:
+    """
+    Returns the expected result of the evaluation score in centipawns.
+    """
+    return 1 / (1 + 10 ** (-score / 400))
+
+
+def playout(fen: str, seed: int) -> float:
+    """
+    Returns the result of a lightly guided random game from the position for the moving color:
+    1 for a win, 0 for a loss and 0.5 for a draw. Captures and promotions are preferred with
+    CAPTURE_PROBABILITY, the game is scored by the evaluation after PLAYOUT_MAX_PLIES.
+    """
+    board = Board.from_fen(fen)
+    rng = random.Random(seed)
+    color = board.moving_pieces_color
+    for _ in range(PLAYOUT_MAX_PLIES):
+        if board.is_fifty_move_draw():
+            return 0.5
+        moving_color = board.moving_pieces_color
+        moves = board.get_pseudo_legal_moves()
+        rng.shuffle(moves)
+        if rng.random() < CAPTURE_PROBABILITY:
+            moves.sort(key=lambda move: not (move >> FLAGS_SHIFT or board.is_capture(move)))
+        for move in moves:
+            board.make_move(move)
+            if not board.is_in_check(moving_color):
+                break
+            board.unmake_move()
+        else:
+            if not board.is_in_check(moving_color):
+                return 0.5
+            return 0.0 if moving_color == color else 1.0
+
+    probability = get_win_probability(evaluate(board))
+    return probability if board.moving_pieces_color == color else 1 - probability
+
+
+class _Node:
+    """
+    Node of the search tree. The value is the sum of rewards of the color that made the move of the node.
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'untried_moves', 'visits', 'value', 'virtual_loss', 'reward')
+
+    def __init__(self, board: Board, move: int = 0, parent: Optional['_Node'] = None):
+        self.move = move
+        self.parent = parent
+        self.children: list[_Node] = []
+        self.untried_moves: list[int] = list(board.get_legal_moves())
+        self.visits = 0
+        self.value = 0.0
+        self.virtual_loss = 0
+        # Reward of a terminal node for the color that made the move, None if the game goes on.
+        self.reward: Optional[float] = None
+        if board.is_fifty_move_draw():
+            self.untried_moves = []
+            self.reward = 0.5
+        elif not self.untried_moves:
+            self.reward = 1.0 if board.is_in_check() else 0.5
+
+    def get_uct_score(self, log_parent_visits: float, exploration: float) -> float:
+        visits = self.visits + self.virtual_loss
+        return self.value / visits + exploration * math.sqrt(log_parent_visits / visits)
+
+
+@dataclass
+class MCTSStats:
+    playouts: int = 0
+    # Nodes of the tree, the root included.
+    nodes: int = 1
+    elapsed: float = 0.0
+
+    @property
+    def playouts_per_second(self) -> int:
+        return int(self.playouts / self.elapsed) if self.elapsed else 0
+
+
+class MCTSResult(NamedTuple):
+    best_move: Optional[Move]
+    # Expected result of the best move for the moving color, from 0 to 1.
+    win_rate: float
+    pv: list[Move]
+    stats: MCTSStats
+
+
+class MCTSSearcher:
+    """
+    Monte Carlo tree search with UCT selection. Leaves are selected in batches with virtual loss,
+    so that leaves of a batch differ, and their playouts run in a pool of worker processes.
+    A worker count of 0 runs playouts in the searching process. The workers are started once
+    and kept between searches, close() stops them.
+    """
+
+    def __init__(
+        self,
+        worker_count: int = DEFAULT_WORKER_COUNT,
+        *,
+        batch_size: Optional[int] = None,
+        exploration: float = DEFAULT_EXPLORATION,
+        seed: Optional[int] = None,
+    ):
+        if worker_count < 0:
+            raise SearchError(f'Worker count must be non-negative, but got {worker_count}.')
+        self.worker_count = worker_count
+        self.batch_size = batch_size if batch_size is not None else max(4 * worker_count, 1)
+        if self.batch_size < 1:
+            raise SearchError(f'Batch size must be positive, but got {self.batch_size}.')
+        self.exploration = exploration
+        self._rng = random.Random(seed)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if worker_count:
+            self._executor = ProcessPoolExecutor(worker_count, mp_context=multiprocessing.get_context('spawn'))
+
+    def __enter__(self) -> 'MCTSSearcher':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def search(self, board: Board, playouts: Optional[int] = None, movetime: Optional[float] = None) -> MCTSResult:
+        """
+        Searches the best move of the moving color until the number of playouts or the time is reached.
+        Returns (best_move, win_rate, pv, stats), the best move is the most visited one.
+        """
+        for name, value in (('playouts', playouts), ('movetime', movetime)):
+            if value is not None and value <= 0:
+                raise SearchError(f'Search {name} must be positive, but got {value}.')
+        if playouts is None and movetime is None:
+            playouts = DEFAULT_PLAYOUTS
+        start_time = time.monotonic()
+        deadline = start_time + movetime if movetime is not None else None
+        stats = MCTSStats()
+        root = _Node(board)
+
+        while root.reward is None:
+            if playouts is not None and stats.playouts >= playouts:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            batch_size = self.batch_size if playouts is None else min(self.batch_size, playouts - stats.playouts)
+            self._run_batch(board, root, batch_size, stats)
+
+        stats.elapsed = time.monotonic() - start_time
+        pv = []
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            pv.append(Move.from_int(node.move))
+        if not pv:
+            return MCTSResult(None, 0.0, [], stats)
+        best_child = max(root.children, key=lambda child: child.visits)
+        return MCTSResult(pv[0], best_child.value / best_child.visits, pv, stats)
+
+    def _run_batch(self, board: Board, root: _Node, batch_size: int, stats: MCTSStats):
+        """
+        Selects and expands leaves of the batch, runs their playouts and backs up the results.
+        """
+        leaves = []
+        fens = []
+        for _ in range(batch_size):
+            leaf, fen = self._select(board, root, stats)
+            node: Optional[_Node] = leaf
+            while node is not None:
+                node.virtual_loss += VIRTUAL_LOSS
+                node = node.parent
+            leaves.append(leaf)
+            fens.append(fen)
+
+        pending_fens = [fen for leaf, fen in zip(leaves, fens) if leaf.reward is None]
+        seeds = [self._rng.getrandbits(64) for _ in pending_fens]
+        if self._executor is not None:
+            chunk_size = max(len(pending_fens) // self.worker_count, 1)
+            results = iter(list(self._executor.map(playout, pending_fens, seeds, chunksize=chunk_size)))
+        else:
+            results = iter([playout(fen, seed) for fen, seed in zip(pending_fens, seeds)])
+
+        for leaf in leaves:
+            # The playout result is for the color to move at the leaf, the reward is for the color that moved.
+            reward = leaf.reward if leaf.reward is not None else 1 - next(results)
+            node = leaf
+            while node is not None:
+                node.virtual_loss -= VIRTUAL_LOSS
+                node.visits += 1
+                node.value += reward
+                reward = 1 - reward
+                node = node.parent
+            stats.playouts += 1
+
+    def _select(self, board: Board, root: _Node, stats: MCTSStats) -> tuple[_Node, str]:
+        """
+        Returns the leaf selected by UCT from the root and expanded by an untried move, and its FEN.
+        The board is restored before it returns.
+        """
+        node = root
+        made_move_count = 0
+        try:
+            while not node.untried_moves and node.children:
+                log_visits = math.log(node.visits + node.virtual_loss)
+                node = max(node.children, key=lambda child: child.get_uct_score(log_visits, self.exploration))
+                board.make_move(node.move)
+                made_move_count += 1
+            if node.untried_moves:
+                move = node.untried_moves.pop(self._rng.randrange(len(node.untried_moves)))
+                board.make_move(move)
+                made_move_count += 1
+                child = _Node(board, move, node)
+                node.children.append(child)
+                stats.nodes += 1
+                node = child
+            return node, board.get_fen()
+        finally:
+            for _ in range(made_move_count):
+                board.unmake_move()
@@ -0,0 +1,172 @@
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from engine.evaluation import EvalCache
+from errors import EvaluationError
+from objects.board import Board
+from objects.enums import Color, PieceType
+
+# Input features of a perspective: (own or enemy color) * 384 + piece type * 64 + square index,
+# squares are mirrored for black, so that both colors see the board from their side.
+FEATURE_COUNT = 2 * 6 * 64
+DEFAULT_HIDDEN_SIZE = 128
+DEFAULT_LAYER_SIZE = 32
+
+# Quantization: the accumulator is clipped to [0, ACCUMULATOR_CLIP], products of dense layers are
+# divided by WEIGHT_SCALE, so that int8 weights of the dense layers stand for weight / WEIGHT_SCALE.
+ACCUMULATOR_CLIP = 255
+WEIGHT_SCALE = 64
+# Scores are clipped to the limit, so that they can't be taken for mate scores of the search.
+SCORE_LIMIT = 20_000
+# Position keys are salted in the evaluation cache, so that a cache shared with the classical evaluator
+# doesn't return its scores for the position.
+EVAL_CACHE_SALT = 0x9E3779B97F4A7C15
+
+_WEIGHT_DTYPES = {
+    'feature_weights': np.int16,
+    'feature_bias': np.int16,
+    'hidden_weights': np.int8,
+    'hidden_bias': np.int32,
+    'output_weights': np.int8,
+    'output_bias': np.int32,
+}
+
+
+class NNUEWeights(NamedTuple):
+    """
+    Weights of the network: the feature layer (FEATURE_COUNT x hidden size) shared by both perspectives,
+    the dense hidden layer (2 * hidden size x layer size) and the output layer (layer size).
+    """
+
+    feature_weights: np.ndarray
+    feature_bias: np.ndarray
+    hidden_weights: np.ndarray
+    hidden_bias: np.ndarray
+    output_weights: np.ndarray
+    output_bias: np.ndarray
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'NNUEWeights':
+        """
+        Loads weights from .npy files of the directory, memory-mapped read-only, so that the weights are
+        read from the page cache instead of being copied into every process that uses them.
+        """
+        path = Path(path)
+        try:
+            weights = cls(*(np.load(path / f'{name}.npy', mmap_mode='r') for name in cls._fields))
+        except (OSError, ValueError) as error:
+            raise EvaluationError(f'Cannot load NNUE weights from {path}: {error}') from error
+        weights.validate()
+        return weights
+
+    @classmethod
+    def random(
+        cls, hidden_size: int = DEFAULT_HIDDEN_SIZE, layer_size: int = DEFAULT_LAYER_SIZE, seed: int = 0
+    ) -> 'NNUEWeights':
+        """
+        Returns small random weights, e.g. as the start of training.
+        """
+        rng = np.random.default_rng(seed)
+        return cls(
+            rng.integers(-8, 9, (FEATURE_COUNT, hidden_size), dtype=np.int16),
+            rng.integers(0, 32, hidden_size, dtype=np.int16),
+            rng.integers(-16, 17, (2 * hidden_size, layer_size), dtype=np.int8),
+            rng.integers(-64, 65, layer_size, dtype=np.int32),
+            rng.integers(-16, 17, layer_size, dtype=np.int8),
+            np.zeros(1, dtype=np.int32),
+        )
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in zip(self._fields, self):
+            np.save(path / f'{name}.npy', array)
+
+    def validate(self):
+        for name, array in zip(self._fields, self):
+            if array.dtype != _WEIGHT_DTYPES[name]:
+                raise EvaluationError(
+                    f'NNUE weights {name} must be {np.dtype(_WEIGHT_DTYPES[name])}, but got {array.dtype}.'
+                )
+        hidden_size = self.feature_bias.shape[0]
+        layer_size = self.hidden_bias.shape[0]
+        expected_shapes = (
+            (FEATURE_COUNT, hidden_size),
+            (hidden_size,),
+            (2 * hidden_size, layer_size),
+            (layer_size,),
+            (layer_size,),
+            (1,),
+        )
+        for name, array, shape in zip(self._fields, self, expected_shapes):
+            if array.shape != shape:
+                raise EvaluationError(f'NNUE weights {name} must have shape {shape}, but got {array.shape}.')
+
+
+def get_feature_index(perspective: Color, color: Color, piece_type: PieceType, index: int) -> int:
+    """
+    Returns the input feature of the chess piece seen from the perspective color.
+    """
+    if perspective == Color.BLACK:
+        index ^= 56
+    return (color != perspective) * 384 + piece_type * 64 + index
+
+
+class NNUEEvaluator:
+    """
+    Neural network evaluation with the first layer kept in int16 accumulators of both perspectives.
+    Pieces put on and taken from the board add and subtract their feature columns, so that only the small
+    dense layers are computed per position. It listens to the board until close() is called.
+    """
+
+    def __init__(self, board: Board, weights: NNUEWeights, eval_cache: Optional[EvalCache] = None):
+        self._board = board
+        self._weights = weights
+        self.eval_cache = eval_cache
+        self.accumulators = (weights.feature_bias.copy(), weights.feature_bias.copy())
+        for color, pieces in board.pieces_by_color.items():
+            for pos, piece in pieces.items():
+                if piece.TYPE is not None:
+                    self.put_piece(color, piece.TYPE, pos.index)
+        board.add_listener(self)
+
+    def close(self):
+        self._board.remove_listener(self)
+
+    def put_piece(self, color: Color, piece_type: PieceType, index: int):
+        feature_weights = self._weights.feature_weights
+        white_accumulator, black_accumulator = self.accumulators
+        white_accumulator += feature_weights[get_feature_index(Color.WHITE, color, piece_type, index)]
+        black_accumulator += feature_weights[get_feature_index(Color.BLACK, color, piece_type, index)]
+
+    def take_piece(self, color: Color, piece_type: PieceType, index: int):
+        feature_weights = self._weights.feature_weights
+        white_accumulator, black_accumulator = self.accumulators
+        white_accumulator -= feature_weights[get_feature_index(Color.WHITE, color, piece_type, index)]
+        black_accumulator -= feature_weights[get_feature_index(Color.BLACK, color, piece_type, index)]
+
+    def evaluate(self) -> int:
+        """
+        Returns the score of the position in centipawns from the point of view of the moving color.
+        """
+        board = self._board
+        eval_cache = self.eval_cache
+        if eval_cache is not None:
+            key = board.key ^ EVAL_CACHE_SALT
+            cached_score = eval_cache.probe(key)
+            if cached_score is not None:
+                return cached_score
+
+        color = board.moving_pieces_color
+        weights = self._weights
+        inputs = np.concatenate((self.accumulators[color], self.accumulators[color ^ 1])).astype(np.int32)
+        np.clip(inputs, 0, ACCUMULATOR_CLIP, out=inputs)
+        hidden = (inputs @ weights.hidden_weights + weights.hidden_bias) // WEIGHT_SCALE
+        np.clip(hidden, 0, ACCUMULATOR_CLIP, out=hidden)
+        score = int(hidden @ weights.output_weights + weights.output_bias[0]) // WEIGHT_SCALE
+        score = max(-SCORE_LIMIT, min(score, SCORE_LIMIT))
+        if eval_cache is not None:
+            eval_cache.store(key, score)
+        return score
@@ -0,0 +1,132 @@
+from typing import Iterator
+
+from engine.evaluation import PIECE_VALUES
+from objects.board import Board
+from objects.enums import Color, PieceType
+from objects.move import END_SHIFT, FLAGS_SHIFT, START_MASK
+
+# History scores are halved when they reach the limit.
+HISTORY_LIMIT = 1 << 20
+
+KILLER_COUNT = 2
+
+
+def get_mvv_lva_score(victim_type: int, attacker_type: int) -> int:
+    """
+    Returns the score of the capture by most valuable victim, least valuable attacker.
+    """
+    return PIECE_VALUES[victim_type] * 8 - attacker_type
+
+
+class MoveOrderer:
+    """
+    Orders moves of the search: the hash move, captures by MVV-LVA, killer moves of the ply,
+    then quiet moves by history of the cutoffs they caused. Underpromotions and captures
+    that lose material by the static exchange evaluation are tried last.
+    """
+
+    def __init__(self, max_ply: int):
+        self._killers: list[list[int]] = [[0] * KILLER_COUNT for _ in range(max_ply + 1)]
+        # History of quiet moves of the color by start * 64 + end.
+        self._history: tuple[list[int], list[int]] = ([0] * 4096, [0] * 4096)
+
+    def new_search(self):
+        """
+        Ages history scores and forgets killer moves, since plies of the new search are other positions.
+        """
+        for killers in self._killers:
+            killers[:] = [0] * KILLER_COUNT
+        for history in self._history:
+            for index in range(4096):
+                history[index] //= 2
+
+    def get_killers(self, ply: int) -> list[int]:
+        return self._killers[ply]
+
+    def get_history(self, color: Color, move: int) -> int:
+        return self._history[color][move & 0xFFF]
+
+    def pick_moves(self, board: Board, ply: int, hash_move: int = 0) -> Iterator[int]:
+        """
+        Yields pseudo-legal moves of the board position in stages: the hash move, winning captures,
+        killer moves, quiet moves by history and losing captures. A stage is generated only when
+        the previous ones are exhausted, so a cutoff by an early move saves the generation of the rest.
+        The board has to be restored before the next move is taken.
+        """
+        if hash_move and board.is_pseudo_legal(hash_move):
+            yield hash_move
+
+        winning_captures, losing_captures = self._get_captures(board, hash_move)
+        yield from winning_captures
+
+        killers = [
+            killer
+            for killer in self._killers[ply]
+            if killer
+            and killer != hash_move
+            and not killer >> FLAGS_SHIFT
+            and not board.is_capture(killer)
+            and board.is_pseudo_legal(killer)
+        ]
+        yield from killers
+
+        history = self._history[board.moving_pieces_color]
+        quiet_moves = [
+            move for move in board.get_pseudo_legal_quiet_moves() if move != hash_move and move not in killers
+        ]
+        quiet_moves.sort(key=lambda move: history[move & 0xFFF], reverse=True)
+        yield from quiet_moves
+
+        yield from losing_captures
+
+    def pick_captures(self, board: Board) -> Iterator[int]:
+        """
+        Yields captures and queen promotions of the board position that don't lose material
+        by the static exchange evaluation, ordered by MVV-LVA.
+        """
+        yield from self._get_captures(board)[0]
+
+    def _get_captures(self, board: Board, hash_move: int = 0) -> tuple[list[int], list[int]]:
+        """
+        Returns winning and losing captures ordered by MVV-LVA. A capture is losing if the static exchange
+        evaluation is negative, underpromotions are losing too.
+        """
+        get_piece_type_at = board.get_piece_type_at
+        winning_captures = []
+        losing_captures = []
+        for move in board.get_pseudo_legal_captures():
+            if move == hash_move:
+                continue
+            victim_type = get_piece_type_at(move >> END_SHIFT & START_MASK)
+            attacker_type = get_piece_type_at(move & START_MASK)
+            promotion = move >> FLAGS_SHIFT
+            if promotion:
+                # A promotion gains at least the new piece.
+                victim_type = max(victim_type, promotion)
+            elif victim_type == -1:
+                victim_type = PieceType.PAWN  # en passant
+            scored_move = (get_mvv_lva_score(victim_type, attacker_type), move)
+            if promotion and promotion != PieceType.QUEEN:
+                losing_captures.append(scored_move)
+            elif PIECE_VALUES[victim_type] >= PIECE_VALUES[attacker_type] or board.see(move) >= 0:
+                winning_captures.append(scored_move)
+            else:
+                losing_captures.append(scored_move)
+        winning_captures.sort(reverse=True)
+        losing_captures.sort(reverse=True)
+        return [move for _, move in winning_captures], [move for _, move in losing_captures]
+
+    def update_quiet_cutoff(self, color: Color, move: int, ply: int, depth: int):
+        """
+        Remembers the quiet move that caused a beta cutoff as a killer of the ply and raises its history.
+        """
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1:] = killers[:-1]
+            killers[0] = move
+
+        history = self._history[color]
+        history[move & 0xFFF] += depth * depth
+        if history[move & 0xFFF] >= HISTORY_LIMIT:
+            for index in range(4096):
+                history[index] //= 2
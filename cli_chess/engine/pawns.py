@@ -0,0 +1,107 @@
+from array import array
+
+from errors import EvaluationError
+from objects.board import Board
+from objects.enums import Color, PieceType
+
+DEFAULT_PAWN_TABLE_SIZE = 4096
+
+# Penalties of doubled and isolated pawns, (middlegame, endgame).
+DOUBLED_PAWN_PENALTY = (10, 20)
+ISOLATED_PAWN_PENALTY = (10, 15)
+# Bonuses of passed pawns by the rank from the pawn's side, the 2nd rank is 1.
+PASSED_PAWN_MG_BONUSES = (0, 5, 10, 15, 25, 40, 60, 0)
+PASSED_PAWN_EG_BONUSES = (0, 10, 15, 25, 45, 75, 120, 0)
+
+
+def evaluate_pawns(board: Board) -> tuple[int, int]:
+    """
+    Returns the middlegame and endgame scores of the pawn structure from white's point of view:
+    doubled, isolated and passed pawns.
+    """
+    pawn_indexes = (
+        board.get_piece_indexes(Color.WHITE, PieceType.PAWN),
+        board.get_piece_indexes(Color.BLACK, PieceType.PAWN),
+    )
+    file_counts = ([0] * 8, [0] * 8)
+    for color in Color:
+        for index in pawn_indexes[color]:
+            file_counts[color][index & 7] += 1
+
+    mg_score = eg_score = 0
+    for color in Color:
+        sign = 1 if color == Color.WHITE else -1
+        own_files = file_counts[color]
+        enemy_indexes = pawn_indexes[color ^ 1]
+        for file in range(8):
+            if own_files[file] > 1:
+                mg_score -= sign * DOUBLED_PAWN_PENALTY[0] * (own_files[file] - 1)
+                eg_score -= sign * DOUBLED_PAWN_PENALTY[1] * (own_files[file] - 1)
+
+        for index in pawn_indexes[color]:
+            file, rank = index & 7, index >> 3
+            if (file == 0 or not own_files[file - 1]) and (file == 7 or not own_files[file + 1]):
+                mg_score -= sign * ISOLATED_PAWN_PENALTY[0]
+                eg_score -= sign * ISOLATED_PAWN_PENALTY[1]
+            # A pawn is passed if no enemy pawn is ahead of it on its file or the adjacent files.
+            if not any(
+                abs((enemy_index & 7) - file) <= 1
+                and (enemy_index >> 3 > rank if color == Color.WHITE else enemy_index >> 3 < rank)
+                for enemy_index in enemy_indexes
+            ):
+                relative_rank = rank if color == Color.WHITE else 7 - rank
+                mg_score += sign * PASSED_PAWN_MG_BONUSES[relative_rank]
+                eg_score += sign * PASSED_PAWN_EG_BONUSES[relative_rank]
+    return mg_score, eg_score
+
+
+class PawnHashTable:
+    """
+    Fixed-size direct-mapped cache of pawn structure scores by the pawn key of the board.
+    """
+
+    def __init__(self, size: int = DEFAULT_PAWN_TABLE_SIZE):
+        if size < 1 or size & (size - 1):
+            raise EvaluationError(f'Pawn hash table size must be a power of two, but got {size}.')
+        self._mask = size - 1
+        self._keys = array('Q', bytes(8 * size))
+        self._mg_scores = array('i', bytes(4 * size))
+        self._eg_scores = array('i', bytes(4 * size))
+        # The key 0 (no pawns) is stored in the empty entries, so they are valid from the start.
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._keys)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Percent of probes that found the pawn structure in the table.
+        """
+        return self.hits * 100 / self.probes if self.probes else 0.0
+
+    def clear(self):
+        size = len(self._keys)
+        self._keys = array('Q', bytes(8 * size))
+        self._mg_scores = array('i', bytes(4 * size))
+        self._eg_scores = array('i', bytes(4 * size))
+        self.probes = self.hits = 0
+
+    def evaluate(self, board: Board) -> tuple[int, int]:
+        """
+        Returns evaluate_pawns() of the board from the table, evaluating and storing it on a miss.
+        """
+        self.probes += 1
+        key = board.pawn_key
+        index = key & self._mask
+        if self._keys[index] == key:
+            self.hits += 1
+            return self._mg_scores[index], self._eg_scores[index]
+
+        mg_score, eg_score = evaluate_pawns(board)
+        self._keys[index] = key
+        self._mg_scores[index] = mg_score
+        self._eg_scores[index] = eg_score
+        return mg_score, eg_score
@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Optional
+
+from engine.evaluation import EvalCache
+from engine.ordering import MoveOrderer
+from engine.pawns import PawnHashTable
+from engine.search import MAX_PLY, Searcher, SearchOptions, SearchResult, get_search_depth
+from engine.timing import TimeManager
+from engine.transposition import TranspositionTable
+from objects.board import Board
+
+
+class PonderingSearcher:
+    """
+    Searcher of the engine moves of a game that ponders on the opponent's time: after its move, the position
+    after the expected reply is searched in a background thread. If the opponent plays the expected move,
+    the ponder search goes on as a timed search with the pondering time counted, so that it answers at once
+    if it has pondered long enough. Otherwise it's stopped and the position is searched again with
+    the transposition table and move ordering warmed by pondering.
+    """
+
+    def __init__(self, tt: Optional[TranspositionTable] = None, *, options: SearchOptions = SearchOptions()):
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.options = options
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self._orderer = MoveOrderer(MAX_PLY)
+        self._pawn_table = PawnHashTable()
+        self._eval_cache = EvalCache()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._searcher: Optional[Searcher] = None
+        self._ponder_key = 0
+        self._ponder_start_time = 0.0
+        self._ponder_result: Optional[SearchResult] = None
+
+    def __enter__(self) -> 'PonderingSearcher':
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def is_pondering(self) -> bool:
+        return self._thread is not None
+
+    def _create_searcher(self, board: Board, **kwargs) -> Searcher:
+        return Searcher(
+            board,
+            self.tt,
+            orderer=self._orderer,
+            options=self.options,
+            pawn_table=self._pawn_table,
+            eval_cache=self._eval_cache,
+            **kwargs,
+        )
+
+    def ponder(self, board: Board, expected_move: int):
+        """
+        Starts pondering on the position after the expected move of the opponent, e.g. the second move
+        of the principal variation of the engine move. The board isn't changed.
+        """
+        self.stop()
+        ponder_board = board.copy()
+        ponder_board.make_move(expected_move)
+        self._ponder_key = ponder_board.key
+        self._ponder_result = None
+        self._stop_event.clear()
+        searcher = self._create_searcher(ponder_board, is_stopped=self._stop_event.is_set)
+        self._searcher = searcher
+        self._ponder_start_time = time.monotonic()
+        self._thread = threading.Thread(target=self._run_ponder, args=(searcher,), daemon=True)
+        self._thread.start()
+
+    def _run_ponder(self, searcher: Searcher):
+        self._ponder_result = searcher.search(MAX_PLY)
+
+    def stop(self):
+        """
+        Stops pondering and waits for the ponder thread.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            self._searcher = None
+
+    def search(
+        self,
+        board: Board,
+        movetime: Optional[float] = None,
+        *,
+        time_manager: Optional[TimeManager] = None,
+        depth: Optional[int] = None,
+        nodes: Optional[int] = None,
+    ) -> SearchResult:
+        """
+        Searches the engine move. The running ponder search is taken over if it ponders on the position
+        and the search is limited by time only, the time is counted from the start of pondering. If it's over
+        the soft limit or the movetime already, the last completed iteration is returned at once.
+        """
+        searcher = self._searcher
+        if (
+            searcher is not None
+            and self._thread is not None
+            and board.key == self._ponder_key
+            and depth is None
+            and nodes is None
+            and (movetime is not None or time_manager is not None)
+        ):
+            self.ponder_hits += 1
+            if time_manager is not None:
+                time_manager.start(self._ponder_start_time)
+                searcher.time_manager = time_manager
+            if movetime is not None:
+                searcher.deadline = min(self._ponder_start_time + movetime, searcher.deadline or float('inf'))
+            # The soft limit is checked after an iteration only, so the iteration isn't waited for if pondering
+            # has taken the time already: the last completed one is the result.
+            if (time_manager is not None and time_manager.elapsed >= time_manager.get_soft_limit()) or (
+                searcher.deadline is not None and time.monotonic() >= searcher.deadline
+            ):
+                self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+            self._searcher = None
+            assert self._ponder_result is not None
+            return self._ponder_result
+
+        if self._thread is not None:
+            self.ponder_misses += 1
+        self.stop()
+        time_limit = time_manager.hard_limit if time_manager is not None else movetime
+        depth = get_search_depth(depth, time_limit, nodes)
+        return self._create_searcher(
+            board,
+            deadline=time.monotonic() + movetime if movetime is not None else None,
+            max_nodes=nodes,
+            time_manager=time_manager,
+        ).search(depth)
@@ -0,0 +1,617 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from engine.evaluation import EvalCache, Evaluator
+from engine.nnue import NNUEEvaluator, NNUEWeights
+from engine.ordering import MoveOrderer
+from engine.pawns import PawnHashTable
+from engine.tablebase import Tablebase
+from engine.timing import TimeManager
+from engine.transposition import BOUND_EXACT, BOUND_LOWER, BOUND_UPPER, TranspositionTable
+from errors import SearchError
+from objects.board import Board
+from objects.enums import Color, PieceType
+from objects.move import FLAGS_SHIFT, Move
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+MAX_PLY = 64
+# Search depth if neither depth nor time or node limits are given.
+DEFAULT_DEPTH = 4
+# The clock is sampled once per this number of nodes.
+TIME_CHECK_INTERVAL = 256
+
+# Null-move pruning searches the position after a passed move with the depth reduced by this number of plies.
+NULL_MOVE_REDUCTION = 2
+# Late move reductions apply to quiet moves after this number of searched moves, from this depth.
+LMR_MOVE_COUNT = 3
+LMR_MIN_DEPTH = 3
+# Quiet moves are pruned near the leaves if the evaluation plus the margin of the depth doesn't reach alpha.
+FUTILITY_MARGINS = (0, 200, 500)
+# Scores of shallow iterations swing too much for aspiration windows, they are used from this depth.
+ASPIRATION_MIN_DEPTH = 4
+# The failed side of an aspiration window is opened fully after this number of failures.
+ASPIRATION_MAX_FAILURES = 2
+
+
+@dataclass(frozen=True)
+class SearchOptions:
+    """
+    Search techniques, each of them can be turned off, e.g. to measure what it buys.
+    An iteration searches a window of aspiration_delta around the score of the previous iteration,
+    only the failed side is widened by the delta multiplied by aspiration_growth after a failure.
+    An aspiration_delta of 0 turns aspiration windows off.
+    """
+
+    null_move: bool = True
+    lmr: bool = True
+    futility: bool = True
+    pvs: bool = True
+    aspiration_delta: int = 50
+    aspiration_growth: int = 4
+
+    def __post_init__(self):
+        if self.aspiration_delta < 0:
+            raise SearchError(f'Aspiration delta must be non-negative, but got {self.aspiration_delta}.')
+        if self.aspiration_growth < 1:
+            raise SearchError(f'Aspiration growth must be at least 1, but got {self.aspiration_growth}.')
+
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    depth: int = 0
+    elapsed: float = 0.0
+    tt_cutoffs: int = 0
+    # Nodes of the quiescence search, they are counted in nodes too.
+    qnodes: int = 0
+    null_move_cutoffs: int = 0
+    reductions: int = 0
+    futility_prunes: int = 0
+    # Re-searches of null-window searches that failed high, and of iterations outside the aspiration window.
+    pvs_researches: int = 0
+    aspiration_researches: int = 0
+    pawn_probes: int = 0
+    pawn_hits: int = 0
+    eval_hits: int = 0
+    eval_misses: int = 0
+    # Positions found in the endgame tablebase.
+    tb_hits: int = 0
+    # Beta cutoffs of searched moves and how many of them were caused by the first move.
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed else 0
+
+    @property
+    def pawn_hit_rate(self) -> float:
+        return self.pawn_hits * 100 / self.pawn_probes if self.pawn_probes else 0.0
+
+    @property
+    def eval_hit_rate(self) -> float:
+        probes = self.eval_hits + self.eval_misses
+        return self.eval_hits * 100 / probes if probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Percent of beta cutoffs caused by the first searched move, a measure of move ordering.
+        """
+        return self.first_move_cutoffs * 100 / self.cutoffs if self.cutoffs else 0.0
+
+
+class SearchResult(NamedTuple):
+    best_move: Optional[Move]
+    score: int
+    pv: list[Move]
+    stats: SearchStats
+
+
+class PVLine(NamedTuple):
+    move: Move
+    score: int
+    pv: list[Move]
+
+
+class _SearchAborted(Exception):
+    pass
+
+
+class Searcher:
+    """
+    Negamax alpha-beta search with iterative deepening. The search is stopped by the depth, the deadline,
+    the node limit or the is_stopped callback, the result of the last completed iteration is returned.
+    The on_iteration callback gets the result of every completed iteration with a best move.
+    A time manager stops the search after an iteration past its soft limit, its hard limit is the deadline.
+    Excluded moves aren't searched at the root, the root position isn't stored in the table then,
+    since its score isn't the one of the position.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        tt: TranspositionTable,
+        *,
+        deadline: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        orderer: Optional[MoveOrderer] = None,
+        options: SearchOptions = SearchOptions(),
+        pawn_table: Optional[PawnHashTable] = None,
+        eval_cache: Optional[EvalCache] = None,
+        nnue: Optional[NNUEWeights] = None,
+        is_stopped: Optional[Callable[[], bool]] = None,
+        tablebase: Optional[Tablebase] = None,
+        on_iteration: Optional[Callable[['SearchResult'], None]] = None,
+        time_manager: Optional[TimeManager] = None,
+        excluded_moves: Iterable[int] = (),
+    ):
+        self._board = board
+        self._nnue = nnue
+        self._pawn_table = pawn_table if pawn_table is not None else PawnHashTable()
+        self._eval_cache = eval_cache if eval_cache is not None else EvalCache()
+        self._options = options
+        self._tt = tt
+        self._orderer = orderer if orderer is not None else MoveOrderer(MAX_PLY)
+        self._deadline = deadline
+        self.time_manager = time_manager
+        self._max_nodes = max_nodes
+        self._is_stopped = is_stopped
+        self._tablebase = tablebase
+        self._on_iteration = on_iteration
+        self._excluded_moves = frozenset(excluded_moves)
+        self._next_check = min(TIME_CHECK_INTERVAL, max_nodes) if max_nodes is not None else TIME_CHECK_INTERVAL
+        self._pv_table: list[list[int]] = [[] for _ in range(MAX_PLY + 1)]
+        self.stats = SearchStats()
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, deadline: Optional[float]):
+        """
+        Sets the deadline of the running search, e.g. from another thread when a ponder search becomes a timed one.
+        """
+        self._deadline = deadline
+
+    @property
+    def time_manager(self) -> Optional[TimeManager]:
+        return self._time_manager
+
+    @time_manager.setter
+    def time_manager(self, time_manager: Optional[TimeManager]):
+        """
+        Sets the time manager of the search, its hard limit becomes the deadline.
+        """
+        self._time_manager = time_manager
+        if time_manager is not None:
+            self._deadline = min(time_manager.deadline, self._deadline or time_manager.deadline)
+
+    def search(self, depth: int, *, new_search: bool = True) -> SearchResult:
+        """
+        Searches to the depth. The table and the move orderer start a new search unless new_search is False,
+        e.g. for later passes of a multi-PV search that keep the entries, killer moves and history of earlier ones.
+        """
+        start_time = time.monotonic()
+        best_move: Optional[int] = None
+        score = 0
+        score_swing = 0
+        pv: list[int] = []
+        if new_search:
+            self._tt.new_search()
+            self._orderer.new_search()
+        pawn_probes, pawn_hits = self._pawn_table.probes, self._pawn_table.hits
+        eval_hits, eval_misses = self._eval_cache.hits, self._eval_cache.misses
+        evaluator: Evaluator | NNUEEvaluator
+        if self._nnue is not None:
+            evaluator = NNUEEvaluator(self._board, self._nnue, self._eval_cache)
+        else:
+            evaluator = Evaluator(self._board, self._pawn_table, self._eval_cache)
+        self._evaluate = evaluator.evaluate
+
+        try:
+            for current_depth in range(1, min(depth, MAX_PLY) + 1):
+                try:
+                    current_score = self._search_root(current_depth, score, score_swing)
+                except _SearchAborted:
+                    break
+                score_swing = abs(current_score - score)
+                score = current_score
+                pv = self._pv_table[0][:]
+                best_move = pv[0] if pv else None
+                self.stats.depth = current_depth
+                if self._on_iteration is not None and best_move is not None:
+                    self.stats.elapsed = time.monotonic() - start_time
+                    self._on_iteration(
+                        SearchResult(Move.from_int(pv[0]), score, [Move.from_int(move) for move in pv], self.stats)
+                    )
+                if best_move is None or abs(score) >= MATE_SCORE - MAX_PLY:
+                    break
+                if self._time_manager is not None and self._time_manager.update(best_move):
+                    break
+        finally:
+            evaluator.close()
+            self.stats.pawn_probes = self._pawn_table.probes - pawn_probes
+            self.stats.pawn_hits = self._pawn_table.hits - pawn_hits
+            self.stats.eval_hits = self._eval_cache.hits - eval_hits
+            self.stats.eval_misses = self._eval_cache.misses - eval_misses
+
+        if best_move is None and self.stats.depth == 0:
+            # The first iteration was aborted, take its best move so far or any legal move.
+            legal_moves = self._pv_table[0][:1] or self._board.get_legal_moves()[:1]
+            best_move = legal_moves[0] if legal_moves else None
+
+        self.stats.elapsed = time.monotonic() - start_time
+        return SearchResult(
+            Move.from_int(best_move) if best_move is not None else None,
+            score,
+            [Move.from_int(move) for move in pv],
+            self.stats,
+        )
+
+    def _search_root(self, depth: int, previous_score: int, score_swing: int) -> int:
+        """
+        Searches the root position in the aspiration window around the score of the previous iteration.
+        Only the failed side is widened, it is opened fully after repeated failures. Shallow iterations,
+        mate scores and scores that swung by more than the delta at the previous iteration are searched
+        with the full window, since they are likely to fail.
+        """
+        options = self._options
+        delta = options.aspiration_delta
+        if (
+            depth < ASPIRATION_MIN_DEPTH
+            or not delta
+            or score_swing > delta
+            or abs(previous_score) >= MATE_SCORE - MAX_PLY
+        ):
+            return self._negamax(depth, 0, -INFINITY, INFINITY, False)
+
+        alpha = max(previous_score - delta, -INFINITY)
+        beta = min(previous_score + delta, INFINITY)
+        failures = 0
+        while True:
+            score = self._negamax(depth, 0, alpha, beta, False)
+            if alpha < score < beta or (alpha == -INFINITY and beta == INFINITY):
+                return score
+            self.stats.aspiration_researches += 1
+            failures += 1
+            delta *= options.aspiration_growth
+            if score <= alpha:
+                alpha = -INFINITY if failures >= ASPIRATION_MAX_FAILURES else max(score - delta, -INFINITY)
+            else:
+                beta = INFINITY if failures >= ASPIRATION_MAX_FAILURES else min(score + delta, INFINITY)
+
+    def _negamax(self, depth: int, ply: int, alpha: int, beta: int, is_null_move_allowed: bool = True) -> int:
+        if depth <= 0:
+            return self._quiesce(ply, alpha, beta)
+
+        stats = self.stats
+        stats.nodes += 1
+        if stats.nodes >= self._next_check:
+            self._check_limits()
+
+        pv_table = self._pv_table
+        pv_table[ply].clear()
+        board = self._board
+        if ply >= MAX_PLY:
+            return self._evaluate()
+
+        # Repetitions and the fifty-move rule are draws. Repetitions are counted once, since the side that
+        # repeats the position could repeat it again. Checkmate by the last move wins over the fifty-move rule.
+        if ply > 0 and (board.is_repetition() or board.is_fifty_move_draw() and not board.is_in_checkmate()):
+            return 0
+
+        if self._tablebase is not None and ply > 0:
+            tb_entry = self._tablebase.probe(board)
+            if tb_entry is not None:
+                stats.tb_hits += 1
+                if tb_entry.wdl > 0:
+                    return MATE_SCORE - ply - tb_entry.dtm
+                if tb_entry.wdl < 0:
+                    return -MATE_SCORE + ply + tb_entry.dtm
+                return 0
+
+        key = board.key
+        hash_move = 0
+        entry = self._tt.probe(key)
+        if entry is not None:
+            hash_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                score = _score_from_tt(entry.score, ply)
+                if (
+                    entry.bound == BOUND_EXACT
+                    or (entry.bound == BOUND_LOWER and score >= beta)
+                    or (entry.bound == BOUND_UPPER and score <= alpha)
+                ):
+                    stats.tt_cutoffs += 1
+                    return score
+
+        options = self._options
+        color = board.moving_pieces_color
+        in_check = board.is_in_check(color)
+        static_score = self._evaluate() if not in_check and (options.null_move or options.futility) else 0
+
+        # If passing the move still fails high, a real move would too. Positions with only pawns are
+        # skipped, since there passing can be the best move (zugzwang).
+        if (
+            options.null_move
+            and is_null_move_allowed
+            and not in_check
+            and abs(beta) < MATE_SCORE - MAX_PLY
+            and depth > NULL_MOVE_REDUCTION
+            and static_score >= beta
+            and _has_non_pawn_material(board, color)
+        ):
+            board.make_null_move()
+            try:
+                score = -self._negamax(depth - 1 - NULL_MOVE_REDUCTION, ply + 1, -beta, -beta + 1, False)
+            finally:
+                board.unmake_move()
+            if score >= beta:
+                stats.null_move_cutoffs += 1
+                return beta
+
+        is_futile = (
+            options.futility
+            and not in_check
+            and abs(alpha) < MATE_SCORE - MAX_PLY
+            and depth < len(FUTILITY_MARGINS)
+            and static_score + FUTILITY_MARGINS[depth] <= alpha
+        )
+
+        orderer = self._orderer
+        legal_move_count = 0
+        is_pruned = False
+        best_move = 0
+        # The score of the root without the excluded moves isn't stored.
+        is_stored = ply > 0 or not self._excluded_moves
+        for move in orderer.pick_moves(board, ply, hash_move):
+            if not ply and move in self._excluded_moves:
+                continue
+            is_quiet = not move >> FLAGS_SHIFT and not board.is_capture(move)
+            board.make_move(move)
+            try:
+                if board.is_in_check(color):
+                    continue
+                legal_move_count += 1
+                gives_check = is_quiet and board.is_in_check()
+                if is_futile and is_quiet and not gives_check and legal_move_count > 1:
+                    stats.futility_prunes += 1
+                    is_pruned = True
+                    continue
+
+                reduction = 0
+                if (
+                    options.lmr
+                    and is_quiet
+                    and not in_check
+                    and not gives_check
+                    and depth >= LMR_MIN_DEPTH
+                    and legal_move_count > LMR_MOVE_COUNT
+                ):
+                    reduction = 1 if legal_move_count <= 2 * LMR_MOVE_COUNT or depth < 6 else 2
+                    stats.reductions += 1
+                if legal_move_count == 1 or not options.pvs:
+                    score = -self._negamax(depth - 1 - reduction, ply + 1, -beta, -alpha)
+                    if reduction and score > alpha:
+                        score = -self._negamax(depth - 1, ply + 1, -beta, -alpha)
+                else:
+                    # Moves after the first one are expected to fail low, they are searched with a null window
+                    # and searched again with the full window only if they raise alpha.
+                    score = -self._negamax(depth - 1 - reduction, ply + 1, -alpha - 1, -alpha)
+                    if reduction and score > alpha:
+                        score = -self._negamax(depth - 1, ply + 1, -alpha - 1, -alpha)
+                    if alpha < score < beta:
+                        stats.pvs_researches += 1
+                        score = -self._negamax(depth - 1, ply + 1, -beta, -alpha)
+            finally:
+                board.unmake_move()
+
+            if score > alpha:
+                alpha = score
+                best_move = move
+                pv_table[ply][:] = [move] + pv_table[ply + 1]
+                if score >= beta:
+                    stats.cutoffs += 1
+                    if legal_move_count == 1:
+                        stats.first_move_cutoffs += 1
+                    if is_quiet:
+                        orderer.update_quiet_cutoff(color, move, ply, depth)
+                    if is_stored:
+                        self._tt.store(key, depth, _score_to_tt(score, ply), BOUND_LOWER, move)
+                    return score
+
+        if not legal_move_count:
+            return -MATE_SCORE + ply if in_check else 0
+        if is_pruned and not best_move:
+            # The score of pruned moves is unknown, so the position isn't stored.
+            return alpha
+        if is_stored:
+            self._tt.store(key, depth, _score_to_tt(alpha, ply), BOUND_EXACT if best_move else BOUND_UPPER, best_move)
+        return alpha
+
+    def _quiesce(self, ply: int, alpha: int, beta: int) -> int:
+        """
+        Searches captures until the position is quiet, so that the evaluation isn't taken in the middle
+        of an exchange. The moving color can stand pat on the evaluation instead of capturing, captures
+        that lose material by the static exchange evaluation are skipped. In check all evasions are searched.
+        """
+        stats = self.stats
+        stats.nodes += 1
+        stats.qnodes += 1
+        if stats.nodes >= self._next_check:
+            self._check_limits()
+
+        pv_table = self._pv_table
+        pv_table[ply].clear()
+        board = self._board
+        if ply >= MAX_PLY:
+            return self._evaluate()
+
+        color = board.moving_pieces_color
+        in_check = board.is_in_check(color)
+        if in_check:
+            moves = self._orderer.pick_moves(board, ply)
+        else:
+            stand_pat = self._evaluate()
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            moves = self._orderer.pick_captures(board)
+
+        has_legal_move = False
+        for move in moves:
+            board.make_move(move)
+            try:
+                if board.is_in_check(color):
+                    continue
+                has_legal_move = True
+                score = -self._quiesce(ply + 1, -beta, -alpha)
+            finally:
+                board.unmake_move()
+
+            if score > alpha:
+                if score >= beta:
+                    return score
+                alpha = score
+                pv_table[ply][:] = [move] + pv_table[ply + 1]
+
+        if in_check and not has_legal_move:
+            return -MATE_SCORE + ply
+        return alpha
+
+    def _check_limits(self):
+        nodes = self.stats.nodes
+        if self._max_nodes is not None and nodes >= self._max_nodes:
+            raise _SearchAborted
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise _SearchAborted
+        if self._is_stopped is not None and self._is_stopped():
+            raise _SearchAborted
+        self._next_check = nodes + TIME_CHECK_INTERVAL
+        if self._max_nodes is not None:
+            self._next_check = min(self._next_check, self._max_nodes)
+
+
+def _has_non_pawn_material(board: Board, color: Color) -> bool:
+    return any(
+        piece.TYPE is not None and PieceType.PAWN < piece.TYPE < PieceType.KING
+        for piece in board.pieces_by_color[color].values()
+    )
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """
+    Converts the mate score from the distance to the root to the distance to the position.
+    """
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+def get_search_depth(depth: Optional[int], movetime: Optional[float], nodes: Optional[int]) -> int:
+    """
+    Returns the maximum depth of the search limits, checking that the given limits are positive.
+    The depth is unlimited if only time or nodes are limited, DEFAULT_DEPTH if nothing is.
+    """
+    for name, value in (('depth', depth), ('movetime', movetime), ('nodes', nodes)):
+        if value is not None and value <= 0:
+            raise SearchError(f'Search {name} must be positive, but got {value}.')
+
+    if depth is None:
+        depth = MAX_PLY if movetime is not None or nodes is not None else DEFAULT_DEPTH
+    return depth
+
+
+def search(
+    board: Board,
+    depth: Optional[int] = None,
+    movetime: Optional[float] = None,
+    nodes: Optional[int] = None,
+    *,
+    tt: Optional[TranspositionTable] = None,
+    orderer: Optional[MoveOrderer] = None,
+    options: SearchOptions = SearchOptions(),
+) -> SearchResult:
+    """
+    Searches the best move of the moving color.
+    :param depth: maximum depth of iterative deepening in plies.
+    :param movetime: maximum search time in seconds.
+    :param nodes: maximum number of searched nodes.
+    :param tt: transposition table kept between searches, a new one is used by default.
+    :param orderer: move orderer with killer moves and history kept between searches, a new one is used by default.
+    :param options: selective search techniques, all of them are used by default.
+    Returns (best_move, score, pv, stats), the score is in centipawns from the point of view of the moving color.
+    """
+    depth = get_search_depth(depth, movetime, nodes)
+    deadline = time.monotonic() + movetime if movetime is not None else None
+    if tt is None:
+        tt = TranspositionTable()
+    return Searcher(board, tt, deadline=deadline, max_nodes=nodes, orderer=orderer, options=options).search(depth)
+
+
+def search_multipv(
+    board: Board,
+    multipv: int,
+    depth: Optional[int] = None,
+    movetime: Optional[float] = None,
+    nodes: Optional[int] = None,
+    *,
+    tt: Optional[TranspositionTable] = None,
+    orderer: Optional[MoveOrderer] = None,
+    options: SearchOptions = SearchOptions(),
+) -> list[PVLine]:
+    """
+    Searches the best multipv moves of the moving color in passes, every pass excludes the root moves found
+    by the passes before. The passes share the transposition table and the move orderer, so that later ones
+    are cheap, and the time and node limits. Returns (move, score, pv) of the moves, the best first,
+    fewer if there are fewer legal moves or the limits stop a pass before its first iteration.
+    """
+    if multipv < 1:
+        raise SearchError(f'Number of principal variations must be positive, but got {multipv}.')
+    depth = get_search_depth(depth, movetime, nodes)
+    deadline = time.monotonic() + movetime if movetime is not None else None
+    if tt is None:
+        tt = TranspositionTable()
+    if orderer is None:
+        orderer = MoveOrderer(MAX_PLY)
+    # The passes are one search of the table and the orderer, so that later passes use their data.
+    tt.new_search()
+    orderer.new_search()
+    pawn_table = PawnHashTable()
+    eval_cache = EvalCache()
+
+    lines: list[PVLine] = []
+    searched_nodes = 0
+    for _ in range(min(multipv, len(board.get_legal_moves()))):
+        if nodes is not None and searched_nodes >= nodes:
+            break
+        result = Searcher(
+            board,
+            tt,
+            deadline=deadline,
+            max_nodes=nodes - searched_nodes if nodes is not None else None,
+            orderer=orderer,
+            options=options,
+            pawn_table=pawn_table,
+            eval_cache=eval_cache,
+            excluded_moves=[line.move for line in lines],
+        ).search(depth, new_search=False)
+        searched_nodes += result.stats.nodes
+        if result.best_move is None or not result.stats.depth:
+            break
+        lines.append(PVLine(result.best_move, result.score, result.pv))
+    return sorted(lines, key=lambda line: -line.score)
@@ -0,0 +1,212 @@
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import replace
+from multiprocessing.queues import Queue, SimpleQueue
+from multiprocessing.synchronize import Event
+from typing import Optional
+
+from engine.evaluation import EvalCache
+from engine.ordering import MoveOrderer
+from engine.pawns import PawnHashTable
+from engine.search import MAX_PLY, Searcher, SearchOptions, SearchResult, get_search_depth
+from engine.transposition import DEFAULT_SIZE_MB, SharedTranspositionTable
+from errors import SearchError
+from objects.board import Board
+from objects.game import GameRecord
+
+DEFAULT_WORKER_COUNT = os.cpu_count() or 1
+# Every pair of helper workers widens the aspiration window by this delta, so that helpers of the same depth
+# search other windows than the main worker.
+HELPER_ASPIRATION_STEP = 25
+# Seconds between checks that the worker processes are alive while waiting for their results.
+WORKER_POLL_INTERVAL = 0.5
+
+# State of a worker process, kept between searches.
+_worker_tt: Optional[SharedTranspositionTable] = None
+_worker_stop_event: Optional[Event] = None
+_worker_orderer: Optional[MoveOrderer] = None
+_worker_pawn_table: Optional[PawnHashTable] = None
+_worker_eval_cache: Optional[EvalCache] = None
+
+
+def _init_worker(tt_name: str, tt_size_mb: float, stop_event: Event):
+    global _worker_tt, _worker_stop_event, _worker_orderer, _worker_pawn_table, _worker_eval_cache
+    _worker_tt = SharedTranspositionTable(tt_size_mb, name=tt_name)
+    _worker_stop_event = stop_event
+    _worker_orderer = MoveOrderer(MAX_PLY)
+    _worker_pawn_table = PawnHashTable()
+    _worker_eval_cache = EvalCache()
+
+
+def _search_in_worker(
+    record: GameRecord,
+    depth: int,
+    deadline: Optional[float],
+    max_nodes: Optional[int],
+    options: SearchOptions,
+    tt_age: int,
+    is_main: bool,
+) -> SearchResult:
+    """
+    Searches the position after the moves of the game record in the worker process, the moves are replayed
+    so that repetitions of the game are found. The deadline is wall-clock time, since the monotonic clock
+    of other processes can have another reference point. The main worker stops the other ones when it's done.
+    """
+    assert _worker_tt is not None and _worker_stop_event is not None
+    # The searcher starts a new search of the table, which has to have the age of the parent's table.
+    _worker_tt.age = tt_age - 1
+    searcher = Searcher(
+        record.get_board(),
+        _worker_tt,
+        deadline=time.monotonic() + deadline - time.time() if deadline is not None else None,
+        max_nodes=max_nodes,
+        orderer=_worker_orderer,
+        options=options,
+        pawn_table=_worker_pawn_table,
+        eval_cache=_worker_eval_cache,
+        is_stopped=_worker_stop_event.is_set,
+    )
+    try:
+        return searcher.search(depth)
+    finally:
+        if is_main:
+            _worker_stop_event.set()
+
+
+def _run_worker(
+    index: int,
+    tt_name: str,
+    tt_size_mb: float,
+    stop_event: Event,
+    tasks: SimpleQueue,
+    results: Queue,
+):
+    """
+    Runs the worker process: searches the tasks of its queue until it gets None, puts the index of the worker
+    with the result or the raised error into the result queue.
+    """
+    _init_worker(tt_name, tt_size_mb, stop_event)
+    while (task := tasks.get()) is not None:
+        try:
+            results.put((index, _search_in_worker(*task)))
+        except Exception as error:
+            results.put((index, error))
+
+
+def _get_worker_options(options: SearchOptions, index: int) -> SearchOptions:
+    """
+    Returns the search options of the worker, the main worker (index 0) uses the given ones.
+    """
+    return replace(options, aspiration_delta=options.aspiration_delta + index // 2 * HELPER_ASPIRATION_STEP)
+
+
+class LazySMPSearcher:
+    """
+    Lazy SMP parallel search: worker processes search the same root position at once and share one
+    transposition table in shared memory, so that results of one worker cut the search of the others.
+    Odd workers search one ply deeper and every pair of helpers has a wider aspiration window, so that
+    the workers don't search the same nodes in lockstep. The search ends when the main worker is done
+    or at the time limit, so deeper workers aren't cut off by shallower ones.
+    Processes are used, since threads don't search in parallel under the GIL. Every worker has its own process
+    and task queue, so that all of them search at once. The workers are started once and kept between
+    searches, close() stops them and frees the table.
+    """
+
+    def __init__(self, worker_count: int = DEFAULT_WORKER_COUNT, tt_size_mb: float = DEFAULT_SIZE_MB):
+        if worker_count < 1:
+            raise SearchError(f'Worker count must be at least 1, but got {worker_count}.')
+        self.worker_count = worker_count
+        self.tt = SharedTranspositionTable(tt_size_mb)
+        context = multiprocessing.get_context('spawn')
+        self._stop_event = context.Event()
+        self._tasks: list[SimpleQueue] = [context.SimpleQueue() for _ in range(worker_count)]
+        self._results: Queue = context.Queue()
+        self._processes = [
+            context.Process(
+                target=_run_worker,
+                args=(index, self.tt.name, self.tt.size_mb, self._stop_event, tasks, self._results),
+                daemon=True,
+            )
+            for index, tasks in enumerate(self._tasks)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def __enter__(self) -> 'LazySMPSearcher':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self.tt.unlink()
+
+    def _get_result(self) -> tuple[int, SearchResult | Exception]:
+        """
+        Waits for the next result of a worker, raises SearchError if a worker process has stopped.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    raise SearchError('A search worker process has stopped.')
+
+    def search(
+        self,
+        board: Board,
+        depth: Optional[int] = None,
+        movetime: Optional[float] = None,
+        nodes: Optional[int] = None,
+        *,
+        options: SearchOptions = SearchOptions(),
+    ) -> SearchResult:
+        """
+        Searches the best move of the moving color with all workers, limits are the ones of search(),
+        the node limit applies to every worker. Returns the result of the worker that completed the deepest
+        iteration, the main worker on a tie. Nodes of the stats are summed over all workers.
+        """
+        depth = get_search_depth(depth, movetime, nodes)
+        start_time = time.monotonic()
+        deadline = time.time() + movetime if movetime is not None else None
+        self.tt.new_search()
+        self._stop_event.clear()
+        record = GameRecord.from_board(board)
+        for index, tasks in enumerate(self._tasks):
+            tasks.put(
+                (
+                    record,
+                    min(depth + index % 2, MAX_PLY),
+                    deadline,
+                    nodes,
+                    _get_worker_options(options, index),
+                    self.tt.age,
+                    not index,
+                )
+            )
+
+        results_by_index: dict[int, SearchResult] = {}
+        errors = []
+        for _ in range(self.worker_count):
+            index, result = self._get_result()
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                results_by_index[index] = result
+        if errors:
+            raise errors[0]
+
+        results = [results_by_index[index] for index in range(self.worker_count)]
+        best_result = max(results, key=lambda result: result.stats.depth)
+        stats = replace(
+            best_result.stats,
+            nodes=sum(result.stats.nodes for result in results),
+            elapsed=time.monotonic() - start_time,
+        )
+        return best_result._replace(stats=stats)
@@ -0,0 +1,459 @@
+import sys
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from errors import TablebaseError
+from objects.board import Board
+from objects.enums import Color, PieceType
+
+# Materials in the order of generation, a material with a pawn needs the materials its pawn promotes to.
+TABLEBASE_MATERIALS = ('KQK', 'KRK', 'KBNK', 'KPK')
+PROMOTION_TYPES = (PieceType.QUEEN, PieceType.ROOK)
+
+# A file is the header (magic, version, material name) followed by one signed byte per position:
+# 0 is a draw, v > 0 is a win of the moving color in v plies, v < 0 is a loss in -v - 1 plies.
+TABLEBASE_MAGIC = b'CLTB'
+TABLEBASE_VERSION = 1
+HEADER_SIZE = 16
+FILE_SUFFIX = '.tb'
+ILLEGAL_VALUE = -128
+# Number of positions the solver processes at once, it bounds the size of the temporary arrays.
+CHUNK_SIZE = 64**3
+
+# Positions are indexed by [moving color][white king][black king][white pieces of the material...],
+# every square is 6 bits, so an index is a perfect hash of the position without lookups.
+_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+_ROOK_DIRECTIONS = range(4)
+_BISHOP_DIRECTIONS = range(4, 8)
+_KNIGHT_JUMPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+
+
+def _get_targets(steps: Iterable[tuple[int, int]], distance: int) -> np.ndarray:
+    """
+    Returns target squares by [square][step][distance - 1], -1 if the target is off the board.
+    """
+    steps = tuple(steps)
+    targets = np.full((64, len(steps), distance), -1, dtype=np.int8)
+    for square in range(64):
+        for step_index, (file_step, rank_step) in enumerate(steps):
+            for step in range(1, distance + 1):
+                file, rank = (square & 7) + file_step * step, (square >> 3) + rank_step * step
+                if not (0 <= file < 8 and 0 <= rank < 8):
+                    break
+                targets[square, step_index, step - 1] = rank * 8 + file
+    return targets
+
+
+_RAYS = _get_targets(_DIRECTIONS, 7)
+_KNIGHT_TARGETS = _get_targets(_KNIGHT_JUMPS, 1)[:, :, 0]
+
+_FILES = np.arange(64) & 7
+_RANKS = np.arange(64) >> 3
+_FILE_DISTANCES = np.abs(_FILES[np.newaxis, :] - _FILES[:, np.newaxis])
+_RANK_STEPS = _RANKS[np.newaxis, :] - _RANKS[:, np.newaxis]
+_KING_ATTACKS = np.maximum(_FILE_DISTANCES, np.abs(_RANK_STEPS)) == 1
+_KNIGHT_ATTACKS = _FILE_DISTANCES * np.abs(_RANK_STEPS) == 2
+_WHITE_PAWN_ATTACKS = (_RANK_STEPS == 1) & (_FILE_DISTANCES == 1)
+_ROOK_LINES = (_FILE_DISTANCES == 0) != (_RANK_STEPS == 0)
+_BISHOP_LINES = (_FILE_DISTANCES == np.abs(_RANK_STEPS)) & (_FILE_DISTANCES != 0)
+
+# Bits of the squares strictly between two squares on a line.
+_BETWEEN = np.zeros((64, 64), dtype=np.uint64)
+for _square in range(64):
+    for _direction in range(8):
+        _bits = 0
+        for _target in _RAYS[_square, _direction]:
+            if _target == -1:
+                break
+            _BETWEEN[_square, _target] = _bits
+            _bits |= 1 << int(_target)
+
+
+class TablebaseEntry(NamedTuple):
+    # 1 if the moving color wins, 0 for a draw, -1 if it loses.
+    wdl: int
+    # Distance to mate in plies, 0 for a draw.
+    dtm: int
+
+
+def get_material_piece_types(name: str) -> tuple[PieceType, ...]:
+    """
+    Returns piece types of the white chess pieces besides the king of the material, e.g. KBNK.
+    """
+    if len(name) < 3 or name[0] != 'K' or name[-1] != 'K' or 'K' in name[1:-1]:
+        raise TablebaseError(f'Unknown tablebase material {name!r}.')
+    try:
+        return tuple(PieceType.from_symbol(symbol) for symbol in name[1:-1])
+    except ValueError:
+        raise TablebaseError(f'Unknown tablebase material {name!r}.')
+
+
+def _is_attacked_by_white(
+    target: np.ndarray, squares: list[np.ndarray], piece_types: tuple[PieceType, ...], present: list[np.ndarray]
+) -> np.ndarray:
+    """
+    Returns whether the target squares are attacked by the white king (squares[0]) and the white chess pieces
+    (squares[2:]), present has masks of the white king and the pieces that aren't captured.
+    The black king doesn't block, since it's the one that is attacked.
+    """
+    attacked = _KING_ATTACKS[squares[0], target]
+    white_squares = [squares[0]] + squares[2:]
+    for slot, piece_type in enumerate(piece_types, 1):
+        square = white_squares[slot]
+        if piece_type == PieceType.KNIGHT:
+            attacks = _KNIGHT_ATTACKS[square, target]
+        elif piece_type == PieceType.PAWN:
+            attacks = _WHITE_PAWN_ATTACKS[square, target]
+        else:
+            lines = _ROOK_LINES if piece_type == PieceType.ROOK else _BISHOP_LINES
+            if piece_type == PieceType.QUEEN:
+                lines = _ROOK_LINES | _BISHOP_LINES
+            attacks = lines[square, target]
+            between = _BETWEEN[square, target]
+            for blocker_slot, blocker in enumerate(white_squares):
+                if blocker_slot != slot:
+                    attacks &= (between >> blocker.astype(np.uint64)) & np.uint64(1) == 0
+        attacked |= attacks & present[slot]
+    return attacked
+
+
+class _Solver:
+    """
+    Retrograde analysis of a material with white as the stronger side. Positions lost for black
+    are found from mates backwards: a white move into a lost position wins, a black position is lost
+    when all its moves go into won positions. Sets of positions are processed as NumPy arrays.
+    """
+
+    def __init__(self, piece_types: tuple[PieceType, ...]):
+        self.piece_types = piece_types
+        slot_count = 2 + len(piece_types)
+        self.size = 64**slot_count
+        self.strides = [64 ** (slot_count - 1 - slot) for slot in range(slot_count)]
+        board_squares = np.arange(64, dtype=np.uint8)
+        self.squares = [np.tile(board_squares.repeat(stride), self.size // stride // 64) for stride in self.strides]
+
+    def _get_squares(self, indexes: np.ndarray) -> list[np.ndarray]:
+        return [squares[indexes].astype(np.int64) for squares in self.squares]
+
+    def _classify(self, chunk: slice) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns whether the positions of the chunk are legal, whether black is in check, the number of black moves
+        that stay in the material and whether black can capture into a drawn material.
+        """
+        # The squares stay bytes, NumPy widens them only while indexing the lookup tables.
+        squares = [squares[chunk] for squares in self.squares]
+        white_king, black_king = squares[0], squares[1]
+        legal = ~_KING_ATTACKS[white_king, black_king]
+        for slot, slot_squares in enumerate(squares):
+            for other_squares in squares[slot + 1 :]:
+                legal &= slot_squares != other_squares
+        for slot, piece_type in enumerate(self.piece_types, 2):
+            if piece_type == PieceType.PAWN:
+                legal &= (squares[slot] >= 8) & (squares[slot] < 56)
+        all_present = [np.ones(1, dtype=bool)] * (len(squares) - 1)
+        black_in_check = _is_attacked_by_white(black_king, squares, self.piece_types, all_present)
+
+        move_counts = np.zeros(len(white_king), dtype=np.int16)
+        can_escape = np.zeros(len(white_king), dtype=bool)
+        for direction in range(8):
+            target = _RAYS[black_king, direction, 0]
+            is_move = legal & (target >= 0)
+            target = np.where(is_move, target, 0)
+            is_move &= ~_KING_ATTACKS[white_king, target]
+            present = [np.ones(1, dtype=bool)] + [target != slot_squares for slot_squares in squares[2:]]
+            is_capture = ~np.logical_and.reduce(present[1:])
+            is_move &= ~_is_attacked_by_white(target, squares, self.piece_types, present)
+            can_escape |= is_move & is_capture
+            move_counts += is_move & ~is_capture
+        return legal, black_in_check, move_counts, can_escape
+
+    def solve(self, promotion_tables: dict[PieceType, np.ndarray]) -> np.ndarray:
+        legal = np.empty(self.size, dtype=bool)
+        black_in_check = np.empty(self.size, dtype=bool)
+        move_counts = np.empty(self.size, dtype=np.int16)
+        can_escape = np.empty(self.size, dtype=bool)
+        # Positions are classified in chunks, so the temporary arrays of the attacks stay small.
+        for start in range(0, self.size, CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            legal[chunk], black_in_check[chunk], move_counts[chunk], can_escape[chunk] = self._classify(chunk)
+        white_legal = legal & ~black_in_check
+
+        white_plies = np.full(self.size, -1, dtype=np.int16)
+        black_plies = np.full(self.size, -1, dtype=np.int16)
+        is_mate = legal & black_in_check & (move_counts == 0) & ~can_escape
+        black_plies[is_mate] = 0
+        can_lose = legal & ~can_escape & (move_counts > 0)
+        promotion_plies = self._get_promotion_plies(white_legal, promotion_tables)
+        del can_escape, black_in_check
+
+        frontier = np.flatnonzero(is_mate)
+        plies = 1
+        while True:
+            # Predecessors are found a chunk of the frontier at a time, a position found earlier is skipped.
+            won_chunks = []
+            for start in range(0, len(frontier), CHUNK_SIZE):
+                won = self._get_white_predecessors(frontier[start : start + CHUNK_SIZE])
+                won = np.unique(won[white_legal[won] & (white_plies[won] < 0)])
+                white_plies[won] = plies
+                won_chunks.append(won)
+            won = np.flatnonzero(promotion_plies == plies)
+            won = won[white_legal[won] & (white_plies[won] < 0)]
+            white_plies[won] = plies
+            won = np.concatenate(won_chunks + [won])
+
+            frontier_chunks = []
+            for start in range(0, len(won), CHUNK_SIZE):
+                losses = self._get_black_predecessors(won[start : start + CHUNK_SIZE])
+                losses = losses[can_lose[losses] & (black_plies[losses] < 0)]
+                np.subtract.at(move_counts, losses, 1)
+                lost = np.unique(losses[move_counts[losses] == 0])
+                black_plies[lost] = plies + 1
+                frontier_chunks.append(lost)
+            frontier = np.concatenate(frontier_chunks) if frontier_chunks else np.empty(0, dtype=np.int64)
+            if not len(won) and not (promotion_plies > plies).any():
+                break
+            plies += 2
+
+        if max(white_plies.max(), black_plies.max()) >= -ILLEGAL_VALUE - 1:
+            raise TablebaseError("Distance to mate doesn't fit the tablebase values.")
+        values = np.zeros(2 * self.size, dtype=np.int8)
+        values[: self.size] = np.where(white_plies >= 0, white_plies, 0)
+        values[: self.size][~white_legal] = ILLEGAL_VALUE
+        values[self.size :] = np.where(black_plies >= 0, -black_plies - 1, 0)
+        values[self.size :][~legal] = ILLEGAL_VALUE
+        return values
+
+    def _get_promotion_plies(
+        self, white_legal: np.ndarray, promotion_tables: dict[PieceType, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns plies to mate of white positions won by promoting the pawn, 0 if there is none.
+        Only materials with the pawn as the last chess piece are supported.
+        """
+        if PieceType.PAWN not in self.piece_types:
+            return np.zeros(self.size, dtype=np.int16)
+        promotion_plies = np.full(self.size, np.iinfo(np.int16).max, dtype=np.int16)
+        if self.piece_types.index(PieceType.PAWN) != len(self.piece_types) - 1:
+            raise TablebaseError('The pawn has to be the last chess piece of the material.')
+
+        indexes = np.flatnonzero(white_legal & (self.squares[-1] >= 48))
+        squares = self._get_squares(indexes)
+        target = squares[-1] + 8
+        is_move = np.logical_and.reduce([target != slot_squares for slot_squares in squares[:-1]])
+        indexes, target = indexes[is_move], target[is_move]
+        # The promoted piece takes the place of the pawn, so the index differs by the square only.
+        promoted_indexes = indexes - indexes % 64 + target
+        for promotion_type in PROMOTION_TYPES:
+            table = promotion_tables.get(promotion_type)
+            if table is None:
+                continue
+            # Positions after the promotion are positions of black to move, lost in -value - 1 plies.
+            values = table[self.size + promoted_indexes].astype(np.int16)
+            is_win = (values < 0) & (values != ILLEGAL_VALUE)
+            plies = np.where(is_win, -values, promotion_plies[indexes])
+            promotion_plies[indexes] = np.minimum(promotion_plies[indexes], plies)
+        promotion_plies[promotion_plies == np.iinfo(np.int16).max] = 0
+        return promotion_plies
+
+    def _get_white_predecessors(self, indexes: np.ndarray) -> np.ndarray:
+        """
+        Returns positions of white to move, from which a white move leads to the black positions.
+        """
+        squares = self._get_squares(indexes)
+        predecessors = []
+
+        def add(slot: int, start: np.ndarray, is_move: np.ndarray):
+            predecessors.append(indexes[is_move] + (start[is_move] - squares[slot][is_move]) * self.strides[slot])
+
+        def is_empty(start: np.ndarray, slot: int) -> np.ndarray:
+            return np.logical_and.reduce(
+                [start != slot_squares for other_slot, slot_squares in enumerate(squares) if other_slot != slot]
+            )
+
+        for slot, piece_type in [(0, PieceType.KING)] + list(enumerate(self.piece_types, 2)):
+            end = squares[slot]
+            if piece_type in (PieceType.KING, PieceType.KNIGHT):
+                targets = _RAYS[end, :, 0] if piece_type == PieceType.KING else _KNIGHT_TARGETS[end]
+                for step in range(8):
+                    start = targets[:, step]
+                    is_move = start >= 0
+                    start = np.where(is_move, start, 0)
+                    add(slot, start, is_move & is_empty(start, slot))
+            elif piece_type == PieceType.PAWN:
+                start = end - 8
+                is_move = (end >= 16) & is_empty(np.maximum(start, 0), slot)
+                add(slot, start, is_move)
+                is_move &= (end >= 24) & (end < 32) & is_empty(end - 16, slot)
+                add(slot, end - 16, is_move)
+            else:
+                directions = {
+                    PieceType.ROOK: _ROOK_DIRECTIONS,
+                    PieceType.BISHOP: _BISHOP_DIRECTIONS,
+                    PieceType.QUEEN: range(8),
+                }[piece_type]
+                for direction in directions:
+                    is_open = np.ones(len(indexes), dtype=bool)
+                    for distance in range(7):
+                        start = _RAYS[end, direction, distance]
+                        is_open &= start >= 0
+                        start = np.where(is_open, start, 0)
+                        is_open &= is_empty(start, slot)
+                        add(slot, start, is_open)
+        return np.concatenate(predecessors) if predecessors else np.empty(0, dtype=np.int64)
+
+    def _get_black_predecessors(self, indexes: np.ndarray) -> np.ndarray:
+        """
+        Returns positions of black to move, from which a black king move leads to the white positions.
+        """
+        squares = self._get_squares(indexes)
+        end = squares[1]
+        predecessors = []
+        for direction in range(8):
+            start = _RAYS[end, direction, 0]
+            is_move = start >= 0
+            start = np.where(is_move, start, 0)
+            for slot, slot_squares in enumerate(squares):
+                if slot != 1:
+                    is_move &= start != slot_squares
+            predecessors.append(indexes[is_move] + (start[is_move] - end[is_move]) * self.strides[1])
+        return np.concatenate(predecessors)
+
+
+def generate_table(name: str, promotion_tables: Optional[dict[PieceType, np.ndarray]] = None) -> np.ndarray:
+    """
+    Returns values of all positions of the material, see TABLEBASE_MAGIC for the encoding.
+    Promotion tables are tables of the materials the pawn promotes to.
+    """
+    return _Solver(get_material_piece_types(name)).solve(promotion_tables or {})
+
+
+def write_table(path: str | Path, name: str, values: np.ndarray):
+    header = TABLEBASE_MAGIC + bytes((TABLEBASE_VERSION,)) + name.encode('ascii').ljust(HEADER_SIZE - 5, b'\0')
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(values.astype(np.int8).tobytes())
+
+
+def load_table(path: str | Path) -> tuple[str, np.ndarray]:
+    """
+    Returns the material name and values of the tablebase file, memory-mapped read-only.
+    """
+    path = Path(path)
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:4] != TABLEBASE_MAGIC or header[4] != TABLEBASE_VERSION:
+            raise TablebaseError(f'{path} is not a tablebase file of version {TABLEBASE_VERSION}.')
+        name = header[5:].rstrip(b'\0').decode('ascii')
+        size = 2 * 64 ** (2 + len(get_material_piece_types(name)))
+        values = np.memmap(path, dtype=np.int8, mode='r', offset=HEADER_SIZE)
+    except (OSError, ValueError) as error:
+        raise TablebaseError(f'Cannot load tablebase {path}: {error}') from error
+    if len(values) != size:
+        raise TablebaseError(f'Tablebase {path} must have {size} positions, but has {len(values)}.')
+    return name, values
+
+
+def generate(directory: str | Path, names: Iterable[str] = TABLEBASE_MATERIALS) -> list[Path]:
+    """
+    Generates tablebase files of the materials in the directory, returns their paths.
+    Tables the pawn promotes to are loaded from the directory or generated before.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        promotion_tables = {}
+        if 'P' in name:
+            for promotion_type in PROMOTION_TYPES:
+                promotion_name = name.replace('P', promotion_type.symbol)
+                promotion_path = directory / f'{promotion_name}{FILE_SUFFIX}'
+                if not promotion_path.exists():
+                    paths.extend(generate(directory, [promotion_name]))
+                promotion_tables[promotion_type] = load_table(promotion_path)[1]
+        path = directory / f'{name}{FILE_SUFFIX}'
+        write_table(path, name, generate_table(name, promotion_tables))
+        paths.append(path)
+    return paths
+
+
+class Tablebase:
+    """
+    Endgame tablebases of the directory, probed in constant time through memory-mapped files.
+    Positions with black as the stronger side are probed in the mirrored table.
+    """
+
+    def __init__(self, directory: str | Path):
+        self._tables: dict[str, np.ndarray] = {}
+        for path in sorted(Path(directory).glob(f'*{FILE_SUFFIX}')):
+            name, values = load_table(path)
+            self._tables[name] = values
+        self.max_pieces = max((len(name) for name in self._tables), default=0)
+
+    @property
+    def materials(self) -> list[str]:
+        return list(self._tables)
+
+    def probe(self, board: Board) -> Optional[TablebaseEntry]:
+        """
+        Returns the result and the distance to mate of the position from the point of view of the moving color,
+        None if the material isn't in the tablebase or castling is possible.
+        """
+        pieces_by_color = board.pieces_by_color
+        if len(pieces_by_color[Color.WHITE]) + len(pieces_by_color[Color.BLACK]) > self.max_pieces:
+            return None
+        if board.castling_rights:
+            return None
+
+        symbols = []
+        for color in Color:
+            piece_types = sorted(
+                (piece.TYPE for piece in pieces_by_color[color].values() if piece.TYPE not in (None, PieceType.KING)),
+                reverse=True,
+            )
+            symbols.append(''.join(piece_type.symbol for piece_type in piece_types))
+        strong_color = Color.WHITE if symbols[Color.WHITE] else Color.BLACK
+        name = f'K{symbols[strong_color]}K{symbols[strong_color ^ 1]}'
+        values = self._tables.get(name)
+        if values is None:
+            return None
+
+        # The stronger color is white in the table, the board is mirrored if it's black.
+        flip = 56 if strong_color == Color.BLACK else 0
+        index = int(board.moving_pieces_color != strong_color)
+        squares = [
+            board.get_piece_indexes(strong_color, PieceType.KING)[0],
+            board.get_piece_indexes(strong_color.opposite_color, PieceType.KING)[0],
+        ]
+        used_squares: set[int] = set()
+        for piece_type in get_material_piece_types(name):
+            piece_squares = [
+                square for square in board.get_piece_indexes(strong_color, piece_type) if square not in used_squares
+            ]
+            used_squares.add(piece_squares[0])
+            squares.append(piece_squares[0])
+        for square in squares:
+            index = index * 64 + (square ^ flip)
+
+        value = int(values[index])
+        if value == ILLEGAL_VALUE:
+            return None
+        if value > 0:
+            return TablebaseEntry(1, value)
+        if value < 0:
+            return TablebaseEntry(-1, -value - 1)
+        return TablebaseEntry(0, 0)
+
+
+def main(argv: list[str]):
+    if not argv:
+        sys.stderr.write('usage: python -m engine.tablebase <directory> [materials...]\n')
+        sys.exit(2)
+    for path in generate(argv[0], argv[1:] or TABLEBASE_MATERIALS):
+        sys.stdout.write(f'{path}\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
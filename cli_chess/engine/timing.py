@@ -0,0 +1,83 @@
+import time
+from typing import Optional
+
+from errors import SearchError
+
+# Moves left until the next time control if moves to go aren't given.
+DEFAULT_MOVES_TO_GO = 30
+# Time in seconds kept back from the clock for the protocol and the GUI.
+MOVE_OVERHEAD = 0.05
+# Least time of a move in seconds.
+MIN_MOVE_TIME = 0.01
+# Share of the increment added to the time of a move.
+INCREMENT_SHARE = 0.75
+# The hard limit is a multiple of the soft limit, but never more than a share of the remaining time.
+HARD_LIMIT_FACTOR = 3.0
+MAX_TIME_SHARE = 0.8
+# Soft limit factors by the number of iterations the best move stayed the same: an unstable best move
+# gets more time, a stable one less.
+STABILITY_FACTORS = (1.6, 1.2, 1.0, 0.8, 0.6)
+
+
+class TimeManager:
+    """
+    Time of a move of a clocked game. The soft limit is checked after every iteration of the search,
+    scaled by the stability of the best move: no new iteration starts after it. The hard limit is the deadline
+    of the search, sampled every TIME_CHECK_INTERVAL nodes.
+    """
+
+    def __init__(self, soft_limit: float, hard_limit: float):
+        if not 0 < soft_limit <= hard_limit:
+            raise SearchError(f'Time limits must be positive with soft <= hard, but got {soft_limit}, {hard_limit}.')
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.start()
+
+    @classmethod
+    def from_clock(cls, remaining: float, increment: float = 0.0, moves_to_go: Optional[int] = None) -> 'TimeManager':
+        """
+        Returns the time manager of a move with the remaining clock time, the increment and the number of moves
+        until the next time control, in seconds. The soft limit is an even share of the remaining time plus
+        a share of the increment.
+        """
+        if moves_to_go is not None and moves_to_go < 1:
+            raise SearchError(f'Moves to go must be positive, but got {moves_to_go}.')
+        available = max(remaining - MOVE_OVERHEAD, 0.0)
+        soft_limit = available / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment * INCREMENT_SHARE
+        hard_limit = max(min(soft_limit * HARD_LIMIT_FACTOR, available * MAX_TIME_SHARE), MIN_MOVE_TIME)
+        return cls(min(max(soft_limit, MIN_MOVE_TIME), hard_limit), hard_limit)
+
+    @property
+    def deadline(self) -> float:
+        return self.start_time + self.hard_limit
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start_time
+
+    def start(self, start_time: Optional[float] = None):
+        """
+        Starts the time of the move, now or at the monotonic start time, e.g. again when a ponder search
+        becomes a timed one.
+        """
+        self.start_time = start_time if start_time is not None else time.monotonic()
+        self._best_move: Optional[int] = None
+        self._stable_iterations = 0
+
+    def get_soft_limit(self) -> float:
+        """
+        Returns the soft limit scaled by the stability of the best move.
+        """
+        factor = STABILITY_FACTORS[min(self._stable_iterations, len(STABILITY_FACTORS) - 1)]
+        return min(self.soft_limit * factor, self.hard_limit)
+
+    def update(self, best_move: int) -> bool:
+        """
+        Records the best move of a completed iteration, returns True if no new iteration should start.
+        """
+        if best_move == self._best_move:
+            self._stable_iterations += 1
+        else:
+            self._best_move = best_move
+            self._stable_iterations = 0
+        return self.elapsed >= self.get_soft_limit()
@@ -0,0 +1,194 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple, Optional
+
+from errors import TranspositionTableError
+
+BOUND_EXACT = 1
+BOUND_LOWER = 2
+BOUND_UPPER = 3
+
+DEFAULT_SIZE_MB = 16
+
+# An entry is two 64-bit words: the position key XOR the data and the data. A bucket has two entries,
+# the first one is replaced only by deeper or newer searches, the second one is always replaced.
+# An entry torn by two processes writing it at once fails the XOR check, so it's taken as missing.
+ENTRY_WORDS = 2
+BUCKET_WORDS = 2 * ENTRY_WORDS
+BUCKET_SIZE = BUCKET_WORDS * 8
+
+# Data word: move (bits 0-15), score + SCORE_OFFSET (bits 16-35), depth (bits 36-43), bound (bits 44-45),
+# age (bits 46-51). A data word of 0 is an empty entry, since its bound is 0.
+_SCORE_SHIFT = 16
+_SCORE_OFFSET = 1 << 19
+_SCORE_MASK = (1 << 20) - 1
+_DEPTH_SHIFT = 36
+_DEPTH_MASK = 0xFF
+_BOUND_SHIFT = 44
+_AGE_SHIFT = 46
+_AGE_MASK = 0x3F
+
+
+class TranspositionEntry(NamedTuple):
+    move: int
+    score: int
+    depth: int
+    bound: int
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results, preallocated as one buffer of 64-bit words,
+    so that memory stays flat however long it is used.
+    """
+
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB):
+        self._init_table(memoryview(bytearray(_get_bucket_count(size_mb) * BUCKET_SIZE)))
+
+    def _init_table(self, memory: memoryview):
+        self._memory = memory
+        self._table = memory.cast('Q')
+        self._mask = len(memory) // BUCKET_SIZE - 1
+        self._age = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the table in bytes.
+        """
+        return len(self._memory)
+
+    @property
+    def age(self) -> int:
+        return self._age
+
+    @age.setter
+    def age(self, age: int):
+        self._age = age & _AGE_MASK
+
+    def new_search(self):
+        """
+        Ages the table, entries of previous searches are replaced before entries of the current one.
+        """
+        self._age = (self._age + 1) & _AGE_MASK
+
+    def clear(self):
+        self._memory[:] = bytes(len(self._memory))
+        self._age = 0
+        self.probes = self.hits = 0
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Returns the entry of the position key or None if the table has no entry of it.
+        """
+        self.probes += 1
+        table = self._table
+        index = (key & self._mask) * BUCKET_WORDS
+        for slot in (index, index + ENTRY_WORDS):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                self.hits += 1
+                return TranspositionEntry(
+                    data & 0xFFFF,
+                    (data >> _SCORE_SHIFT & _SCORE_MASK) - _SCORE_OFFSET,
+                    data >> _DEPTH_SHIFT & _DEPTH_MASK,
+                    data >> _BOUND_SHIFT & 3,
+                )
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int = 0):
+        """
+        Stores the search result of the position key. The depth-preferred entry of the bucket is replaced
+        if it is empty, belongs to the same position or an older search, or isn't deeper; else the
+        always-replace entry is used.
+        """
+        table = self._table
+        index = (key & self._mask) * BUCKET_WORDS
+        data = table[index + 1]
+        old_depth = data >> _DEPTH_SHIFT & _DEPTH_MASK
+        if data and table[index] ^ data != key and data >> _AGE_SHIFT == self._age and depth < old_depth:
+            index += ENTRY_WORDS
+            if not move and table[index] ^ table[index + 1] == key:
+                # Keep the best move of the position if the new result has none.
+                move = table[index + 1] & 0xFFFF
+        elif not move and table[index] ^ data == key:
+            move = data & 0xFFFF
+
+        data = (
+            move
+            | (score + _SCORE_OFFSET) << _SCORE_SHIFT
+            | min(max(depth, 0), _DEPTH_MASK) << _DEPTH_SHIFT
+            | bound << _BOUND_SHIFT
+            | self._age << _AGE_SHIFT
+        )
+        table[index] = key ^ data
+        table[index + 1] = data
+
+    def get_hashfull(self) -> int:
+        """
+        Returns the permille of entries used by the current search, sampled from the first 1000 entries.
+        """
+        table = self._table
+        entry_count = min(1000, len(table) // ENTRY_WORDS)
+        used = sum(
+            1
+            for slot in range(0, entry_count * ENTRY_WORDS, ENTRY_WORDS)
+            if table[slot + 1] and table[slot + 1] >> _AGE_SHIFT == self._age
+        )
+        return used * 1000 // entry_count
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table in shared memory, so that processes of the parallel search probe and store
+    the same entries without locks. The creating process owns the memory and has to unlink() it,
+    other processes attach to it by the name and the size and close() it.
+    """
+
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB, *, name: Optional[str] = None):
+        size = _get_bucket_count(size_mb) * BUCKET_SIZE
+        if name is None:
+            self._shared_memory = SharedMemory(create=True, size=size)
+        else:
+            self._shared_memory = SharedMemory(name=name)
+            if self._shared_memory.size < size:
+                self._shared_memory.close()
+                raise TranspositionTableError(f'Shared transposition table "{name}" is smaller than {size} bytes.')
+        buffer = self._shared_memory.buf
+        assert buffer is not None
+        self._init_table(buffer[:size])
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def size_mb(self) -> float:
+        return self.size / (1024 * 1024)
+
+    def close(self):
+        """
+        Detaches the process from the shared memory, the table can't be used after it.
+        """
+        self._table.release()
+        self._memory.release()
+        self._shared_memory.close()
+
+    def unlink(self):
+        """
+        Closes the table and frees the shared memory, it is called once by the creating process.
+        """
+        self.close()
+        self._shared_memory.unlink()
+
+
+def _get_bucket_count(size_mb: float) -> int:
+    """
+    Returns the number of buckets that fit the size, rounded down to a power of two,
+    so that the bucket of a key is found by a bit mask.
+    """
+    bucket_count = int(size_mb * 1024 * 1024) // BUCKET_SIZE
+    if bucket_count < 1:
+        raise TranspositionTableError(f'Transposition table size must be at least {BUCKET_SIZE} bytes.')
+    return 1 << (bucket_count.bit_length() - 1)
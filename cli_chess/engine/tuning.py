@@ -0,0 +1,319 @@
+import hashlib
+import sys
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from engine.batch import BATCH_CHUNK_SIZE, PLANE_COUNT, get_piece_planes
+from engine.evaluation import EG_TABLES, MG_TABLES, EG_PIECE_VALUES, MAX_PHASE, MG_PIECE_VALUES, PHASE_WEIGHTS
+from engine.pawns import evaluate_pawns
+from errors import EvaluationError
+from objects.board import Board
+
+# Parameters of each game stage: piece-square scores by piece type * 64 + square index from white's side,
+# then the material of the piece types.
+SQUARE_PARAMETER_COUNT = 6 * 64
+PARAMETER_COUNT = SQUARE_PARAMETER_COUNT + 6
+
+DEFAULT_EPOCHS = 200
+DEFAULT_LEARNING_RATE = 1.0
+
+# Version of the cached features, cached files of other versions are extracted again.
+FEATURES_VERSION = 1
+
+RESULTS = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5}
+
+
+class TuningFeatures(NamedTuple):
+    """
+    Sparse features of labeled positions in the coordinate format: the position row, the parameter column
+    and the value, +1 for white chess pieces and -1 for black ones. Pawn structure scores aren't tuned
+    and are kept as the fixed part of the score.
+    """
+
+    rows: np.ndarray
+    columns: np.ndarray
+    values: np.ndarray
+    phases: np.ndarray
+    pawn_mg_scores: np.ndarray
+    pawn_eg_scores: np.ndarray
+    results: np.ndarray
+
+    @property
+    def position_count(self) -> int:
+        return len(self.results)
+
+
+def parse_labeled_position(line: str) -> tuple[str, float]:
+    """
+    Returns the FEN and the result of the game from white's point of view of the line "<FEN> <result>",
+    the result is 1-0, 0-1, 1/2-1/2 or a number from 0 to 1, optionally quoted or in brackets.
+    """
+    fen, _, result = line.strip().rpartition(' ')
+    result = result.strip('"[];')
+    try:
+        value = RESULTS[result] if result in RESULTS else float(result)
+    except ValueError:
+        value = -1.0
+    if not fen or not 0.0 <= value <= 1.0:
+        raise EvaluationError(f'Cannot parse the labeled position "{line.strip()}".')
+    return fen.strip().rstrip(';'), value
+
+
+def load_labeled_positions(path: str | Path) -> tuple[list[str], np.ndarray]:
+    """
+    Returns FENs and results of the labeled positions of the file, one per line. Empty lines are skipped.
+    """
+    fens = []
+    results = []
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                fen, result = parse_labeled_position(line)
+                fens.append(fen)
+                results.append(result)
+    return fens, np.array(results, dtype=np.float64)
+
+
+def extract_features(fens: Iterable[str], results: np.ndarray) -> TuningFeatures:
+    """
+    Returns sparse features of the positions, converted to piece planes in chunks of BATCH_CHUNK_SIZE.
+    """
+    fens = list(fens)
+    plane_types = np.arange(PLANE_COUNT) % 6
+    plane_signs = np.where(np.arange(PLANE_COUNT) < 6, 1, -1).astype(np.int8)
+    phase_weights = np.array(PHASE_WEIGHTS, dtype=np.int32)
+    chunks: list[tuple[np.ndarray, ...]] = []
+    for start in range(0, len(fens), BATCH_CHUNK_SIZE):
+        boards = [Board.from_fen(fen) for fen in fens[start : start + BATCH_CHUNK_SIZE]]
+        chunk_rows, planes, indexes = np.nonzero(get_piece_planes(boards))
+        piece_types = plane_types[planes]
+        # Black chess pieces use the squares mirrored to white's side.
+        indexes = np.where(planes < 6, indexes, indexes ^ 56)
+        pawn_scores = np.array([evaluate_pawns(board) for board in boards], dtype=np.int32).reshape(-1, 2)
+        phases = np.bincount(chunk_rows, weights=phase_weights[piece_types], minlength=len(boards))
+        chunks.append(
+            (
+                # Every chess piece sets its square parameter and its material parameter.
+                np.concatenate((chunk_rows, chunk_rows)) + start,
+                np.concatenate((piece_types * 64 + indexes, SQUARE_PARAMETER_COUNT + piece_types)),
+                np.tile(plane_signs[planes], 2),
+                np.minimum(phases, MAX_PHASE),
+                pawn_scores[:, 0],
+                pawn_scores[:, 1],
+            )
+        )
+    if not chunks:
+        chunks.append((np.empty(0, dtype=np.intp),) * 3 + (np.empty(0),) * 3)
+    return TuningFeatures(
+        np.concatenate([chunk[0] for chunk in chunks]).astype(np.int32),
+        np.concatenate([chunk[1] for chunk in chunks]).astype(np.int16),
+        np.concatenate([chunk[2] for chunk in chunks]).astype(np.int8),
+        np.concatenate([chunk[3] for chunk in chunks]).astype(np.uint8),
+        np.concatenate([chunk[4] for chunk in chunks]).astype(np.int32),
+        np.concatenate([chunk[5] for chunk in chunks]).astype(np.int32),
+        np.asarray(results, dtype=np.float64),
+    )
+
+
+def load_features(path: str | Path, cache_path: Optional[str | Path] = None) -> TuningFeatures:
+    """
+    Returns features of the labeled positions of the file. Features are cached in the .npz file next to it,
+    the cache is used while the hash of the file and the version of the features match.
+    """
+    path = Path(path)
+    cache_path = Path(cache_path) if cache_path is not None else path.with_name(path.name + '.features.npz')
+    source_hash = f'{FEATURES_VERSION}:{hashlib.sha256(path.read_bytes()).hexdigest()}'
+    if cache_path.exists():
+        with np.load(cache_path) as cache:
+            if str(cache['source_hash']) == source_hash:
+                return TuningFeatures(*(cache[name] for name in TuningFeatures._fields))
+
+    features = extract_features(*load_labeled_positions(path))
+    with open(cache_path, 'wb') as file:
+        np.savez(file, source_hash=np.array(source_hash), **features._asdict())
+    return features
+
+
+def get_initial_parameters() -> np.ndarray:
+    """
+    Returns the parameters of the evaluation, the array of shape (2, PARAMETER_COUNT) of the middlegame
+    and the endgame.
+    """
+    parameters = np.empty((2, PARAMETER_COUNT), dtype=np.float64)
+    for stage, (tables, values) in enumerate(((MG_TABLES, MG_PIECE_VALUES), (EG_TABLES, EG_PIECE_VALUES))):
+        for piece_type, table in enumerate(tables):
+            # Rows of the tables go from the 8th rank down, square indexes go from the 1st rank up.
+            parameters[stage, piece_type * 64 : piece_type * 64 + 64] = np.array(table).reshape(8, 8)[::-1].ravel()
+        parameters[stage, SQUARE_PARAMETER_COUNT:] = values
+    return parameters
+
+
+def center_square_parameters(parameters: np.ndarray) -> np.ndarray:
+    """
+    Returns parameters whose piece-square tables have a mean of 0, each mean is moved into the material value.
+
+    Every chess piece sets both its square parameter and its material parameter, so a table mean and the material
+    value are one free parameter, moving value between them keeps every score.
+    """
+    parameters = parameters.copy()
+    tables = parameters[:, :SQUARE_PARAMETER_COUNT].reshape(2, 6, 64)
+    means = tables.mean(axis=2)
+    tables -= means[:, :, np.newaxis]
+    parameters[:, SQUARE_PARAMETER_COUNT:] += means
+    return parameters
+
+
+def get_entry_weights(features: TuningFeatures) -> np.ndarray:
+    """
+    Returns values of the feature entries multiplied by the middlegame and the endgame share of the position,
+    the array of shape (2, entry count). It is computed once per tuning, instead of once per epoch.
+    """
+    phases = features.phases[features.rows] / MAX_PHASE
+    return np.stack((features.values * phases, features.values * (1 - phases)))
+
+
+def evaluate_features(
+    features: TuningFeatures, parameters: np.ndarray, entry_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Returns scores of the positions in centipawns from white's point of view, tapered by the game phase.
+    """
+    if entry_weights is None:
+        entry_weights = get_entry_weights(features)
+    columns = features.columns
+    entry_scores = entry_weights[0] * parameters[0][columns] + entry_weights[1] * parameters[1][columns]
+    phases = features.phases / MAX_PHASE
+    pawn_scores = features.pawn_mg_scores * phases + features.pawn_eg_scores * (1 - phases)
+    return np.bincount(features.rows, weights=entry_scores, minlength=features.position_count) + pawn_scores
+
+
+def get_win_probabilities(scores: np.ndarray, k: float) -> np.ndarray:
+    """
+    Returns expected results of the scores by the logistic curve with the scaling constant k.
+    """
+    return 1 / (1 + 10 ** (-k * scores / 400))
+
+
+def get_loss(features: TuningFeatures, parameters: np.ndarray, k: float) -> float:
+    """
+    Returns the mean squared error between results and expected results of the positions.
+    """
+    probabilities = get_win_probabilities(evaluate_features(features, parameters), k)
+    return float(np.mean((features.results - probabilities) ** 2))
+
+
+def find_scaling_constant(
+    features: TuningFeatures, parameters: np.ndarray, low: float = 0.1, high: float = 3.0
+) -> float:
+    """
+    Returns the scaling constant that minimizes the loss of the parameters, found by the golden-section search.
+    """
+    scores = evaluate_features(features, parameters)
+    ratio = (5**0.5 - 1) / 2
+    while high - low > 1e-4:
+        left = high - ratio * (high - low)
+        right = low + ratio * (high - low)
+        left_loss = np.mean((features.results - get_win_probabilities(scores, left)) ** 2)
+        right_loss = np.mean((features.results - get_win_probabilities(scores, right)) ** 2)
+        if left_loss < right_loss:
+            high = right
+        else:
+            low = left
+    return (low + high) / 2
+
+
+def get_gradient(
+    features: TuningFeatures, parameters: np.ndarray, k: float, entry_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Returns the gradient of the loss by the parameters.
+    """
+    if entry_weights is None:
+        entry_weights = get_entry_weights(features)
+    probabilities = get_win_probabilities(evaluate_features(features, parameters, entry_weights), k)
+    errors = (
+        -2
+        * (features.results - probabilities)
+        * probabilities
+        * (1 - probabilities)
+        * (np.log(10) * k / 400)
+        / max(features.position_count, 1)
+    )
+    entry_errors = errors[features.rows]
+    columns = features.columns
+    return np.stack(
+        (
+            np.bincount(columns, weights=entry_errors * entry_weights[0], minlength=PARAMETER_COUNT),
+            np.bincount(columns, weights=entry_errors * entry_weights[1], minlength=PARAMETER_COUNT),
+        )
+    )
+
+
+def tune(
+    features: TuningFeatures,
+    parameters: np.ndarray,
+    k: float,
+    epochs: int = DEFAULT_EPOCHS,
+    learning_rate: float = DEFAULT_LEARNING_RATE,
+) -> np.ndarray:
+    """
+    Returns parameters optimized by full-batch gradient descent with Adam, the king material stays 0.
+
+    The piece-square tables are kept at a mean of 0 after every step, so only the material values tune the mean.
+    """
+    parameters = center_square_parameters(parameters.astype(np.float64))
+    first_moment = np.zeros_like(parameters)
+    second_moment = np.zeros_like(parameters)
+    beta1, beta2 = 0.9, 0.999
+    entry_weights = get_entry_weights(features)
+    for epoch in range(1, epochs + 1):
+        gradient = get_gradient(features, parameters, k, entry_weights)
+        first_moment = beta1 * first_moment + (1 - beta1) * gradient
+        second_moment = beta2 * second_moment + (1 - beta2) * gradient**2
+        step = first_moment / (1 - beta1**epoch) / (np.sqrt(second_moment / (1 - beta2**epoch)) + 1e-12)
+        parameters = center_square_parameters(parameters - learning_rate * step)
+    parameters[:, -1] = 0
+    return parameters
+
+
+def format_parameters(parameters: np.ndarray) -> str:
+    """
+    Returns the piece values and the piece-square tables in the layout of engine.evaluation.
+    """
+    rounded = np.rint(parameters).astype(int)
+    names = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+    lines = []
+    for stage, stage_name in enumerate(('MG', 'EG')):
+        lines.append(f'{stage_name}_PIECE_VALUES = {tuple(rounded[stage, SQUARE_PARAMETER_COUNT:].tolist())}')
+        lines.append(f'{stage_name}_TABLES = (')
+        for piece_type, name in enumerate(names):
+            table = rounded[stage, piece_type * 64 : piece_type * 64 + 64].reshape(8, 8)[::-1]
+            lines.append(f'    (  # {name}')
+            lines.extend('        ' + ' '.join(f'{value:>4},' for value in row).strip() for row in table)
+            lines.append('    ),')
+        lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv: list[str]):
+    if not argv:
+        sys.stderr.write('usage: python -m engine.tuning <labeled positions> [epochs] [learning rate]\n')
+        sys.exit(2)
+    epochs = int(argv[1]) if len(argv) > 1 else DEFAULT_EPOCHS
+    learning_rate = float(argv[2]) if len(argv) > 2 else DEFAULT_LEARNING_RATE
+    features = load_features(argv[0])
+    parameters = get_initial_parameters()
+    k = find_scaling_constant(features, parameters)
+    initial_loss = get_loss(features, parameters, k)
+    parameters = tune(features, parameters, k, epochs, learning_rate)
+    sys.stdout.write(
+        f'positions {features.position_count}, k {k:.4f}, '
+        f'loss {initial_loss:.6f} -> {get_loss(features, parameters, k):.6f}\n'
+    )
+    sys.stdout.write(format_parameters(parameters))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,358 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from engine.book import OpeningBook
+from engine.evaluation import EvalCache
+from engine.ordering import MoveOrderer
+from engine.pawns import PawnHashTable
+from engine.search import MATE_SCORE, MAX_PLY, Searcher, SearchResult, get_search_depth
+from engine.timing import TimeManager
+from engine.transposition import DEFAULT_SIZE_MB, TranspositionTable
+from errors import CustomError, IllegalMoveError, InvalidNotationError
+from objects.board import STARTING_FEN, Board
+from objects.enums import Color
+from objects.notation import move_to_uci, parse_uci
+
+ENGINE_NAME = 'CLI Chess'
+ENGINE_AUTHOR = 'BRANYA43'
+MAX_HASH_MB = 1024
+
+_GO_INT_PARAMETERS = ('depth', 'nodes', 'movestogo')
+# Times of the go command in milliseconds.
+_GO_TIME_PARAMETERS = ('movetime', 'wtime', 'btime', 'winc', 'binc')
+
+
+@dataclass
+class GoParameters:
+    """
+    Search limits of the go command, times in seconds.
+    """
+
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    movetime: Optional[float] = None
+    wtime: Optional[float] = None
+    btime: Optional[float] = None
+    winc: Optional[float] = None
+    binc: Optional[float] = None
+    movestogo: Optional[int] = None
+    infinite: bool = False
+    ponder: bool = False
+
+
+def parse_go(args: list[str]) -> GoParameters:
+    """
+    Returns the parameters of the go command, unknown parameters are skipped.
+    """
+    parameters = GoParameters()
+    tokens = iter(args)
+    for token in tokens:
+        if token in ('infinite', 'ponder'):
+            setattr(parameters, token, True)
+        elif token in _GO_INT_PARAMETERS or token in _GO_TIME_PARAMETERS:
+            value = next(tokens, None)
+            if value is None or not value.lstrip('-').isdigit():
+                raise InvalidNotationError(move=f'go {token} {value or ""}'.strip(), notation='UCI')
+            setattr(parameters, token, int(value) if token in _GO_INT_PARAMETERS else int(value) / 1000)
+    return parameters
+
+
+def get_time_manager(parameters: GoParameters, color: Color) -> Optional[TimeManager]:
+    """
+    Returns the time manager of the clock of the moving color, None if the clock isn't given.
+    """
+    remaining, increment = (
+        (parameters.wtime, parameters.winc) if color == Color.WHITE else (parameters.btime, parameters.binc)
+    )
+    if remaining is None:
+        return None
+    return TimeManager.from_clock(remaining, increment or 0.0, parameters.movestogo)
+
+
+def format_score(score: int) -> str:
+    """
+    Returns the score of the info command: centipawns or moves to mate, negative if the moving color is mated.
+    """
+    if score >= MATE_SCORE - MAX_PLY:
+        return f'mate {(MATE_SCORE - score + 1) // 2}'
+    if score <= -MATE_SCORE + MAX_PLY:
+        return f'mate {-((MATE_SCORE + score) // 2)}'
+    return f'cp {score}'
+
+
+def format_info(result: SearchResult, hashfull: int) -> str:
+    stats = result.stats
+    pv = ' '.join(move_to_uci(move) for move in result.pv)
+    return (
+        f'info depth {stats.depth} score {format_score(result.score)} nodes {stats.nodes} nps {stats.nps}'
+        f' time {int(stats.elapsed * 1000)} hashfull {hashfull} pv {pv}'
+    )
+
+
+def _write_line(line: str):
+    sys.stdout.write(f'{line}\n')
+    sys.stdout.flush()
+
+
+class UCIEngine:
+    """
+    Universal Chess Interface of the engine. Commands are handled on the event loop, the search runs
+    in a worker thread and polls the stop flag, so that stop, isready and ponderhit are answered during it.
+    """
+
+    def __init__(self, write: Callable[[str], None] = _write_line):
+        self._write = write
+        self.board = Board.from_fen()
+        self.tt = TranspositionTable()
+        self.book: Optional[OpeningBook] = None
+        self._orderer = MoveOrderer(MAX_PLY)
+        self._pawn_table = PawnHashTable()
+        self._eval_cache = EvalCache()
+        # Start position and moves of the last position command, a position that continues it only plays new moves.
+        self._position_fen = STARTING_FEN
+        self._position_moves: list[str] = []
+        self._executor = ThreadPoolExecutor(1)
+        self._stop_event = threading.Event()
+        # Set when the best move of an infinite or ponder search can be sent.
+        self._release_event = asyncio.Event()
+        self._searcher: Optional[Searcher] = None
+        self._search_task: Optional[asyncio.Task] = None
+        # Time of the move after ponderhit.
+        self._ponder_movetime: Optional[float] = None
+        self._ponder_time_manager: Optional[TimeManager] = None
+        self._commands: dict[str, Callable[[list[str]], None]] = {
+            'uci': self._uci,
+            'isready': lambda args: self._write('readyok'),
+            'setoption': self._setoption,
+            'ucinewgame': self._ucinewgame,
+            'position': self._position,
+            'go': self._go,
+            'stop': self._stop,
+            'ponderhit': self._ponderhit,
+            'debug': lambda args: None,
+        }
+
+    async def run(self, reader: asyncio.StreamReader):
+        """
+        Handles commands of the reader until quit or the end of input.
+        """
+        try:
+            while line := await reader.readline():
+                if not await self.handle(line.decode(errors='replace')):
+                    break
+        finally:
+            await self.close()
+
+    async def handle(self, line: str) -> bool:
+        """
+        Handles the command line, returns False on quit. Errors of the command are sent as info strings.
+        """
+        command, *args = line.split() or ['']
+        if command == 'quit':
+            return False
+        if command in ('position', 'go', 'ucinewgame', 'setoption'):
+            await self._wait_search()
+        handler = self._commands.get(command)
+        if handler is None:
+            if command:
+                self._write(f'info string Unknown command: {command}')
+            return True
+        try:
+            handler(args)
+        except CustomError as error:
+            self._write(f'info string {error}')
+        return True
+
+    async def close(self):
+        await self._wait_search()
+        self._executor.shutdown()
+        if self.book is not None:
+            self.book.close()
+
+    async def _wait_search(self):
+        """
+        Stops the running search and waits for its best move.
+        """
+        if self._search_task is not None:
+            self._stop(None)
+            await self._search_task
+            self._search_task = None
+
+    def _uci(self, args: list[str]):
+        self._write(f'id name {ENGINE_NAME}')
+        self._write(f'id author {ENGINE_AUTHOR}')
+        self._write(f'option name Hash type spin default {DEFAULT_SIZE_MB} min 1 max {MAX_HASH_MB}')
+        self._write('option name Ponder type check default false')
+        self._write('option name BookFile type string default <empty>')
+        self._write('uciok')
+
+    def _setoption(self, args: list[str]):
+        text = ' '.join(args)
+        name, _, value = text.removeprefix('name ').partition(' value ')
+        name = name.strip().lower()
+        value = value.strip()
+        if name == 'hash':
+            if not value.isdigit() or not 1 <= int(value) <= MAX_HASH_MB:
+                raise InvalidNotationError(move=f'setoption {text}', notation='UCI')
+            self.tt = TranspositionTable(int(value))
+        elif name == 'bookfile':
+            if self.book is not None:
+                self.book.close()
+            self.book = OpeningBook(value) if value and value != '<empty>' else None
+
+    def _ucinewgame(self, args: list[str]):
+        self.tt.clear()
+        self._orderer = MoveOrderer(MAX_PLY)
+
+    def _position(self, args: list[str]):
+        if args[:1] == ['startpos']:
+            fen, rest = STARTING_FEN, args[1:]
+        elif args[:1] == ['fen']:
+            end = args.index('moves') if 'moves' in args else len(args)
+            fen, rest = ' '.join(args[1:end]), args[end:]
+        else:
+            raise InvalidNotationError(move=' '.join(['position', *args]), notation='UCI')
+        moves = rest[1:] if rest[:1] == ['moves'] else []
+
+        position_moves = self._position_moves
+        if fen == self._position_fen and moves[: len(position_moves)] == position_moves:
+            board, new_moves = self.board, moves[len(position_moves) :]
+        else:
+            board, new_moves = Board.from_fen(fen), moves
+        for made_move_count, uci in enumerate(new_moves):
+            move = parse_uci(uci)
+            color = board.moving_pieces_color
+            is_legal = board.is_pseudo_legal(move)
+            if is_legal:
+                board.make_move(move)
+                is_legal = not board.is_in_check(color)
+                if not is_legal:
+                    board.unmake_move()
+            if not is_legal:
+                # The board is left as it was, the position is played from the start by the next position command.
+                for _ in range(made_move_count):
+                    board.unmake_move()
+                self._position_fen, self._position_moves = '', []
+                raise IllegalMoveError(move=uci)
+        self.board = board
+        self._position_fen, self._position_moves = fen, moves
+
+    def _go(self, args: list[str]):
+        parameters = parse_go(args)
+        board = self.board
+        is_held = parameters.infinite or parameters.ponder
+        if self.book is not None and not is_held:
+            book_move = self.book.choose_move(board)
+            if book_move is not None:
+                self._write(f'bestmove {move_to_uci(book_move)}')
+                return
+
+        # A fixed move time is searched to the end, the clock is shared out by the time manager.
+        movetime = parameters.movetime
+        time_manager = get_time_manager(parameters, board.moving_pieces_color) if movetime is None else None
+        deadline = None
+        if is_held:
+            depth = parameters.depth or MAX_PLY
+            self._ponder_movetime = movetime if parameters.ponder else None
+            self._ponder_time_manager = time_manager if parameters.ponder else None
+            time_manager = None
+        else:
+            time_limit = time_manager.hard_limit if time_manager is not None else movetime
+            depth = get_search_depth(parameters.depth, time_limit, parameters.nodes)
+            if movetime is not None:
+                deadline = time.monotonic() + movetime
+
+        loop = asyncio.get_running_loop()
+        tt = self.tt
+
+        def on_iteration(result: SearchResult):
+            loop.call_soon_threadsafe(self._write, format_info(result, tt.get_hashfull()))
+
+        self._stop_event.clear()
+        self._release_event.clear()
+        self._searcher = Searcher(
+            board,
+            tt,
+            deadline=deadline,
+            max_nodes=parameters.nodes,
+            orderer=self._orderer,
+            pawn_table=self._pawn_table,
+            eval_cache=self._eval_cache,
+            is_stopped=self._stop_event.is_set,
+            on_iteration=on_iteration,
+            time_manager=time_manager,
+        )
+        self._search_task = asyncio.create_task(self._run_search(self._searcher, depth, is_held))
+
+    async def _run_search(self, searcher: Searcher, depth: int, is_held: bool):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, searcher.search, depth)
+        if is_held:
+            # The best move of an infinite or ponder search is sent only after stop or ponderhit.
+            await self._release_event.wait()
+        if result.best_move is None:
+            self._write('bestmove 0000')
+        elif len(result.pv) > 1:
+            self._write(f'bestmove {move_to_uci(result.best_move)} ponder {move_to_uci(result.pv[1])}')
+        else:
+            self._write(f'bestmove {move_to_uci(result.best_move)}')
+
+    def _stop(self, args: Optional[list[str]]):
+        self._stop_event.set()
+        self._release_event.set()
+
+    def _ponderhit(self, args: list[str]):
+        """
+        The expected move was played: the ponder search goes on as a normal search with the time of the move.
+        """
+        if self._searcher is not None:
+            if self._ponder_time_manager is not None:
+                self._ponder_time_manager.start()
+                self._searcher.time_manager = self._ponder_time_manager
+            elif self._ponder_movetime is not None:
+                self._searcher.deadline = time.monotonic() + self._ponder_movetime
+        self._release_event.set()
+
+
+async def open_stdin() -> asyncio.StreamReader:
+    """
+    Returns a stream reader of the standard input. Pipes and terminals are read by the event loop,
+    regular files by a thread.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:
+
+        def feed():
+            for line in sys.stdin.buffer:
+                loop.call_soon_threadsafe(reader.feed_data, line)
+            loop.call_soon_threadsafe(reader.feed_eof)
+
+        threading.Thread(target=feed, daemon=True).start()
+    return reader
+
+
+async def run_uci():
+    await UCIEngine().run(await open_stdin())
+
+
+async def measure_overhead(commands: Iterable[str], repeat: int = 100) -> float:
+    """
+    Returns the average time in seconds to handle one of the commands, which mustn't start a search.
+    """
+    commands = list(commands)
+    engine = UCIEngine(write=lambda line: None)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            await engine.handle(command)
+    elapsed = time.perf_counter() - start_time
+    await engine.close()
+    return elapsed / (repeat * len(commands))
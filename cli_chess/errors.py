@@ -41,3 +41,43 @@ class InvalidMoveDistanceError(PieceError):
 
 class BoardError(CustomError):
     pass
+
+
+class NotationError(CustomError):
+    pass
+
+
+class InvalidNotationError(NotationError):
+    default_msg = '"{move}" is not a valid {notation} move.'
+
+
+class IllegalMoveError(NotationError):
+    default_msg = '"{move}" is not a legal move in this position.'
+
+
+class AmbiguousMoveError(NotationError):
+    default_msg = '"{move}" is ambiguous in this position.'
+
+
+class GameRecordError(CustomError):
+    pass
+
+
+class SearchError(CustomError):
+    pass
+
+
+class TranspositionTableError(CustomError):
+    pass
+
+
+class EvaluationError(CustomError):
+    pass
+
+
+class TablebaseError(CustomError):
+    pass
+
+
+class BookError(CustomError):
+    pass
@@ -0,0 +1,6 @@
+import asyncio
+
+from engine.uci import run_uci
+
+if __name__ == '__main__':
+    asyncio.run(run_uci())
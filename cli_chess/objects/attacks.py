@@ -0,0 +1,55 @@
+from objects.enums import Color, Direction
+
+
+def _get_target(index: int, dx: int, dy: int) -> int:
+    x, y = index % 8 + dx, index // 8 + dy
+    if 0 <= x < 8 and 0 <= y < 8:
+        return y * 8 + x
+    return -1
+
+
+def _get_ray(index: int, direction: Direction) -> tuple[int, ...]:
+    dx, dy = direction.vector
+    ray = []
+    target = _get_target(index, dx, dy)
+    while target != -1:
+        ray.append(target)
+        target = _get_target(target, dx, dy)
+    return tuple(ray)
+
+
+def _get_knight_targets(index: int) -> tuple[int, ...]:
+    targets = []
+    for direction in Direction.get_diagonal_directions():
+        dx, dy = direction.vector
+        for vector in ((dx * 2, dy), (dx, dy * 2)):
+            if (target := _get_target(index, *vector)) != -1:
+                targets.append(target)
+    return tuple(targets)
+
+
+def _get_king_targets(index: int) -> tuple[int, ...]:
+    targets = (_get_target(index, *direction.vector) for direction in Direction)
+    return tuple(target for target in targets if target != -1)
+
+
+def _get_pawn_attacks(index: int, color: Color) -> tuple[int, ...]:
+    dy = 1 if color == Color.WHITE else -1
+    targets = (_get_target(index, dx, dy) for dx in (-1, 1))
+    return tuple(target for target in targets if target != -1)
+
+
+# Target squares of chess pieces for every square index of the board (index = y * 8 + x).
+DIRECT_RAYS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(ray for direction in Direction.get_direct_directions() if (ray := _get_ray(index, direction)))
+    for index in range(64)
+)
+DIAGONAL_RAYS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(ray for direction in Direction.get_diagonal_directions() if (ray := _get_ray(index, direction)))
+    for index in range(64)
+)
+KNIGHT_TARGETS: tuple[tuple[int, ...], ...] = tuple(_get_knight_targets(index) for index in range(64))
+KING_TARGETS: tuple[tuple[int, ...], ...] = tuple(_get_king_targets(index) for index in range(64))
+PAWN_ATTACKS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(_get_pawn_attacks(index, color) for index in range(64)) for color in Color
+)
@@ -1,12 +1,59 @@
 from collections import ChainMap
 from functools import lru_cache
 from types import MappingProxyType
-from typing import Optional, cast
+from typing import Iterator, Optional, Protocol, cast
 
 from errors import BoardError
-from objects.enums import Color, Direction
-from objects.pieces import Piece
+from objects.attacks import DIAGONAL_RAYS, DIRECT_RAYS, KING_TARGETS, KNIGHT_TARGETS, PAWN_ATTACKS
+from objects.enums import Color, Direction, PieceType
+from objects.move import END_SHIFT, FLAGS_SHIFT, START_MASK, Move, encode_move
+from objects.pieces import PIECES_BY_TYPE, Piece
 from objects.position import Position
+from objects.zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+# A draw is claimed by the fifty-move rule after this number of halfmoves without captures and pawn moves.
+FIFTY_MOVE_HALFMOVES = 100
+
+WHITE_KING_SIDE = 1
+WHITE_QUEEN_SIDE = 2
+BLACK_KING_SIDE = 4
+BLACK_QUEEN_SIDE = 8
+
+_CASTLING_SYMBOLS = ((WHITE_KING_SIDE, 'K'), (WHITE_QUEEN_SIDE, 'Q'), (BLACK_KING_SIDE, 'k'), (BLACK_QUEEN_SIDE, 'q'))
+_CASTLING_RIGHTS_BY_SYMBOL = {symbol: right for right, symbol in _CASTLING_SYMBOLS}
+
+# Castling rights kept when a chess piece moves from or to the square index.
+_CASTLING_MASKS = [15] * 64
+_CASTLING_MASKS[0] ^= WHITE_QUEEN_SIDE
+_CASTLING_MASKS[7] ^= WHITE_KING_SIDE
+_CASTLING_MASKS[4] ^= WHITE_KING_SIDE | WHITE_QUEEN_SIDE
+_CASTLING_MASKS[56] ^= BLACK_QUEEN_SIDE
+_CASTLING_MASKS[63] ^= BLACK_KING_SIDE
+_CASTLING_MASKS[60] ^= BLACK_KING_SIDE | BLACK_QUEEN_SIDE
+
+# Square codes of the mailbox: 0 is an empty square, else color * 8 + piece type + 1.
+# Chess pieces without a type (e.g. the base Piece) are occupying squares, but cannot move or attack.
+_UNKNOWN_TYPE_CODE = 7
+
+_PROMOTION_TYPES = (PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT)
+
+_POSITIONS = tuple(Position.from_index(index) for index in range(64))
+
+# Values of chess pieces in centipawns for the static exchange evaluation, indexed by PieceType.
+# The king is worth more than all other pieces together, so it recaptures only a square that isn't defended.
+SEE_PIECE_VALUES = (100, 320, 330, 500, 900, 20_000)
+
+
+class BoardListener(Protocol):
+    """
+    Receives every chess piece with a type put on or taken from the board, e.g. to keep
+    an evaluation up to date by deltas of made and unmade moves.
+    """
+
+    def put_piece(self, color: Color, piece_type: PieceType, index: int): ...
+
+    def take_piece(self, color: Color, piece_type: PieceType, index: int): ...
 
 
 class Board:
@@ -14,6 +61,89 @@ class Board:
         self._moving_pieces_color = Color.WHITE
         self._limit_pos = Position(7, 7)
         self._pieces_by_color: dict[Color, dict[Position, Piece]] = {Color.WHITE: {}, Color.BLACK: {}}
+        self._squares: list[int] = [0] * 64
+        self._king_indexes: list[int] = [-1, -1]
+        self._castling_rights = 0
+        self._en_passant = -1
+        self._halfmove_clock = 0
+        self._fullmove_number = 1
+        self._key = 0
+        self._pawn_key = 0
+        self._history: list[tuple] = []
+        # Keys of the positions before the made moves, and the number of plies since the last capture, pawn move
+        # or null move: earlier positions can't be repeated.
+        self._keys: list[int] = []
+        self._reversible_plies = 0
+        self._listeners: list[BoardListener] = []
+
+    @classmethod
+    def from_fen(cls, fen: str = STARTING_FEN) -> 'Board':
+        """
+        Returns a new board with the position described by Forsyth-Edwards Notation.
+        """
+        board = cls()
+        fields = fen.split()
+        if len(fields) == 4:
+            fields += ['0', '1']
+        if len(fields) != 6:
+            raise BoardError(f'Invalid FEN {fen!r}, expected 6 fields.')
+        placement, color, castling, en_passant, halfmove_clock, fullmove_number = fields
+
+        ranks = placement.split('/')
+        if len(ranks) != 8:
+            raise BoardError(f'Invalid FEN {fen!r}, expected 8 ranks.')
+        for y, rank in zip(range(7, -1, -1), ranks):
+            x = 0
+            for symbol in rank:
+                if symbol.isdigit():
+                    x += int(symbol)
+                    continue
+                try:
+                    piece_type = PieceType.from_symbol(symbol)
+                except ValueError:
+                    raise BoardError(f'Invalid FEN {fen!r}, unknown piece {symbol!r}.')
+                if x > 7:
+                    raise BoardError(f'Invalid FEN {fen!r}, rank {y + 1} is too long.')
+                piece_color = Color.WHITE if symbol.isupper() else Color.BLACK
+                board._put(PIECES_BY_TYPE[piece_type](piece_color), y * 8 + x)
+                x += 1
+            if x != 8:
+                raise BoardError(f'Invalid FEN {fen!r}, rank {y + 1} must have 8 squares.')
+
+        if color not in ('w', 'b'):
+            raise BoardError(f'Invalid FEN {fen!r}, unknown color {color!r}.')
+        if color == 'b':
+            board.pass_move()
+
+        if castling != '-':
+            for symbol in castling:
+                if symbol not in _CASTLING_RIGHTS_BY_SYMBOL:
+                    raise BoardError(f'Invalid FEN {fen!r}, unknown castling right {symbol!r}.')
+                board._castling_rights |= _CASTLING_RIGHTS_BY_SYMBOL[symbol]
+            board._key ^= CASTLING_KEYS[board._castling_rights]
+
+        if en_passant != '-':
+            try:
+                board._set_en_passant(Position.from_notation(en_passant).index)
+            except ValueError:
+                raise BoardError(f'Invalid FEN {fen!r}, invalid en passant square {en_passant!r}.')
+
+        if not halfmove_clock.isdigit() or not fullmove_number.isdigit():
+            raise BoardError(f'Invalid FEN {fen!r}, move counters must be numbers.')
+        board._halfmove_clock = int(halfmove_clock)
+        board._fullmove_number = int(fullmove_number)
+        return board
+
+    def copy(self) -> 'Board':
+        """
+        Returns a new board with the position and the made moves, so that repetitions of the game are found
+        and the moves can be taken back. Listeners aren't copied.
+        """
+        board = Board.from_fen(self.get_fen())
+        board._history = self._history[:]
+        board._keys = self._keys[:]
+        board._reversible_plies = self._reversible_plies
+        return board
 
     @property
     def moving_pieces_color(self) -> Color:
@@ -23,6 +153,51 @@ class Board:
     def limit_pos(self) -> Position:
         return self._limit_pos
 
+    @property
+    def key(self) -> int:
+        """
+        Zobrist key of the position, it is updated incrementally on every change of the board.
+        """
+        return self._key
+
+    @property
+    def pawn_key(self) -> int:
+        """
+        Zobrist hash key of pawns only, e.g. for caching the evaluation of the pawn structure.
+        """
+        return self._pawn_key
+
+    @property
+    def castling_rights(self) -> int:
+        return self._castling_rights
+
+    @property
+    def en_passant(self) -> Optional[Position]:
+        return _POSITIONS[self._en_passant] if self._en_passant != -1 else None
+
+    @property
+    def halfmove_clock(self) -> int:
+        return self._halfmove_clock
+
+    @property
+    def fullmove_number(self) -> int:
+        return self._fullmove_number
+
+    @property
+    def last_move(self) -> Optional[int]:
+        """
+        The packed last move made on the board, 0 for a null move and None if no move was made.
+        """
+        if not self._history:
+            return None
+        start, end, piece = self._history[-1][:3]
+        if piece is None:
+            return 0
+        # A pawn that is another chess piece after its move was promoted.
+        piece_type = (self._squares[end] & 7) - 1
+        promotion = piece_type if piece.TYPE == PieceType.PAWN and piece_type != PieceType.PAWN else 0
+        return encode_move(start, end, promotion)
+
     @property
     def pieces_by_color(self) -> MappingProxyType[Color, MappingProxyType[Position, Piece]]:
         return self.__get_pieces_by_color()
@@ -42,9 +217,34 @@ class Board:
             self._pieces_by_color[Color.BLACK],
         )
 
+    def get_fen(self) -> str:
+        """
+        Returns Forsyth-Edwards Notation of the position.
+        """
+        ranks = []
+        for y in range(7, -1, -1):
+            rank = ''
+            empty = 0
+            for code in self._squares[y * 8 : y * 8 + 8]:
+                if code == 0:
+                    empty += 1
+                    continue
+                if code & 7 == _UNKNOWN_TYPE_CODE:
+                    raise BoardError('Cannot get FEN, the board has a chess piece without a type.')
+                symbol = PieceType((code & 7) - 1).symbol
+                rank += (str(empty) if empty else '') + (symbol.lower() if code >> 3 else symbol)
+                empty = 0
+            ranks.append(rank + (str(empty) if empty else ''))
+
+        color = 'w' if self._moving_pieces_color == Color.WHITE else 'b'
+        castling = ''.join(symbol for right, symbol in _CASTLING_SYMBOLS if self._castling_rights & right) or '-'
+        en_passant = _POSITIONS[self._en_passant].notation if self._en_passant != -1 else '-'
+        return f'{"/".join(ranks)} {color} {castling} {en_passant} {self._halfmove_clock} {self._fullmove_number}'
+
     def pass_move(self):
         """Passes the move to chess pieces of opposite color."""
         self._moving_pieces_color = self._moving_pieces_color.opposite_color
+        self._key ^= SIDE_KEY
 
     def has_piece_at_position(self, pos: Position, color: Optional[Color] = None) -> bool:
         """
@@ -61,7 +261,7 @@ class Board:
         self.validate_position_on_board(pos)
         if self.has_piece_at_position(pos):
             raise BoardError(f'Cannot add the chess piece, position {pos} is occupied another chess piece.')
-        self._pieces_by_color[piece.color][pos] = piece
+        self._put(piece, pos.index)
 
     def remove_piece(self, piece: Piece, pos: Position):
         """
@@ -73,7 +273,7 @@ class Board:
         got_piece = self._pieces_by_color[Color.WHITE].get(pos) or self._pieces_by_color[Color.BLACK].get(pos)
         if piece is not got_piece:
             raise BoardError(f'Cannot remove the chess piece, there is a different chess piece at position {pos}.')
-        del self._pieces_by_color[piece.color][pos]
+        self._take(piece, pos.index)
 
     def get_piece(self, pos: Position) -> Optional[Piece]:
         """
@@ -106,7 +306,7 @@ class Board:
         self.add_piece(moving_piece, end)
 
     def validate_position_on_board(self, pos: Position):
-        if pos > self._limit_pos:
+        if pos.x > self._limit_pos.x or pos.y > self._limit_pos.y:
             raise BoardError('x and y cannot be greate then 7.')
 
     def get_possible_directions(self, pos: Position, piece: Piece) -> set[Direction]:
@@ -137,3 +337,534 @@ class Board:
             if not piece.is_in_stalemate(start, self):
                 return False
         return True
+
+    def get_legal_moves(self) -> list[Move]:
+        """
+        Returns all moves of the moving color that don't leave its king in check.
+        """
+        return [Move.from_int(move) for move in self._get_legal_moves()]
+
+    def get_piece_type_at(self, index: int) -> int:
+        """
+        Returns the piece type value of the chess piece at the square index,
+        -1 if the square is empty or the chess piece has no type.
+        """
+        code = self._squares[index] & 7
+        return code - 1 if code and code != _UNKNOWN_TYPE_CODE else -1
+
+    def get_square_codes(self) -> bytes:
+        """
+        Returns codes of the 64 squares by square index: 0 is an empty square, else color * 8 + piece type + 1,
+        chess pieces without a type have the piece type 6.
+        """
+        return bytes(self._squares)
+
+    def get_piece_indexes(self, color: Color, piece_type: PieceType) -> list[int]:
+        """
+        Returns square indexes of chess pieces of the color and the type in ascending order.
+        """
+        code = (color << 3) + piece_type + 1
+        return [index for index, square_code in enumerate(self._squares) if square_code == code]
+
+    def is_capture(self, move: int) -> bool:
+        """
+        Returns True if the packed move captures a chess piece, including en passant.
+        """
+        end = move >> END_SHIFT & START_MASK
+        return bool(self._squares[end]) or (
+            end == self._en_passant and self._squares[move & START_MASK] & 7 == PieceType.PAWN + 1
+        )
+
+    def see(self, move: int) -> int:
+        """
+        Returns the static exchange evaluation of the packed move: the material balance in centipawns for
+        the moving color after the best sequence of captures on the end square, where each side lets the
+        least valuable attacker capture or stops. Pins and checks are ignored.
+        """
+        squares = self._squares
+        start = move & START_MASK
+        end = move >> END_SHIFT & START_MASK
+        promotion = move >> FLAGS_SHIFT
+        piece_type = (squares[start] & 7) - 1
+        victim_type = (squares[end] & 7) - 1
+        if victim_type == _UNKNOWN_TYPE_CODE - 1:
+            return 0
+
+        gains = [SEE_PIECE_VALUES[victim_type] if victim_type != -1 else 0]
+        removed = {start}
+        if piece_type == PieceType.PAWN and end == self._en_passant:
+            gains[0] = SEE_PIECE_VALUES[PieceType.PAWN]
+            removed.add(end - 8 if self._moving_pieces_color == Color.WHITE else end + 8)
+        piece_value = SEE_PIECE_VALUES[piece_type]
+        if promotion:
+            gains[0] += SEE_PIECE_VALUES[promotion] - SEE_PIECE_VALUES[PieceType.PAWN]
+            piece_value = SEE_PIECE_VALUES[promotion]
+
+        color = self._moving_pieces_color.opposite_color
+        while True:
+            attacker = self._get_least_valuable_attacker(end, color, removed)
+            if attacker is None:
+                break
+            attacker_index, attacker_type = attacker
+            # The gain of the side if it captures the piece on the square.
+            gains.append(piece_value - gains[-1])
+            removed.add(attacker_index)
+            piece_value = SEE_PIECE_VALUES[attacker_type]
+            color = color.opposite_color
+
+        # Each side captures only if it doesn't lose material by it.
+        while len(gains) > 1:
+            gain = gains.pop()
+            gains[-1] = -max(-gains[-1], gain)
+        return gains[0]
+
+    def get_pseudo_legal_moves(self) -> list[int]:
+        """
+        Returns packed moves of the moving color that can leave its king in check, it is faster than
+        get_legal_moves() for a search that checks the king after making the move.
+        """
+        return list(self._generate_moves())
+
+    def get_pseudo_legal_captures(self) -> list[int]:
+        """
+        Returns pseudo-legal captures of the moving color, including en passant and all promotions.
+        """
+        return list(self._generate_moves(quiets=False))
+
+    def get_pseudo_legal_quiet_moves(self) -> list[int]:
+        """
+        Returns pseudo-legal moves of the moving color that are neither captures nor promotions.
+        """
+        return list(self._generate_moves(captures=False))
+
+    def is_pseudo_legal(self, move: int) -> bool:
+        """
+        Returns True if the packed move is one of get_pseudo_legal_moves(), e.g. to validate a move
+        remembered from another position.
+        """
+        start = move & START_MASK
+        code = self._squares[start]
+        if not code or code >> 3 != self._moving_pieces_color or code & 7 == _UNKNOWN_TYPE_CODE:
+            return False
+        is_capture = self.is_capture(move) or bool(move >> FLAGS_SHIFT)
+        return move in self._generate_piece_moves(start, captures=is_capture, quiets=not is_capture)
+
+    def make_move(self, move: int):
+        """
+        Makes the packed move without validation, the move has to be one of get_legal_moves().
+        Castling and en passant are recognized by the move of the king or the pawn.
+        """
+        self._make_move(move)
+
+    def make_null_move(self):
+        """
+        Passes the move without moving a chess piece, e.g. for null-move pruning of the search.
+        The en passant square is cleared, the null move is taken back by unmake_move().
+        """
+        self._history.append(
+            (
+                -1,
+                -1,
+                None,
+                None,
+                -1,
+                self._castling_rights,
+                self._en_passant,
+                self._halfmove_clock,
+                self._reversible_plies,
+            )
+        )
+        self._keys.append(self._key)
+        # Positions before a null move aren't repetitions of the game.
+        self._reversible_plies = 0
+        if self._en_passant != -1:
+            self._key ^= EN_PASSANT_KEYS[self._en_passant & 7]
+            self._en_passant = -1
+        self.pass_move()
+
+    def unmake_move(self):
+        """
+        Takes back the last move made by make_move() or make_null_move().
+        """
+        if not self._history:
+            raise BoardError('Cannot unmake the move, there are no made moves.')
+        self._unmake_move()
+
+    def is_in_check(self, color: Optional[Color] = None) -> bool:
+        """
+        Returns True if the king of the color (the moving color by default) is under attack.
+        """
+        if color is None:
+            color = self._moving_pieces_color
+        king_index = self._king_indexes[color]
+        return king_index != -1 and self._is_attacked(king_index, color.opposite_color)
+
+    def is_repetition(self, count: int = 1) -> bool:
+        """
+        Returns True if the position occurred the number of times before. Only positions since the last capture,
+        pawn move or null move are compared, with the same color to move, so it's cheap enough for every node
+        of the search.
+        """
+        keys = self._keys
+        key = self._key
+        occurrences = 0
+        for index in range(len(keys) - 2, len(keys) - 1 - min(self._reversible_plies, len(keys)), -2):
+            if keys[index] == key:
+                occurrences += 1
+                if occurrences >= count:
+                    return True
+        return False
+
+    def is_threefold_repetition(self) -> bool:
+        return self.is_repetition(2)
+
+    def is_fifty_move_draw(self) -> bool:
+        """
+        Returns True if a draw can be claimed by the fifty-move rule.
+        """
+        return self._halfmove_clock >= FIFTY_MOVE_HALFMOVES
+
+    def is_in_checkmate(self) -> bool:
+        """
+        Returns True if the king of the moving color is in check and there is no legal move.
+        """
+        return self.is_in_check() and not self._has_legal_move()
+
+    def add_listener(self, listener: BoardListener):
+        """
+        Adds the listener of chess pieces put on and taken from the board.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: BoardListener):
+        self._listeners.remove(listener)
+
+    def _put(self, piece: Piece, index: int):
+        color = piece.color
+        self._pieces_by_color[color][_POSITIONS[index]] = piece
+        piece_type = piece.TYPE
+        if piece_type is None:
+            self._squares[index] = (color << 3) + _UNKNOWN_TYPE_CODE
+            return
+        self._squares[index] = (color << 3) + piece_type + 1
+        self._key ^= PIECE_KEYS[color][piece_type][index]
+        if piece_type == PieceType.KING:
+            self._king_indexes[color] = index
+        elif piece_type == PieceType.PAWN:
+            self._pawn_key ^= PIECE_KEYS[color][piece_type][index]
+        for listener in self._listeners:
+            listener.put_piece(color, piece_type, index)
+
+    def _take(self, piece: Piece, index: int):
+        color = piece.color
+        del self._pieces_by_color[color][_POSITIONS[index]]
+        piece_type = piece.TYPE
+        self._squares[index] = 0
+        if piece_type is not None:
+            self._key ^= PIECE_KEYS[color][piece_type][index]
+            if piece_type == PieceType.KING and self._king_indexes[color] == index:
+                self._king_indexes[color] = -1
+            elif piece_type == PieceType.PAWN:
+                self._pawn_key ^= PIECE_KEYS[color][piece_type][index]
+            for listener in self._listeners:
+                listener.take_piece(color, piece_type, index)
+
+    def _set_en_passant(self, index: int):
+        """
+        Sets the en passant square only if a pawn of the moving color can capture on it,
+        so that equal positions have equal keys.
+        """
+        color = self._moving_pieces_color
+        pawn_code = (color << 3) + PieceType.PAWN + 1
+        for pawn_index in PAWN_ATTACKS[color ^ 1][index]:
+            if self._squares[pawn_index] == pawn_code:
+                self._en_passant = index
+                self._key ^= EN_PASSANT_KEYS[index & 7]
+                return
+
+    def _make_move(self, move: int):
+        start = move & START_MASK
+        end = move >> END_SHIFT & START_MASK
+        promotion = move >> FLAGS_SHIFT
+        squares = self._squares
+        color = self._moving_pieces_color
+        pieces = self._pieces_by_color
+        piece = pieces[color][_POSITIONS[start]]
+        piece_type = (squares[start] & 7) - 1
+
+        captured_index = end
+        if piece_type == PieceType.PAWN and end == self._en_passant:
+            captured_index = end - 8 if color == Color.WHITE else end + 8
+        captured = pieces[color ^ 1][_POSITIONS[captured_index]] if squares[captured_index] else None
+
+        self._history.append(
+            (
+                start,
+                end,
+                piece,
+                captured,
+                captured_index,
+                self._castling_rights,
+                self._en_passant,
+                self._halfmove_clock,
+                self._reversible_plies,
+            )
+        )
+        self._keys.append(self._key)
+
+        if captured is not None:
+            self._take(captured, captured_index)
+        self._take(piece, start)
+        self._put(PIECES_BY_TYPE[PieceType(promotion)](color) if promotion else piece, end)
+        if piece_type == PieceType.KING and abs(end - start) == 2:
+            rook_start, rook_end = (start + 3, start + 1) if end > start else (start - 4, start - 1)
+            rook = pieces[color][_POSITIONS[rook_start]]
+            self._take(rook, rook_start)
+            self._put(rook, rook_end)
+
+        self._key ^= CASTLING_KEYS[self._castling_rights]
+        self._castling_rights &= _CASTLING_MASKS[start] & _CASTLING_MASKS[end]
+        self._key ^= CASTLING_KEYS[self._castling_rights]
+
+        if self._en_passant != -1:
+            self._key ^= EN_PASSANT_KEYS[self._en_passant & 7]
+            self._en_passant = -1
+
+        if piece_type == PieceType.PAWN or captured is not None:
+            self._halfmove_clock = 0
+            self._reversible_plies = 0
+        else:
+            self._halfmove_clock += 1
+            self._reversible_plies += 1
+        if color == Color.BLACK:
+            self._fullmove_number += 1
+
+        self.pass_move()
+        if piece_type == PieceType.PAWN and abs(end - start) == 16:
+            self._set_en_passant((start + end) // 2)
+
+    def _unmake_move(self):
+        (
+            start,
+            end,
+            piece,
+            captured,
+            captured_index,
+            castling_rights,
+            en_passant,
+            halfmove_clock,
+            self._reversible_plies,
+        ) = self._history.pop()
+        self._keys.pop()
+        self.pass_move()
+        if piece is None:
+            # The null move.
+            if en_passant != -1:
+                self._key ^= EN_PASSANT_KEYS[en_passant & 7]
+                self._en_passant = en_passant
+            return
+        color = self._moving_pieces_color
+        if color == Color.BLACK:
+            self._fullmove_number -= 1
+
+        self._take(self._pieces_by_color[color][_POSITIONS[end]], end)
+        self._put(piece, start)
+        if captured is not None:
+            self._put(captured, captured_index)
+        if piece.TYPE == PieceType.KING and abs(end - start) == 2:
+            rook_start, rook_end = (start + 3, start + 1) if end > start else (start - 4, start - 1)
+            rook = self._pieces_by_color[color][_POSITIONS[rook_end]]
+            self._take(rook, rook_end)
+            self._put(rook, rook_start)
+
+        self._key ^= CASTLING_KEYS[self._castling_rights] ^ CASTLING_KEYS[castling_rights]
+        self._castling_rights = castling_rights
+        if self._en_passant != -1:
+            self._key ^= EN_PASSANT_KEYS[self._en_passant & 7]
+        if en_passant != -1:
+            self._key ^= EN_PASSANT_KEYS[en_passant & 7]
+        self._en_passant = en_passant
+        self._halfmove_clock = halfmove_clock
+
+    def _is_attacked(self, index: int, color: Color) -> bool:
+        """
+        Returns True if the square index is attacked by any chess piece of the color.
+        """
+        squares = self._squares
+        base = (color << 3) + 1
+        if any(squares[attacker] == base + PieceType.PAWN for attacker in PAWN_ATTACKS[color ^ 1][index]):
+            return True
+        if any(squares[attacker] == base + PieceType.KNIGHT for attacker in KNIGHT_TARGETS[index]):
+            return True
+        if any(squares[attacker] == base + PieceType.KING for attacker in KING_TARGETS[index]):
+            return True
+        for rays, slider in ((DIAGONAL_RAYS, base + PieceType.BISHOP), (DIRECT_RAYS, base + PieceType.ROOK)):
+            for ray in rays[index]:
+                for attacker in ray:
+                    code = squares[attacker]
+                    if code:
+                        if code == slider or code == base + PieceType.QUEEN:
+                            return True
+                        break
+        return False
+
+    def _get_least_valuable_attacker(self, index: int, color: Color, removed: set[int]) -> Optional[tuple[int, int]]:
+        """
+        Returns the square index and the piece type of the least valuable chess piece of the color
+        that attacks the square index, squares of removed are considered empty.
+        """
+        squares = self._squares
+        base = (color << 3) + 1
+        for attacker in PAWN_ATTACKS[color ^ 1][index]:
+            if squares[attacker] == base + PieceType.PAWN and attacker not in removed:
+                return attacker, PieceType.PAWN
+        for attacker in KNIGHT_TARGETS[index]:
+            if squares[attacker] == base + PieceType.KNIGHT and attacker not in removed:
+                return attacker, PieceType.KNIGHT
+
+        # Sliding chess pieces seen through removed squares, the nearest of each ray.
+        best: Optional[tuple[int, int]] = None
+        for rays, slider in ((DIAGONAL_RAYS, PieceType.BISHOP), (DIRECT_RAYS, PieceType.ROOK)):
+            for ray in rays[index]:
+                for attacker in ray:
+                    code = squares[attacker]
+                    if not code or attacker in removed:
+                        continue
+                    piece_type = code - base
+                    if (piece_type == slider or piece_type == PieceType.QUEEN) and (
+                        best is None or piece_type < best[1]
+                    ):
+                        best = attacker, piece_type
+                    break
+            if best is not None and best[1] == slider == PieceType.BISHOP:
+                return best
+        if best is not None:
+            return best
+
+        for attacker in KING_TARGETS[index]:
+            if squares[attacker] == base + PieceType.KING and attacker not in removed:
+                return attacker, PieceType.KING
+        return None
+
+    def _get_legal_moves(self) -> list[int]:
+        color = self._moving_pieces_color
+        opposite_color = color.opposite_color
+        king_indexes = self._king_indexes
+        legal_moves = []
+        for move in self._generate_moves():
+            self._make_move(move)
+            if king_indexes[color] == -1 or not self._is_attacked(king_indexes[color], opposite_color):
+                legal_moves.append(move)
+            self._unmake_move()
+        return legal_moves
+
+    def _has_legal_move(self) -> bool:
+        color = self._moving_pieces_color
+        opposite_color = color.opposite_color
+        king_indexes = self._king_indexes
+        for move in self._generate_moves():
+            self._make_move(move)
+            is_legal = king_indexes[color] == -1 or not self._is_attacked(king_indexes[color], opposite_color)
+            self._unmake_move()
+            if is_legal:
+                return True
+        return False
+
+    def _generate_moves(self, captures: bool = True, quiets: bool = True) -> Iterator[int]:
+        """
+        Yields pseudo-legal moves of the moving color, they can leave its king in check.
+        Captures include promotions, quiet moves are all other moves.
+        """
+        squares = self._squares
+        color = self._moving_pieces_color
+        for start in range(64):
+            code = squares[start]
+            if code and code >> 3 == color and code & 7 != _UNKNOWN_TYPE_CODE:
+                yield from self._generate_piece_moves(start, captures, quiets)
+
+    def _generate_piece_moves(self, start: int, captures: bool = True, quiets: bool = True) -> Iterator[int]:
+        """
+        Yields pseudo-legal moves of the chess piece of the moving color at the start square index.
+        """
+        squares = self._squares
+        color = self._moving_pieces_color
+        piece_type = (squares[start] & 7) - 1
+
+        if piece_type == PieceType.PAWN:
+            forward, start_y, promotion_y = (8, 1, 7) if color == Color.WHITE else (-8, 6, 0)
+            targets = []
+            end = start + forward
+            if 0 <= end < 64 and not squares[end]:
+                if end >> 3 == promotion_y:
+                    if captures:
+                        targets.append(end)
+                elif quiets:
+                    yield start | end << END_SHIFT
+                    if start >> 3 == start_y and not squares[end + forward]:
+                        yield start | (end + forward) << END_SHIFT
+            if captures:
+                for end in PAWN_ATTACKS[color][start]:
+                    target_code = squares[end]
+                    if (target_code and target_code >> 3 != color) or end == self._en_passant:
+                        targets.append(end)
+            for end in targets:
+                if end >> 3 == promotion_y:
+                    for promotion in _PROMOTION_TYPES:
+                        yield start | end << END_SHIFT | promotion << FLAGS_SHIFT
+                else:
+                    yield start | end << END_SHIFT
+
+        elif piece_type == PieceType.KNIGHT or piece_type == PieceType.KING:
+            for end in (KNIGHT_TARGETS if piece_type == PieceType.KNIGHT else KING_TARGETS)[start]:
+                target_code = squares[end]
+                if (quiets and not target_code) or (captures and target_code and target_code >> 3 != color):
+                    yield start | end << END_SHIFT
+            if quiets and piece_type == PieceType.KING and self._castling_rights:
+                yield from self._generate_castling_moves(start)
+
+        else:
+            rays: tuple[tuple[int, ...], ...] = ()
+            if piece_type != PieceType.ROOK:
+                rays += DIAGONAL_RAYS[start]
+            if piece_type != PieceType.BISHOP:
+                rays += DIRECT_RAYS[start]
+            for ray in rays:
+                for end in ray:
+                    target_code = squares[end]
+                    if not target_code:
+                        if quiets:
+                            yield start | end << END_SHIFT
+                        continue
+                    if captures and target_code >> 3 != color:
+                        yield start | end << END_SHIFT
+                    break
+
+    def _generate_castling_moves(self, start: int) -> Iterator[int]:
+        color = self._moving_pieces_color
+        if color == Color.WHITE:
+            king_index, king_side, queen_side = 4, WHITE_KING_SIDE, WHITE_QUEEN_SIDE
+        else:
+            king_index, king_side, queen_side = 60, BLACK_KING_SIDE, BLACK_QUEEN_SIDE
+        if start != king_index:
+            return
+
+        squares = self._squares
+        rook_code = (color << 3) + PieceType.ROOK + 1
+        opposite_color = color.opposite_color
+        if (
+            self._castling_rights & king_side
+            and squares[start + 3] == rook_code
+            and not squares[start + 1]
+            and not squares[start + 2]
+            and not any(self._is_attacked(index, opposite_color) for index in (start, start + 1, start + 2))
+        ):
+            yield start | (start + 2) << END_SHIFT
+        if (
+            self._castling_rights & queen_side
+            and squares[start - 4] == rook_code
+            and not squares[start - 1]
+            and not squares[start - 2]
+            and not squares[start - 3]
+            and not any(self._is_attacked(index, opposite_color) for index in (start, start - 1, start - 2))
+        ):
+            yield start | (start - 2) << END_SHIFT
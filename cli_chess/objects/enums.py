@@ -15,6 +15,32 @@ class Color(IntEnum):
         return self.name
 
 
+class PieceType(IntEnum):
+    PAWN = 0
+    KNIGHT = 1
+    BISHOP = 2
+    ROOK = 3
+    QUEEN = 4
+    KING = 5
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def symbol(self) -> str:
+        """
+        Returns the upper case letter of the piece type used by SAN and FEN, e.g. 'N' for knight.
+        """
+        return 'PNBRQK'[self]
+
+    @classmethod
+    def from_symbol(cls, symbol: str) -> 'PieceType':
+        index = 'PNBRQK'.find(symbol.upper())
+        if len(symbol) != 1 or index == -1:
+            raise ValueError(f'Unknown piece symbol: {symbol!r}.')
+        return cls(index)
+
+
 class Direction(IntEnum):
     UP = 0
     DOWN = 1
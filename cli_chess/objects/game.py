@@ -0,0 +1,99 @@
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from errors import GameRecordError
+from objects.board import STARTING_FEN, Board
+from objects.move import Move
+
+# Binary format of a game record: little-endian header (FEN length, move count), FEN in ASCII, moves as uint16.
+_HEADER = struct.Struct('<HI')
+
+
+class GameRecord:
+    """
+    Moves of a game from the start position, stored as packed 16-bit moves in array('H').
+    """
+
+    def __init__(self, fen: str = STARTING_FEN, moves: Iterable[int] = ()):
+        self._fen = fen
+        self._moves = array('H', moves)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameRecord':
+        """
+        Returns the game record from the binary format of to_bytes().
+        """
+        if len(data) < _HEADER.size:
+            raise GameRecordError('Cannot read the game record, the header is truncated.')
+        fen_length, move_count = _HEADER.unpack_from(data)
+        moves_offset = _HEADER.size + fen_length
+        if len(data) != moves_offset + move_count * 2:
+            raise GameRecordError('Cannot read the game record, the size does not match the header.')
+
+        record = cls(data[_HEADER.size : moves_offset].decode('ascii'))
+        record._moves.frombytes(data[moves_offset:])
+        if sys.byteorder == 'big':
+            record._moves.byteswap()
+        return record
+
+    @classmethod
+    def from_board(cls, board: Board) -> 'GameRecord':
+        """
+        Returns the game record of the moves made on the board, from the position before the first of them,
+        e.g. to set the game up with its history in another process. The board isn't changed.
+        """
+        board = board.copy()
+        moves = []
+        while (move := board.last_move) is not None:
+            if not move:
+                raise GameRecordError('Cannot record the game, the board has a null move.')
+            moves.append(move)
+            board.unmake_move()
+        return cls(board.get_fen(), reversed(moves))
+
+    @property
+    def fen(self) -> str:
+        return self._fen
+
+    @property
+    def moves(self) -> array:
+        return self._moves
+
+    def __len__(self):
+        return len(self._moves)
+
+    def __iter__(self) -> Iterator[Move]:
+        return map(Move.from_int, self._moves)
+
+    def __getitem__(self, ply: int) -> Move:
+        return Move.from_int(self._moves[ply])
+
+    def __eq__(self, record):
+        if isinstance(record, GameRecord):
+            return self._fen == record._fen and self._moves == record._moves
+        return NotImplemented
+
+    def append(self, move: int):
+        self._moves.append(move)
+
+    def pop(self) -> Move:
+        return Move.from_int(self._moves.pop())
+
+    def get_board(self, ply: Optional[int] = None) -> Board:
+        """
+        Returns a board with the position after the number of plies, after all moves by default.
+        """
+        board = Board.from_fen(self._fen)
+        for move in self._moves[:ply] if ply is not None else self._moves:
+            board.make_move(move)
+        return board
+
+    def to_bytes(self) -> bytes:
+        fen = self._fen.encode('ascii')
+        moves = self._moves
+        if sys.byteorder == 'big':
+            moves = array('H', moves)
+            moves.byteswap()
+        return _HEADER.pack(len(fen), len(moves)) + fen + moves.tobytes()
@@ -0,0 +1,65 @@
+from typing import Optional
+
+from objects.enums import PieceType
+from objects.position import Position
+
+# A move is packed into 16 bits: start square index (bits 0-5), end square index (bits 6-11)
+# and flags (bits 12-15) that hold the promotion piece type, 0 if the move isn't a promotion.
+START_MASK = 0x3F
+END_SHIFT = 6
+FLAGS_SHIFT = 12
+
+
+def encode_move(start: int, end: int, promotion: int = 0) -> int:
+    """
+    Returns the packed move from square indexes and the promotion piece type.
+    """
+    return start | end << END_SHIFT | promotion << FLAGS_SHIFT
+
+
+def decode_move(move: int) -> tuple[int, int, Optional[PieceType]]:
+    """
+    Returns square indexes and the promotion piece type of the packed move.
+    """
+    promotion = move >> FLAGS_SHIFT
+    return move & START_MASK, move >> END_SHIFT & START_MASK, PieceType(promotion) if promotion else None
+
+
+class Move(int):
+    """
+    Move of a chess piece from the start position to the end position packed into 16-bit integer.
+    Castling is a king move of two squares, promotion is the type of the piece the pawn becomes.
+    """
+
+    def __new__(cls, start: Position, end: Position, promotion: Optional[PieceType] = None):
+        return super().__new__(cls, encode_move(start.index, end.index, promotion or 0))
+
+    @classmethod
+    def from_int(cls, move: int) -> 'Move':
+        """
+        Returns the move from the packed integer, e.g. an item of array('H').
+        """
+        return int.__new__(cls, move)
+
+    @property
+    def start(self) -> Position:
+        return Position.from_index(self & START_MASK)
+
+    @property
+    def end(self) -> Position:
+        return Position.from_index(self >> END_SHIFT & START_MASK)
+
+    @property
+    def promotion(self) -> Optional[PieceType]:
+        promotion = self >> FLAGS_SHIFT
+        return PieceType(promotion) if promotion else None
+
+    def __getnewargs__(self):
+        return self.start, self.end, self.promotion
+
+    def __repr__(self):
+        return f'<Move({self})>'
+
+    def __str__(self):
+        promotion = self.promotion
+        return f'{self.start.notation}{self.end.notation}{promotion.symbol.lower() if promotion is not None else ""}'
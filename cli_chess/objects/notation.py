@@ -0,0 +1,154 @@
+import re
+from collections import OrderedDict
+from typing import cast
+
+from errors import AmbiguousMoveError, IllegalMoveError, InvalidNotationError
+from objects.board import Board
+from objects.enums import PieceType
+from objects.move import Move
+from objects.pieces import Piece
+from objects.position import Position
+
+SAN_CACHE_SIZE = 4096
+
+_UCI_PATTERN = re.compile(r'^([a-h][1-8])([a-h][1-8])([nbrq])?$')
+_SAN_PATTERN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQnbrq]))?$')
+
+# Position key -> (moves by SAN, SAN by move) of the legal moves of the position.
+_san_tables: OrderedDict[int, tuple[dict[str, Move], dict[Move, str]]] = OrderedDict()
+
+
+def parse_uci(uci: str) -> Move:
+    """
+    Returns the move from UCI notation, e.g. 'e2e4', 'e1g1' (castling) or 'e7e8q' (promotion).
+    """
+    match = _UCI_PATTERN.match(uci)
+    if match is None:
+        raise InvalidNotationError(move=uci, notation='UCI')
+    start, end, promotion = match.groups()
+    return Move(
+        Position.from_notation(start),
+        Position.from_notation(end),
+        PieceType.from_symbol(promotion) if promotion else None,
+    )
+
+
+def move_to_uci(move: Move) -> str:
+    """
+    Returns UCI notation of the move.
+    """
+    return str(move)
+
+
+def parse_san(board: Board, san: str) -> Move:
+    """
+    Returns the legal move of the board from Standard Algebraic Notation, e.g. 'Nbd7', 'exd5', 'e8=Q' or 'O-O'.
+    Check and annotation suffixes are ignored, the disambiguation is resolved against the legal moves of the board.
+    """
+    text = san.rstrip('+#!?')
+    if text.startswith('0'):
+        text = text.replace('0', 'O')
+
+    moves_by_san, _ = _get_san_table(board)
+    if (move := moves_by_san.get(text)) is not None:
+        return move
+
+    match = _SAN_PATTERN.match(text)
+    if match is None:
+        if text in ('O-O', 'O-O-O'):
+            raise IllegalMoveError(move=san)
+        raise InvalidNotationError(move=san, notation='SAN')
+
+    # The SAN is legal, but not canonical, e.g. it has a redundant disambiguation or a lower case promotion.
+    symbol, file, rank, _, square, promotion = match.groups()
+    piece_type = PieceType.from_symbol(symbol) if symbol else PieceType.PAWN
+    end = Position.from_notation(square)
+    promotion_type = PieceType.from_symbol(promotion) if promotion else None
+    candidates = [
+        move
+        for move in moves_by_san.values()
+        if move.end == end
+        and move.promotion == promotion_type
+        and _get_piece_type(board, move) == piece_type
+        and (file is None or move.start.notation[0] == file)
+        and (rank is None or move.start.notation[1] == rank)
+    ]
+    if not candidates:
+        raise IllegalMoveError(move=san)
+    if len(candidates) > 1:
+        raise AmbiguousMoveError(move=san)
+    return candidates[0]
+
+
+def move_to_san(board: Board, move: Move) -> str:
+    """
+    Returns Standard Algebraic Notation of the legal move of the board with the check (+) or checkmate (#) suffix.
+    """
+    _, sans_by_move = _get_san_table(board)
+    if (san := sans_by_move.get(move)) is None:
+        raise IllegalMoveError(move=move_to_uci(move))
+
+    board.make_move(move)
+    try:
+        if board.is_in_checkmate():
+            return san + '#'
+        if board.is_in_check():
+            return san + '+'
+        return san
+    finally:
+        board.unmake_move()
+
+
+def _get_san_table(board: Board) -> tuple[dict[str, Move], dict[Move, str]]:
+    """
+    Returns SAN of the legal moves of the board, the result is cached by the key of the position.
+    """
+    key = board.key
+    if (table := _san_tables.get(key)) is not None:
+        _san_tables.move_to_end(key)
+        return table
+
+    piece_types = {move: _get_piece_type(board, move) for move in board.get_legal_moves()}
+    sans_by_move = {move: _get_san(board, move, piece_types) for move in piece_types}
+    table = {san: move for move, san in sans_by_move.items()}, sans_by_move
+
+    _san_tables[key] = table
+    if len(_san_tables) > SAN_CACHE_SIZE:
+        _san_tables.popitem(last=False)
+    return table
+
+
+def _get_san(board: Board, move: Move, piece_types: dict[Move, PieceType]) -> str:
+    """
+    Returns SAN of the move without the check suffix, piece_types are types of moving pieces of all legal moves.
+    """
+    piece_type = piece_types[move]
+    start, end = move.start, move.end
+    is_capture = board.has_piece_at_position(end)
+
+    if piece_type == PieceType.KING and abs(start.x - end.x) == 2:
+        return 'O-O' if end.x > start.x else 'O-O-O'
+
+    if piece_type == PieceType.PAWN:
+        is_capture = start.x != end.x
+        san = f'{start.notation[0]}x{end.notation}' if is_capture else end.notation
+        return san + (f'={move.promotion.symbol}' if move.promotion is not None else '')
+
+    disambiguation = ''
+    rivals = [
+        other.start
+        for other, other_type in piece_types.items()
+        if other.end == end and other.start != start and other_type == piece_type
+    ]
+    if rivals:
+        if all(rival.x != start.x for rival in rivals):
+            disambiguation = start.notation[0]
+        elif all(rival.y != start.y for rival in rivals):
+            disambiguation = start.notation[1]
+        else:
+            disambiguation = start.notation
+    return f'{piece_type.symbol}{disambiguation}{"x" if is_capture else ""}{end.notation}'
+
+
+def _get_piece_type(board: Board, move: Move) -> PieceType:
+    return cast(PieceType, cast(Piece, board.get_piece(move.start)).TYPE)
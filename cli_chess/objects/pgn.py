@@ -0,0 +1,72 @@
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+from objects.board import STARTING_FEN, Board
+from objects.game import GameRecord
+from objects.notation import parse_san
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+_TAG_PATTERN = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]$')
+# Comments, variations, annotation glyphs, move numbers, results and moves of the movetext.
+_TOKEN_PATTERN = re.compile(r'\{[^}]*\}?|;[^\n]*|\(|\)|\$\d+|\d+\.+|1-0|0-1|1/2-1/2|\*|[^\s(){};$]+')
+
+
+class PgnGame(NamedTuple):
+    tags: dict[str, str]
+    sans: list[str]
+    result: str
+
+    def get_record(self) -> GameRecord:
+        """
+        Returns the game record of the moves, from the FEN tag if the game has one.
+        Raises NotationError if a move isn't legal.
+        """
+        fen = self.tags.get('FEN', STARTING_FEN)
+        board = Board.from_fen(fen)
+        record = GameRecord(fen)
+        for san in self.sans:
+            move = parse_san(board, san)
+            board.make_move(move)
+            record.append(move)
+        return record
+
+
+def read_pgn(lines: Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Yields games of Portable Game Notation, e.g. of an open file. Comments, variations and numeric annotation
+    glyphs are skipped, the result is taken from the movetext or the Result tag.
+    """
+    tags: dict[str, str] = {}
+    movetext: list[str] = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('%'):
+            continue
+        if line.startswith('[') and (match := _TAG_PATTERN.match(line)) is not None:
+            if movetext:
+                yield _parse_game(tags, movetext)
+                tags, movetext = {}, []
+            tags[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+        elif line:
+            movetext.append(line)
+    if tags or movetext:
+        yield _parse_game(tags, movetext)
+
+
+def _parse_game(tags: dict[str, str], movetext: list[str]) -> PgnGame:
+    sans = []
+    result = tags.get('Result', '*')
+    variation_depth = 0
+    for token in _TOKEN_PATTERN.findall('\n'.join(movetext)):
+        if token == '(':
+            variation_depth += 1
+        elif token == ')':
+            variation_depth = max(variation_depth - 1, 0)
+        elif variation_depth or token[0] in '{;$' or token[0].isdigit() and token.endswith('.'):
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            sans.append(token)
+    return PgnGame(tags, sans, result)
@@ -9,7 +9,7 @@ from errors import (
     InvalidMoveDistanceError,
     PieceError,
 )
-from objects.enums import Color, Direction
+from objects.enums import Color, Direction, PieceType
 from objects.position import Position
 from functools import partial
 
@@ -23,6 +23,8 @@ class Piece:
 
     MAX_MOVE_COUNT = 0
 
+    TYPE: Optional[PieceType] = None
+
     def __init__(self, color: int):
         self._color = Color(color)
 
@@ -170,6 +172,8 @@ class Piece:
 class Pawn(Piece):
     MAX_MOVE_COUNT = 1
 
+    TYPE = PieceType.PAWN
+
     def __init__(self, color: Color):
         super().__init__(color)
         self._moved = False
@@ -226,12 +230,16 @@ class Rook(Piece):
 
     MAX_MOVE_COUNT = 8
 
+    TYPE = PieceType.ROOK
+
 
 class Knight(Piece):
     ALLOWED_MOVE_DIRECTIONS: frozenset[Direction] = frozenset(Direction.get_diagonal_directions())
 
     MAX_MOVE_COUNT = 3
 
+    TYPE = PieceType.KNIGHT
+
     @override
     def check_move_distance(self, distance: int, *, raise_exception=False, **kwargs) -> bool:
         result = distance == self.MAX_MOVE_COUNT
@@ -304,18 +312,24 @@ class Bishop(Piece):
 
     MAX_MOVE_COUNT = 8
 
+    TYPE = PieceType.BISHOP
+
 
 class Queen(Piece):
     ALLOWED_MOVE_DIRECTIONS: frozenset[Direction] = frozenset(Direction)
 
     MAX_MOVE_COUNT = 8
 
+    TYPE = PieceType.QUEEN
+
 
 class King(Piece):
     ALLOWED_MOVE_DIRECTIONS: frozenset[Direction] = frozenset(Direction)
 
     MAX_MOVE_COUNT = 1
 
+    TYPE = PieceType.KING
+
     def check_get_to_end_position(
         self, start: Position, end: Position, board, *, raise_exception=False, **kwargs
     ) -> bool:
@@ -382,3 +396,13 @@ class King(Piece):
             if allied_piece.check(allied_pos, pos, board, raise_exception=False):
                 return True
         return False
+
+
+PIECES_BY_TYPE: dict[PieceType, type[Piece]] = {
+    PieceType.PAWN: Pawn,
+    PieceType.KNIGHT: Knight,
+    PieceType.BISHOP: Bishop,
+    PieceType.ROOK: Rook,
+    PieceType.QUEEN: Queen,
+    PieceType.KING: King,
+}
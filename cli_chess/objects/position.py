@@ -3,6 +3,9 @@ from typing import Generator
 from objects.enums import Direction
 from objects.vector import Vector
 
+FILES = 'abcdefgh'
+RANKS = '12345678'
+
 
 class Position:
     __match_args__ = ('x', 'y')
@@ -14,6 +17,25 @@ class Position:
             raise ValueError(f'Expected x >= 0 and y >= 0, but got x={x} < 0, y={y} < 0.')
         self._x = x
         self._y = y
+        self._hash = hash((x, y))
+
+    @classmethod
+    def from_index(cls, index: int) -> 'Position':
+        """
+        Returns the position of the square index, where index = y * 8 + x (0 is a1, 63 is h8).
+        """
+        if not 0 <= index < 64:
+            raise ValueError(f'Expected 0 <= index < 64, but got index={index}.')
+        return _POSITIONS[index]
+
+    @classmethod
+    def from_notation(cls, notation: str) -> 'Position':
+        """
+        Returns the position of the square in algebraic notation, e.g. 'e4'.
+        """
+        if len(notation) != 2 or notation[0] not in FILES or notation[1] not in RANKS:
+            raise ValueError(f'Expected square in algebraic notation like "e4", but got {notation!r}.')
+        return _POSITIONS[RANKS.index(notation[1]) * 8 + FILES.index(notation[0])]
 
     @property
     def x(self) -> int:
@@ -23,11 +45,25 @@ class Position:
     def y(self) -> int:
         return self._y
 
+    @property
+    def index(self) -> int:
+        """
+        Square index of the position, where index = y * 8 + x.
+        """
+        return self._y * 8 + self._x
+
+    @property
+    def notation(self) -> str:
+        """
+        Square of the position in algebraic notation, x is the file and y is the rank.
+        """
+        return FILES[self._x] + RANKS[self._y]
+
     def __str__(self):
         return f'x:{self.x}, y:{self.y}'
 
     def __hash__(self):
-        return hash(tuple(self))
+        return self._hash
 
     def __repr__(self):
         return f'<Position(x:{self.x}, y:{self.y})>'
@@ -115,3 +151,6 @@ class Position:
     def __valid_position(value):
         if not isinstance(value, Position):
             raise TypeError(f'Expected Position, but got {type(value).__name__}.')
+
+
+_POSITIONS: tuple[Position, ...] = tuple(Position(index % 8, index // 8) for index in range(64))
@@ -0,0 +1,19 @@
+import random
+
+_random = random.Random(20241019)
+
+
+def _get_random_key() -> int:
+    return _random.getrandbits(64)
+
+
+# The key of a position is XOR of the keys of its pieces, the moving color, castling rights and en passant file.
+# PIECE_KEYS[color][piece type][square index]
+PIECE_KEYS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(tuple(_get_random_key() for _ in range(64)) for _ in range(6)) for _ in range(2)
+)
+SIDE_KEY: int = _get_random_key()
+# CASTLING_KEYS[castling rights bit mask], a board without castling rights has no key
+CASTLING_KEYS: tuple[int, ...] = (0,) + tuple(_get_random_key() for _ in range(15))
+# EN_PASSANT_KEYS[file]
+EN_PASSANT_KEYS: tuple[int, ...] = tuple(_get_random_key() for _ in range(8))
@@ -0,0 +1,50 @@
+import numpy as np
+
+from engine.batch import evaluate_batch, get_piece_planes
+from engine.evaluation import Evaluator, get_tapered_score
+from objects.board import STARTING_FEN, Board
+from objects.enums import Color, PieceType
+from objects.pieces import Piece
+from objects.position import Position
+
+FENS = [
+    STARTING_FEN,
+    'r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+]
+
+
+def get_expected_score(board: Board) -> int:
+    evaluator = Evaluator(board)
+    score = get_tapered_score(evaluator.mg_score, evaluator.eg_score, evaluator.phase)
+    return score if board.moving_pieces_color == Color.WHITE else -score
+
+
+class TestPiecePlanes:
+    def test_planes_have_pieces_by_color_and_type(self):
+        planes = get_piece_planes([Board.from_fen()])
+        assert planes.shape == (1, 12, 64)
+        assert planes.sum() == 32
+        assert np.flatnonzero(planes[0, PieceType.ROOK]).tolist() == [0, 7]
+        assert np.flatnonzero(planes[0, 6 + PieceType.KING]).tolist() == [60]
+
+    def test_pieces_without_type_have_no_plane(self):
+        board = Board.from_fen()
+        board.add_piece(Piece(Color.WHITE), Position(4, 3))
+        assert get_piece_planes([board]).sum() == 32
+
+
+class TestEvaluateBatch:
+    def test_batch_scores_equal_material_and_piece_square_scores(self):
+        boards = [Board.from_fen(fen) for fen in FENS]
+        scores = evaluate_batch(boards)
+        assert scores.tolist() == [get_expected_score(board) for board in boards]
+
+    def test_batch_is_evaluated_in_chunks(self, monkeypatch):
+        monkeypatch.setattr('engine.batch.BATCH_CHUNK_SIZE', 3)
+        boards = [Board.from_fen(fen) for fen in FENS] * 2
+        assert evaluate_batch(boards).tolist() == [get_expected_score(board) for board in boards]
+
+    def test_empty_batch(self):
+        assert evaluate_batch([]).shape == (0,)
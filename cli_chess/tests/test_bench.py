@@ -0,0 +1,13 @@
+import pytest
+
+from engine.bench import BENCH_OPTIONS, compare_options, get_effective_branching_factor
+
+
+class TestBench:
+    def test_compare_options_counts_nodes_of_every_options(self):
+        nodes_by_name = compare_options(3, ['r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8'])
+        assert list(nodes_by_name) == list(BENCH_OPTIONS)
+        assert nodes_by_name['all'] < nodes_by_name['alpha-beta']
+
+    def test_effective_branching_factor(self):
+        assert get_effective_branching_factor(2 * 8**3, 3, 2) == pytest.approx(8)
@@ -6,11 +6,24 @@ import pytest
 from pytest_lazy_fixtures import lf
 
 from errors import BoardError
-from objects.board import Board
-from objects.enums import Color, Direction
+from objects.board import STARTING_FEN, Board
+from objects.enums import Color, Direction, PieceType
+from objects.notation import parse_uci
+from objects.pieces import King, Pawn, Piece, Rook
 from objects.position import Position
 
 
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    count = 0
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        count += perft(board, depth - 1)
+        board.unmake_move()
+    return count
+
+
 class TestBoard:
     def test_creating_board(self):
         board = Board()
@@ -289,3 +302,316 @@ class TestBoard:
         board.pass_move()
         assert board.moving_pieces_color == Color.BLACK
         assert board.check_stalemate() is False
+
+
+class TestBoardFen:
+    @pytest.mark.parametrize(
+        'fen',
+        [
+            STARTING_FEN,
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+            'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+            '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 12 40',
+        ],
+    )
+    def test_creating_board_from_fen_and_getting_fen(self, fen):
+        assert Board.from_fen(fen).get_fen() == fen
+
+    def test_creating_board_from_starting_fen(self):
+        board = Board.from_fen()
+        assert isinstance(board.get_piece(Position(4, 0)), King)
+        assert board.get_piece(Position(4, 0)).color == Color.WHITE
+        assert isinstance(board.get_piece(Position(0, 7)), Rook)
+        assert board.get_piece(Position(0, 7)).color == Color.BLACK
+        assert len(board.pieces_by_color[Color.WHITE]) == len(board.pieces_by_color[Color.BLACK]) == 16
+        assert board.moving_pieces_color == Color.WHITE
+        assert board.castling_rights == 15
+        assert board.en_passant is None
+
+    def test_en_passant_is_skipped_if_no_pawn_can_capture(self):
+        board = Board.from_fen('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1')
+        assert board.en_passant is None
+        assert board.key == Board.from_fen('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1').key
+
+    @pytest.mark.parametrize(
+        'fen',
+        [
+            '',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w KQkq - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN w KQkq - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkx - 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e9 0 1',
+            'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - a 1',
+        ],
+    )
+    def test_creating_board_from_fen_raises_error_if_fen_is_invalid(self, fen):
+        with pytest.raises(BoardError, match=r'Invalid FEN'):
+            Board.from_fen(fen)
+
+
+class TestBoardMoves:
+    @pytest.mark.parametrize(
+        'fen,expected',
+        [
+            (STARTING_FEN, [20, 400, 8902]),
+            ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', [48, 2039]),
+            ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812]),
+            ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', [6, 264]),
+            ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [44, 1486]),
+        ],
+    )
+    def test_counting_legal_moves_to_depth(self, fen, expected):
+        board = Board.from_fen(fen)
+        assert [perft(board, depth) for depth in range(1, len(expected) + 1)] == expected
+
+    def test_unmaking_move_restores_position_and_key(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        board = Board.from_fen(fen)
+        key = board.key
+        for move in board.get_legal_moves():
+            board.make_move(move)
+            assert board.key == Board.from_fen(board.get_fen()).key
+            board.unmake_move()
+            assert board.get_fen() == fen
+            assert board.key == key
+
+    def test_key_of_transposed_positions_is_equal(self):
+        board_1 = Board.from_fen()
+        board_2 = Board.from_fen()
+        for move in (parse_uci('g1f3'), parse_uci('g8f6'), parse_uci('b1c3'), parse_uci('b8c6')):
+            board_1.make_move(move)
+        for move in (parse_uci('b1c3'), parse_uci('b8c6'), parse_uci('g1f3'), parse_uci('g8f6')):
+            board_2.make_move(move)
+        assert board_1.key == board_2.key
+        assert board_1.key != Board.from_fen().key
+
+    def test_making_castling_moves_rook(self):
+        board = Board.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        board.make_move(parse_uci('e1g1'))
+        assert board.get_fen() == 'r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1'
+        board.make_move(parse_uci('e8c8'))
+        assert board.get_fen() == '2kr3r/8/8/8/8/8/8/R4RK1 w - - 2 2'
+
+    def test_making_en_passant_captures_pawn(self):
+        board = Board.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3')
+        board.make_move(parse_uci('e5f6'))
+        assert board.get_fen() == 'rnbqkbnr/ppp1p1pp/5P2/3p4/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3'
+
+    def test_making_promotion_replaces_pawn(self):
+        board = Board.from_fen('8/4P2k/8/8/8/8/8/4K3 w - - 0 1')
+        pawn = board.get_piece(Position(4, 6))
+        board.make_move(parse_uci('e7e8n'))
+        assert board.get_piece(Position(4, 7)).TYPE == PieceType.KNIGHT
+        board.unmake_move()
+        assert board.get_piece(Position(4, 6)) is pawn
+
+    def test_unmaking_move_raises_error_if_there_are_no_made_moves(self, board):
+        with pytest.raises(BoardError, match=r'Cannot unmake the move, there are no made moves.'):
+            board.unmake_move()
+
+    def test_pieces_without_type_block_but_dont_move(self, board):
+        board.add_piece(King(Color.WHITE), Position(0, 0))
+        board.add_piece(Piece(Color.WHITE), Position(0, 1))
+        board.add_piece(Piece(Color.WHITE), Position(1, 1))
+        board.add_piece(Pawn(Color.WHITE), Position(1, 0))
+        assert board.get_legal_moves() == []
+
+    def test_check_and_checkmate(self):
+        board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        assert board.is_in_check() is False
+        board.make_move(parse_uci('a1a8'))
+        assert board.is_in_check() is True
+        assert board.is_in_check(Color.WHITE) is False
+        assert board.is_in_checkmate() is True
+        assert board.get_legal_moves() == []
+
+    def test_getting_piece_type_at_square(self, board):
+        board.add_piece(Rook(Color.BLACK), Position(0, 7))
+        board.add_piece(Piece(Color.WHITE), Position(1, 1))
+        assert board.get_piece_type_at(Position(0, 7).index) == PieceType.ROOK
+        assert board.get_piece_type_at(Position(1, 1).index) == -1
+        assert board.get_piece_type_at(Position(2, 2).index) == -1
+
+    def test_is_capture(self):
+        board = Board.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3')
+        assert board.is_capture(parse_uci('e5f6')) is True
+        assert board.is_capture(parse_uci('e5e6')) is False
+        assert board.is_capture(parse_uci('d1h5')) is False
+        board.make_move(parse_uci('f1b5'))
+        assert board.is_capture(parse_uci('c7c6')) is False
+        assert board.is_capture(parse_uci('c8d7')) is False
+        board.make_move(parse_uci('c7c6'))
+        assert board.is_capture(parse_uci('b5c6')) is True
+
+    def test_pseudo_legal_moves_are_split_into_captures_and_quiet_moves(self):
+        board = Board.from_fen('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1')
+        captures = board.get_pseudo_legal_captures()
+        quiet_moves = board.get_pseudo_legal_quiet_moves()
+        assert sorted(captures + quiet_moves) == sorted(board.get_pseudo_legal_moves())
+        assert all(board.is_capture(move) or move >> 12 for move in captures)
+        assert not any(board.is_capture(move) or move >> 12 for move in quiet_moves)
+
+        board = Board.from_fen('n3k3/1P6/8/8/8/8/8/4K3 w - - 0 1')
+        assert parse_uci('b7a8q') in board.get_pseudo_legal_captures()
+        assert parse_uci('b7b8n') in board.get_pseudo_legal_captures()
+        assert parse_uci('b7b8n') not in board.get_pseudo_legal_quiet_moves()
+
+    def test_is_pseudo_legal(self):
+        board = Board.from_fen()
+        assert all(board.is_pseudo_legal(move) for move in board.get_pseudo_legal_moves())
+        assert board.is_pseudo_legal(parse_uci('e2e5')) is False
+        assert board.is_pseudo_legal(parse_uci('e7e5')) is False
+        assert board.is_pseudo_legal(parse_uci('e4e5')) is False
+        assert board.is_pseudo_legal(parse_uci('d1h5')) is False
+        assert board.is_pseudo_legal(parse_uci('g1f3')) is True
+
+    @pytest.mark.parametrize(
+        'fen,move,expected',
+        [
+            ('1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1', 'e1e5', 100),
+            ('1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1', 'd3e5', -220),
+            ('4k3/8/2p5/3p4/4P3/8/8/4K3 w - - 0 1', 'e4d5', 0),
+            ('4k3/8/2p5/3p4/8/8/8/3RK3 w - - 0 1', 'd1d5', -400),
+            ('3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1', 'd2d5', 100),
+            ('4k3/8/2p5/3r4/4K3/8/8/8 w - - 0 1', 'e4d5', -19_500),
+            ('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1', 'e5d6', 100),
+            ('3rk3/1P6/8/8/8/8/8/4K3 w - - 0 1', 'b7b8q', -100),
+            ('1r2k3/1P6/8/8/8/8/8/4K3 w - - 0 1', 'b7b8q', 1300),
+            ('4k3/8/8/8/8/8/4P3/4K3 w - - 0 1', 'e2e4', 0),
+        ],
+    )
+    def test_see_returns_material_balance_of_exchange(self, fen, move, expected):
+        board = Board.from_fen(fen)
+        assert board.see(parse_uci(move)) == expected
+        assert board.get_fen() == fen
+
+    def test_making_null_move_passes_move_and_clears_en_passant(self):
+        board = Board.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3')
+        fen, key = board.get_fen(), board.key
+        board.make_null_move()
+        assert board.get_fen() == 'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3'
+        assert board.key == Board.from_fen(board.get_fen()).key
+        board.unmake_move()
+        assert board.get_fen() == fen
+        assert board.key == key
+
+    def test_listeners_receive_put_and_taken_pieces(self):
+        board = Board.from_fen('4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1')
+        events = []
+
+        class Listener:
+            def put_piece(self, color, piece_type, index):
+                events.append(('put', color, piece_type, index))
+
+            def take_piece(self, color, piece_type, index):
+                events.append(('take', color, piece_type, index))
+
+        listener = Listener()
+        board.add_listener(listener)
+        board.make_move(parse_uci('e4d5'))
+        assert events == [
+            ('take', Color.BLACK, PieceType.PAWN, 35),
+            ('take', Color.WHITE, PieceType.PAWN, 28),
+            ('put', Color.WHITE, PieceType.PAWN, 35),
+        ]
+        board.remove_listener(listener)
+        board.unmake_move()
+        assert len(events) == 3
+
+    def test_pawn_key_is_changed_only_by_pawns(self):
+        board = Board.from_fen()
+        pawn_key = board.pawn_key
+        board.make_move(parse_uci('g1f3'))
+        assert board.pawn_key == pawn_key
+        board.make_move(parse_uci('e7e5'))
+        assert board.pawn_key != pawn_key
+        assert board.pawn_key == Board.from_fen(board.get_fen()).pawn_key
+        board.unmake_move()
+        assert board.pawn_key == pawn_key
+        assert Board().pawn_key == Board.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1').pawn_key == 0
+
+    def test_getting_piece_indexes(self):
+        board = Board.from_fen()
+        assert board.get_piece_indexes(Color.WHITE, PieceType.ROOK) == [0, 7]
+        assert board.get_piece_indexes(Color.BLACK, PieceType.KING) == [60]
+
+    def test_getting_square_codes(self):
+        board = Board.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 0 1')
+        board.add_piece(Piece(Color.BLACK), Position(0, 7))
+        codes = board.get_square_codes()
+        assert len(codes) == 64
+        assert (codes[0], codes[4], codes[60], codes[56], codes[1]) == (4, 6, 14, 15, 0)
+
+
+class TestBoardDraws:
+    KNIGHT_SHUFFLE = ('g1f3', 'g8f6', 'f3g1', 'f6g8')
+
+    def make_moves(self, board: Board, moves) -> list[bool]:
+        repetitions = []
+        for move in moves:
+            board.make_move(parse_uci(move))
+            repetitions.append(board.is_repetition())
+        return repetitions
+
+    def test_repetition_of_position_with_same_color_to_move(self):
+        board = Board.from_fen()
+        assert self.make_moves(board, self.KNIGHT_SHUFFLE) == [False, False, False, True]
+        assert not board.is_threefold_repetition()
+
+    def test_threefold_repetition(self):
+        board = Board.from_fen()
+        self.make_moves(board, self.KNIGHT_SHUFFLE * 2)
+        assert board.is_threefold_repetition()
+        board.unmake_move()
+        assert not board.is_threefold_repetition()
+        assert board.is_repetition()
+
+    def test_repetition_stops_at_irreversible_move(self):
+        board = Board.from_fen()
+        self.make_moves(board, self.KNIGHT_SHUFFLE[:2])
+        moves = ('e2e4', 'e7e5', *self.KNIGHT_SHUFFLE[2:], *self.KNIGHT_SHUFFLE[:2])
+        assert self.make_moves(board, moves) == [False] * 5 + [True]
+        assert not board.is_repetition(2)
+
+    def test_repetition_stops_at_null_move(self):
+        board = Board.from_fen()
+        self.make_moves(board, self.KNIGHT_SHUFFLE)
+        board.make_null_move()
+        board.make_null_move()
+        assert not board.is_repetition()
+        board.unmake_move()
+        board.unmake_move()
+        assert board.is_repetition()
+
+    def test_copy_keeps_repetitions_and_made_moves(self):
+        board = Board.from_fen()
+        self.make_moves(board, self.KNIGHT_SHUFFLE[:3])
+        copy = board.copy()
+        assert self.make_moves(copy, self.KNIGHT_SHUFFLE[3:]) == [True]
+        for _ in self.KNIGHT_SHUFFLE:
+            copy.unmake_move()
+        assert copy.get_fen() == Board.from_fen().get_fen()
+        assert board.get_fen() != copy.get_fen()
+
+    def test_last_move(self):
+        board = Board.from_fen('8/4P2k/8/8/8/8/8/4K3 w - - 0 1')
+        assert board.last_move is None
+        board.make_move(parse_uci('e7e8q'))
+        assert board.last_move == parse_uci('e7e8q')
+        board.make_null_move()
+        assert board.last_move == 0
+        board.unmake_move()
+        board.make_move(parse_uci('h7g7'))
+        assert board.last_move == parse_uci('h7g7')
+
+    def test_no_repetition_without_history(self):
+        board = Board.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 40 60')
+        assert not board.is_repetition()
+
+    @pytest.mark.parametrize('halfmove_clock, expected', [(99, False), (100, True)])
+    def test_fifty_move_draw(self, halfmove_clock, expected):
+        board = Board.from_fen(f'4k3/8/8/8/8/8/8/4K3 w - - {halfmove_clock} 80')
+        assert board.is_fifty_move_draw() is expected
@@ -0,0 +1,147 @@
+import random
+
+import pytest
+
+import engine.book as book_module
+from engine.book import (
+    DRAW_WEIGHT,
+    RECORD_SIZE,
+    WIN_WEIGHT,
+    OpeningBook,
+    build_book,
+    build_book_from_pgn,
+)
+from errors import BookError
+from objects.board import Board
+from objects.game import GameRecord
+from objects.notation import parse_uci
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 1/2-1/2
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+
+[Result "*"]
+
+1. e4 e4 *
+"""
+
+
+def get_record(*moves: str) -> GameRecord:
+    board = Board.from_fen()
+    record = GameRecord()
+    for uci in moves:
+        move = parse_uci(uci)
+        board.make_move(move)
+        record.append(move)
+    return record
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    path = tmp_path / 'book.bin'
+    pgn_path = tmp_path / 'games.pgn'
+    pgn_path.write_text(PGN)
+    build_book_from_pgn(pgn_path, path)
+    return path
+
+
+class TestBuildBook:
+    def test_weights_moves_by_results(self, book_path):
+        with OpeningBook(book_path) as book:
+            moves = book.probe(Board.from_fen())
+
+        assert [(str(move), weight) for move, weight in moves] == [('e2e4', WIN_WEIGHT + DRAW_WEIGHT)]
+
+    def test_leaves_out_moves_only_lost_with(self, book_path):
+        board = Board.from_fen()
+        board.make_move(parse_uci('d2d4'))
+        with OpeningBook(book_path) as book:
+            assert [str(move) for move, _ in book.probe(board)] == ['d7d5']
+
+    def test_sorts_moves_of_position_by_weight(self, book_path):
+        board = Board.from_fen()
+        board.make_move(parse_uci('e2e4'))
+        with OpeningBook(book_path) as book:
+            moves = book.probe(board)
+
+        assert [(str(move), weight) for move, weight in moves] == [('c7c5', DRAW_WEIGHT)]
+
+    def test_skips_games_with_illegal_moves(self, book_path):
+        with OpeningBook(book_path) as book:
+            assert len(book) == 5
+
+    def test_limits_plies(self, tmp_path):
+        path = tmp_path / 'book.bin'
+
+        count = build_book([(get_record('e2e4', 'e7e5', 'g1f3'), '1-0')], path, max_plies=2)
+
+        assert count == 1
+        assert path.stat().st_size == 8 + RECORD_SIZE
+
+    def test_scales_weights_down_to_max_weight(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(book_module, 'MAX_WEIGHT', 5)
+        path = tmp_path / 'book.bin'
+        games = [(get_record('e2e4'), '1-0')] * 5 + [(get_record('d2d4'), '1/2-1/2')]
+
+        build_book(games, path)
+
+        with OpeningBook(path) as book:
+            weights = [weight for _, weight in book.probe(Board.from_fen())]
+        assert weights == [5, 1]
+
+
+class TestOpeningBook:
+    def test_returns_no_moves_of_unknown_position(self, book_path):
+        board = Board.from_fen('4k3/8/8/8/8/8/4P3/4K3 w - - 0 1')
+        with OpeningBook(book_path) as book:
+            assert book.probe(board) == []
+            assert book.choose_move(board) is None
+
+    def test_finds_every_key(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        games = [
+            (get_record(first, second), '1/2-1/2') for first in ('e2e4', 'd2d4', 'c2c4') for second in ('g8f6', 'b8c6')
+        ]
+        build_book(games, path)
+        with OpeningBook(path) as book:
+            for record, _ in games:
+                board = Board.from_fen()
+                for move in record:
+                    assert move in [book_move.move for book_move in book.probe(board)]
+                    board.make_move(move)
+
+    def test_choose_move_in_proportion_to_weights(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        build_book([(get_record('e2e4'), '1-0')] * 3 + [(get_record('d2d4'), '1/2-1/2')], path)
+        rng = random.Random(1)
+        with OpeningBook(path) as book:
+            moves = [str(book.choose_move(Board.from_fen(), rng)) for _ in range(700)]
+
+        assert 500 < moves.count('e2e4') < 680
+
+    def test_raises_error_for_invalid_file(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        path.write_bytes(b'not a book')
+
+        with pytest.raises(BookError):
+            OpeningBook(path)
+
+    def test_raises_error_for_truncated_file(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        build_book([(get_record('e2e4'), '1-0')], path)
+        path.write_bytes(path.read_bytes()[:-1])
+
+        with pytest.raises(BookError):
+            OpeningBook(path)
+
+    def test_raises_error_for_missing_file(self, tmp_path):
+        with pytest.raises(BookError):
+            OpeningBook(tmp_path / 'missing.bin')
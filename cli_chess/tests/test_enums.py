@@ -1,6 +1,6 @@
 import pytest
 
-from objects.enums import Color, Direction
+from objects.enums import Color, Direction, PieceType
 from objects.vector import Vector
 
 directions_vectors = [
@@ -21,6 +21,19 @@ class TestColorEnum:
         assert Color.BLACK.opposite_color == Color.WHITE
 
 
+class TestPieceTypeEnum:
+    @pytest.mark.parametrize('piece_type,symbol', list(zip(PieceType, 'PNBRQK')))
+    def test_symbol_of_piece_type(self, piece_type, symbol):
+        assert piece_type.symbol == symbol
+        assert PieceType.from_symbol(symbol) == piece_type
+        assert PieceType.from_symbol(symbol.lower()) == piece_type
+
+    @pytest.mark.parametrize('symbol', ['', 'X', 'NB'])
+    def test_getting_piece_type_from_symbol_raises_error_if_symbol_is_unknown(self, symbol):
+        with pytest.raises(ValueError, match=r'Unknown piece symbol'):
+            PieceType.from_symbol(symbol)
+
+
 class TestDirectionEnum:
     def test_getting_direct_directions(self):
         expected = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
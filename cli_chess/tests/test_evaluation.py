@@ -0,0 +1,146 @@
+import pytest
+
+from engine.evaluation import (
+    MAX_PHASE,
+    EvalCache,
+    Evaluator,
+    evaluate,
+    get_tapered_score,
+)
+from engine.pawns import PASSED_PAWN_EG_BONUSES
+from engine.search import search
+from errors import EvaluationError
+from objects.board import STARTING_FEN, Board
+from objects.enums import Color
+from objects.notation import parse_uci
+from objects.pieces import Queen
+from objects.position import Position
+
+
+def walk(board: Board, evaluator: Evaluator, depth: int):
+    """
+    Checks the incremental evaluation of all positions up to the depth.
+    """
+    assert evaluator.evaluate() == evaluate(board)
+    if depth == 0:
+        return
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        walk(board, evaluator, depth - 1)
+        board.unmake_move()
+    assert evaluator.evaluate() == evaluate(board)
+
+
+class TestEvaluation:
+    def test_starting_position_is_equal(self):
+        assert evaluate(Board.from_fen()) == 0
+
+    def test_score_is_from_point_of_view_of_moving_color(self):
+        board = Board.from_fen('4k3/8/8/8/8/8/8/3QK3 w - - 0 1')
+        score = evaluate(board)
+        assert score > 0
+        board.pass_move()
+        assert evaluate(board) == -score
+
+    def test_mirrored_positions_have_equal_scores(self):
+        board = Board.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        mirrored_board = Board.from_fen('rnbqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 2 3')
+        assert evaluate(board) == evaluate(mirrored_board)
+
+    def test_pieces_on_better_squares_score_more(self):
+        centralized_knight = Board.from_fen('4k3/8/8/8/3N4/8/8/4K3 w - - 0 1')
+        cornered_knight = Board.from_fen('4k3/8/8/8/8/8/8/N3K3 w - - 0 1')
+        assert evaluate(centralized_knight) > evaluate(cornered_knight)
+
+    @pytest.mark.parametrize(
+        'phase,expected',
+        [(MAX_PHASE, 100), (0, 300), (MAX_PHASE // 2, 200), (MAX_PHASE + 2, 100)],
+    )
+    def test_tapered_score_blends_middlegame_and_endgame_scores(self, phase, expected):
+        assert get_tapered_score(100, 300, phase) == expected
+
+    def test_advanced_pawns_score_more_in_endgame(self):
+        advanced_pawn = Board.from_fen('4k3/8/P7/8/8/8/8/4K3 w - - 0 1')
+        pawn = Board.from_fen('4k3/8/8/8/8/8/P7/4K3 w - - 0 1')
+        # The piece-square bonus and the passed pawn bonus of the 6th rank over the 2nd rank.
+        assert evaluate(advanced_pawn) - evaluate(pawn) == 50 + PASSED_PAWN_EG_BONUSES[5] - PASSED_PAWN_EG_BONUSES[1]
+
+
+class TestEvaluator:
+    @pytest.mark.parametrize(
+        'fen',
+        [
+            STARTING_FEN,
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+            'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+            'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+        ],
+    )
+    def test_evaluator_is_updated_by_made_and_unmade_moves(self, fen):
+        board = Board.from_fen(fen)
+        walk(board, Evaluator(board), 2)
+
+    def test_evaluator_is_updated_by_added_and_removed_pieces(self):
+        board = Board.from_fen()
+        evaluator = Evaluator(board)
+        queen = Queen(Color.WHITE)
+        board.add_piece(queen, Position(4, 3))
+        assert evaluator.evaluate() == evaluate(board)
+        board.remove_piece(queen, Position(4, 3))
+        assert evaluator.evaluate() == 0
+
+    def test_closed_evaluator_isnt_updated(self):
+        board = Board.from_fen()
+        evaluator = Evaluator(board)
+        evaluator.close()
+        board.make_move(parse_uci('e2e4'))
+        assert evaluator.mg_score == 0
+
+    def test_evaluator_looks_up_scores_in_eval_cache(self):
+        board = Board.from_fen()
+        cache = EvalCache(16)
+        evaluator = Evaluator(board, eval_cache=cache)
+        board.make_move(parse_uci('e2e4'))
+        score = evaluator.evaluate()
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert evaluator.evaluate() == score
+        assert (cache.hits, cache.misses) == (1, 1)
+        board.unmake_move()
+        assert evaluator.evaluate() == evaluate(board)
+
+
+class TestEvalCache:
+    def test_cache_returns_stored_score_of_key(self):
+        cache = EvalCache(16)
+        assert cache.probe(17) is None
+        cache.store(17, -35)
+        assert cache.probe(17) == -35
+        assert cache.probe(1) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_cache_is_direct_mapped(self):
+        cache = EvalCache(16)
+        cache.store(17, 10)
+        cache.store(33, 20)
+        assert cache.probe(17) is None
+        assert cache.probe(33) == 20
+        assert cache.size == 16
+
+    def test_clearing_cache(self):
+        cache = EvalCache(16)
+        cache.store(17, 10)
+        cache.probe(17)
+        cache.clear()
+        assert cache.probe(17) is None
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    @pytest.mark.parametrize('size', [0, 3, 100])
+    def test_creating_cache_raises_error_if_size_isnt_power_of_two(self, size):
+        with pytest.raises(EvaluationError, match=rf'Evaluation cache size must be a power of two, but got {size}.'):
+            EvalCache(size)
+
+    def test_search_reports_eval_cache_hits(self):
+        stats = search(Board.from_fen(), depth=4).stats
+        assert stats.eval_hits > 0
+        assert stats.eval_misses > 0
+        assert stats.eval_hit_rate == stats.eval_hits * 100 / (stats.eval_hits + stats.eval_misses)
@@ -0,0 +1,66 @@
+import pytest
+
+from errors import GameRecordError
+from objects.board import STARTING_FEN, Board
+from objects.game import GameRecord
+from objects.move import Move
+from objects.notation import parse_san, parse_uci
+
+
+def get_record(sans: list[str]) -> GameRecord:
+    record = GameRecord()
+    board = record.get_board()
+    for san in sans:
+        move = parse_san(board, san)
+        board.make_move(move)
+        record.append(move)
+    return record
+
+
+class TestGameRecord:
+    def test_creating_game_record(self):
+        record = GameRecord()
+        assert record.fen == STARTING_FEN
+        assert len(record) == 0
+        assert record.moves.typecode == 'H'
+
+    def test_game_record_stores_packed_moves(self):
+        record = get_record(['e4', 'e5', 'Nf3'])
+        assert len(record) == 3
+        assert record.moves.itemsize == 2
+        assert [str(move) for move in record] == ['e2e4', 'e7e5', 'g1f3']
+        assert isinstance(record[0], Move)
+        last_move = record.moves[-1]
+        assert record.pop() == last_move
+        assert len(record) == 2
+
+    def test_getting_board_replays_moves(self):
+        record = get_record(['e4', 'e5', 'Nf3', 'Nc6'])
+        assert record.get_board().get_fen() == 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3'
+        assert record.get_board(1).get_fen() == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+
+    def test_game_record_from_board_replays_made_moves(self):
+        board = Board.from_fen('8/4P2k/8/8/8/8/8/4K3 w - - 0 1')
+        for move in ('e7e8n', 'h7g6', 'e1e2'):
+            board.make_move(parse_uci(move))
+        record = GameRecord.from_board(board)
+        assert record.fen == '8/4P2k/8/8/8/8/8/4K3 w - - 0 1'
+        assert [str(move) for move in record] == ['e7e8n', 'h7g6', 'e1e2']
+        assert record.get_board().get_fen() == board.get_fen()
+
+    def test_game_record_from_board_raises_error_for_null_move(self):
+        board = Board.from_fen()
+        board.make_null_move()
+        with pytest.raises(GameRecordError, match=r'Cannot record the game, the board has a null move.'):
+            GameRecord.from_board(board)
+
+    def test_game_record_is_converted_to_bytes_and_back(self):
+        record = get_record(['d4', 'd5', 'c4', 'dxc4', 'e3'])
+        data = record.to_bytes()
+        assert len(data) == 6 + len(STARTING_FEN) + 2 * 5
+        assert GameRecord.from_bytes(data) == record
+
+    @pytest.mark.parametrize('data', [b'', b'\x05\x00', b'\x02\x00\x01\x00\x00\x00ab'])
+    def test_reading_game_record_raises_error_if_data_is_corrupted(self, data):
+        with pytest.raises(GameRecordError, match=r'Cannot read the game record'):
+            GameRecord.from_bytes(data)
@@ -0,0 +1,76 @@
+import pytest
+
+from engine.mate import MateSolver, MateStatus, solve_mate
+from errors import SearchError
+from objects.board import Board
+
+
+class TestMateSolver:
+    @pytest.mark.parametrize(
+        'fen, mate_in, first_move',
+        [
+            ('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1', 1, 'd1d8'),
+            ('r1bqkbnr/pppp1ppp/2n5/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 2 3', 1, 'h5f7'),
+            ('6k1/pp4p1/2p5/2bp4/8/P5Pb/1P3rrP/2BRRN1K b - - 0 1', 2, 'g2g1'),
+            ('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1', 3, 'f8c5'),
+        ],
+    )
+    def test_solver_finds_shortest_mate(self, fen, mate_in, first_move):
+        board = Board.from_fen(fen)
+        result = solve_mate(board, 3)
+        assert result.status == MateStatus.PROVEN
+        assert result.mate_in == mate_in
+        assert str(result.pv[0]) == first_move
+        assert len(result.pv) == 2 * mate_in - 1
+        assert board.get_fen() == fen
+
+    def test_pv_ends_in_checkmate(self):
+        board = Board.from_fen('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1')
+        for move in solve_mate(board, 3).pv:
+            board.make_move(move)
+        assert board.is_in_checkmate()
+
+    def test_solver_disproves_mate(self):
+        result = solve_mate(Board.from_fen('kr6/pp6/8/8/8/8/5PPP/2Q3K1 w - - 0 1'), 3)
+        assert result.status == MateStatus.DISPROVEN
+        assert result.mate_in is None
+
+    def test_checkmated_color_has_no_mate(self):
+        result = solve_mate(Board.from_fen('3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 1 1'), 2)
+        assert result.status == MateStatus.DISPROVEN
+
+    def test_solver_gives_up_when_node_budget_runs_out(self):
+        result = solve_mate(Board.from_fen('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1'), 3, 10)
+        assert result.status == MateStatus.UNKNOWN
+        assert result.nodes == 11
+
+    def test_table_is_kept_between_solves(self):
+        board = Board.from_fen('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1')
+        solver = MateSolver()
+        first = solver.solve(board, 3)
+        second = solver.solve(board, 3)
+        assert second.pv == first.pv
+        assert second.nodes < first.nodes
+
+    def test_table_is_cleared_when_it_exceeds_its_size(self):
+        board = Board.from_fen('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1')
+        solver = MateSolver(max_table_size=10)
+        first = solver.solve(board, 3)
+        second = solver.solve(board, 3)
+        assert second == first
+
+    def test_pv_without_proven_check_in_table_ends(self):
+        board = Board.from_fen('r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R b kq - 0 1')
+        solver = MateSolver()
+        solver.solve(board, 3)
+        solver.clear()
+        assert solver._get_pv(board, 3) == []
+
+    @pytest.mark.parametrize('max_moves, max_nodes, message', [(0, 1, 'Mate length'), (1, 0, 'Node budget')])
+    def test_invalid_limits_raise_error(self, max_moves, max_nodes, message):
+        with pytest.raises(SearchError, match=message):
+            solve_mate(Board.from_fen(), max_moves, max_nodes)
+
+    def test_invalid_table_size_raises_error(self):
+        with pytest.raises(SearchError, match='Table size'):
+            MateSolver(max_table_size=0)
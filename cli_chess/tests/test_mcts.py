@@ -0,0 +1,56 @@
+import pytest
+
+from engine.mcts import MCTSSearcher, playout
+from errors import SearchError
+from objects.board import STARTING_FEN, Board
+
+MATE_IN_ONE_FEN = '6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1'
+
+
+class TestPlayout:
+    def test_playout_of_checkmated_color_is_loss(self):
+        assert playout('3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 1 1', 0) == 0.0
+
+    def test_playout_of_stalemate_is_draw(self):
+        assert playout('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', 0) == 0.5
+
+    def test_playout_is_repeated_by_seed(self):
+        results = {playout(STARTING_FEN, 7) for _ in range(3)}
+        assert len(results) == 1
+        assert 0.0 <= results.pop() <= 1.0
+
+
+class TestMCTSSearcher:
+    def test_creating_searcher_raises_error_if_worker_count_is_negative(self):
+        with pytest.raises(SearchError, match=r'Worker count must be non-negative, but got -1.'):
+            MCTSSearcher(-1)
+
+    def test_search_raises_error_if_limit_isnt_positive(self):
+        with pytest.raises(SearchError, match=r'Search playouts must be positive, but got 0.'):
+            MCTSSearcher(0).search(Board.from_fen(), playouts=0)
+
+    def test_search_finds_mate_in_one(self):
+        board = Board.from_fen(MATE_IN_ONE_FEN)
+        result = MCTSSearcher(0, seed=1).search(board, playouts=300)
+        assert str(result.best_move) == 'd1d8'
+        assert result.win_rate == 1.0
+        assert board.get_fen() == MATE_IN_ONE_FEN
+
+    def test_search_counts_playouts(self):
+        result = MCTSSearcher(0, batch_size=8, seed=1).search(Board.from_fen(), playouts=20)
+        assert result.stats.playouts == 20
+        assert result.stats.nodes == 21
+        assert result.stats.playouts_per_second > 0
+        assert result.best_move in Board.from_fen().get_legal_moves()
+
+    def test_search_of_finished_game_returns_no_move(self):
+        result = MCTSSearcher(0).search(Board.from_fen('3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 1 1'), playouts=10)
+        assert result.best_move is None
+        assert result.stats.playouts == 0
+
+    def test_playouts_run_in_worker_processes(self):
+        board = Board.from_fen(MATE_IN_ONE_FEN)
+        with MCTSSearcher(1, batch_size=16, seed=1) as searcher:
+            result = searcher.search(board, playouts=300)
+        assert str(result.best_move) == 'd1d8'
+        assert result.stats.playouts == 300
@@ -0,0 +1,46 @@
+import pickle
+
+import pytest
+
+from objects.enums import PieceType
+from objects.move import Move, decode_move, encode_move
+from objects.position import Position
+
+
+class TestMove:
+    def test_move_is_packed_into_16_bit_integer(self):
+        move = Move(Position(4, 1), Position(4, 3))
+        assert isinstance(move, int)
+        assert move == 12 | 28 << 6
+        assert 0 <= Move(Position(7, 7), Position(7, 7), PieceType.QUEEN) < 2**16
+
+    @pytest.mark.parametrize(
+        'start,end,promotion',
+        [(Position(4, 1), Position(4, 3), None), (Position(0, 6), Position(1, 7), PieceType.KNIGHT)],
+    )
+    def test_move_properties(self, start, end, promotion):
+        move = Move(start, end, promotion)
+        assert move.start == start
+        assert move.end == end
+        assert move.promotion == promotion
+
+    def test_encoding_and_decoding_move(self):
+        move = encode_move(52, 60, PieceType.QUEEN)
+        assert decode_move(move) == (52, 60, PieceType.QUEEN)
+        assert decode_move(encode_move(12, 28)) == (12, 28, None)
+        assert Move.from_int(move) == Move(Position(4, 6), Position(4, 7), PieceType.QUEEN)
+
+    def test_moves_are_compared_as_integers(self):
+        move = Move(Position(4, 1), Position(4, 3))
+        assert move == Move.from_int(int(move))
+        assert move != Move(Position(4, 1), Position(4, 2))
+        assert hash(move) == hash(int(move))
+
+    def test_move_str_is_uci_notation(self):
+        assert str(Move(Position(4, 6), Position(4, 7), PieceType.ROOK)) == 'e7e8r'
+        assert repr(Move(Position(4, 1), Position(4, 3))) == '<Move(e2e4)>'
+
+    def test_move_is_pickled(self):
+        move = Move(Position(4, 6), Position(4, 7), PieceType.QUEEN)
+        assert pickle.loads(pickle.dumps(move)) == move
+        assert isinstance(pickle.loads(pickle.dumps(move)), Move)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from engine.evaluation import EvalCache, Evaluator
+from engine.nnue import FEATURE_COUNT, NNUEEvaluator, NNUEWeights, get_feature_index
+from engine.search import Searcher
+from engine.transposition import TranspositionTable
+from errors import EvaluationError
+from objects.board import STARTING_FEN, Board
+from objects.enums import Color, PieceType
+from objects.notation import parse_uci
+
+
+@pytest.fixture(scope='module')
+def weights() -> NNUEWeights:
+    return NNUEWeights.random(hidden_size=16, layer_size=8)
+
+
+def walk(board: Board, evaluator: NNUEEvaluator, weights: NNUEWeights, depth: int):
+    """
+    Checks that accumulators updated by moves equal accumulators computed from scratch.
+    """
+    fresh_evaluator = NNUEEvaluator(board, weights)
+    fresh_evaluator.close()
+    for accumulator, fresh_accumulator in zip(evaluator.accumulators, fresh_evaluator.accumulators):
+        assert np.array_equal(accumulator, fresh_accumulator)
+    assert evaluator.evaluate() == fresh_evaluator.evaluate()
+    if depth == 0:
+        return
+    for move in board.get_legal_moves():
+        board.make_move(move)
+        walk(board, evaluator, weights, depth - 1)
+        board.unmake_move()
+
+
+class TestNNUEWeights:
+    def test_saved_weights_are_loaded_memory_mapped(self, weights, tmp_path):
+        weights.save(tmp_path)
+        loaded_weights = NNUEWeights.load(tmp_path)
+        assert all(isinstance(array, np.memmap) for array in loaded_weights)
+        assert all(np.array_equal(array, loaded_array) for array, loaded_array in zip(weights, loaded_weights))
+
+    def test_loading_raises_error_if_file_is_missing(self, tmp_path):
+        with pytest.raises(EvaluationError, match=r'Cannot load NNUE weights from'):
+            NNUEWeights.load(tmp_path)
+
+    def test_loading_raises_error_if_weights_dont_match(self, weights, tmp_path):
+        weights._replace(hidden_bias=np.zeros(3, dtype=np.int32)).save(tmp_path)
+        with pytest.raises(EvaluationError, match=r'NNUE weights hidden_weights must have shape \(32, 3\)'):
+            NNUEWeights.load(tmp_path)
+
+    def test_loading_raises_error_if_dtype_is_wrong(self, weights, tmp_path):
+        weights._replace(feature_weights=weights.feature_weights.astype(np.float32)).save(tmp_path)
+        with pytest.raises(EvaluationError, match=r'NNUE weights feature_weights must be int16, but got float32.'):
+            NNUEWeights.load(tmp_path)
+
+
+class TestNNUEEvaluator:
+    def test_feature_index_is_mirrored_for_black(self):
+        assert get_feature_index(Color.WHITE, Color.WHITE, PieceType.PAWN, 8) == 8
+        assert get_feature_index(Color.BLACK, Color.BLACK, PieceType.PAWN, 48) == 8
+        assert get_feature_index(Color.BLACK, Color.WHITE, PieceType.KING, 4) == FEATURE_COUNT - 4
+
+    @pytest.mark.parametrize(
+        'fen',
+        [
+            STARTING_FEN,
+            'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+            'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+        ],
+    )
+    def test_accumulators_are_updated_by_made_and_unmade_moves(self, weights, fen):
+        board = Board.from_fen(fen)
+        walk(board, NNUEEvaluator(board, weights), weights, 2)
+
+    def test_accumulators_are_int16(self, weights):
+        evaluator = NNUEEvaluator(Board.from_fen(), weights)
+        assert all(accumulator.dtype == np.int16 for accumulator in evaluator.accumulators)
+
+    def test_mirrored_positions_have_equal_scores(self, weights):
+        board = Board.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        mirrored_board = Board.from_fen('rnbqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 2 3')
+        assert NNUEEvaluator(board, weights).evaluate() == NNUEEvaluator(mirrored_board, weights).evaluate()
+
+    def test_evaluator_looks_up_scores_in_eval_cache(self, weights):
+        cache = EvalCache(16)
+        evaluator = NNUEEvaluator(Board.from_fen(), weights, cache)
+        score = evaluator.evaluate()
+        assert evaluator.evaluate() == score
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_eval_cache_shared_with_classical_evaluator_keeps_scores_apart(self, weights):
+        board = Board.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        cache = EvalCache(16)
+        classical_score = Evaluator(board, eval_cache=cache).evaluate()
+        nnue_score = NNUEEvaluator(board, weights, cache).evaluate()
+        assert nnue_score == NNUEEvaluator(board, weights).evaluate() != classical_score
+        assert Evaluator(board, eval_cache=cache).evaluate() == classical_score
+
+    def test_closed_evaluator_isnt_updated(self, weights):
+        board = Board.from_fen()
+        evaluator = NNUEEvaluator(board, weights)
+        accumulators = [accumulator.copy() for accumulator in evaluator.accumulators]
+        evaluator.close()
+        board.make_move(parse_uci('e2e4'))
+        assert all(np.array_equal(a, b) for a, b in zip(evaluator.accumulators, accumulators))
+
+    def test_searcher_evaluates_by_network(self, weights):
+        board = Board.from_fen()
+        result = Searcher(board, TranspositionTable(1), nnue=weights).search(3)
+        assert result.best_move in board.get_legal_moves()
+        assert result.stats.depth == 3
+        assert board.get_fen() == STARTING_FEN
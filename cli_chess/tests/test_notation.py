@@ -0,0 +1,103 @@
+import pytest
+
+from errors import AmbiguousMoveError, IllegalMoveError, InvalidNotationError
+from objects.board import Board
+from objects.enums import PieceType
+from objects.move import Move
+from objects.notation import move_to_san, move_to_uci, parse_san, parse_uci
+from objects.position import Position
+
+
+def get_move(uci: str) -> Move:
+    return parse_uci(uci)
+
+
+class TestUciNotation:
+    @pytest.mark.parametrize(
+        'uci,move',
+        [
+            ('e2e4', Move(Position(4, 1), Position(4, 3))),
+            ('e1g1', Move(Position(4, 0), Position(6, 0))),
+            ('a7a8q', Move(Position(0, 6), Position(0, 7), PieceType.QUEEN)),
+            ('h2h1n', Move(Position(7, 1), Position(7, 0), PieceType.KNIGHT)),
+        ],
+    )
+    def test_parsing_and_formatting_uci(self, uci, move):
+        assert parse_uci(uci) == move
+        assert move_to_uci(move) == uci
+
+    @pytest.mark.parametrize('uci', ['', 'e2', 'e2e9', 'i2i4', 'e7e8k', 'E2E4'])
+    def test_parsing_uci_raises_error_if_notation_is_invalid(self, uci):
+        with pytest.raises(InvalidNotationError, match=rf'"{uci}" is not a valid UCI move.'):
+            parse_uci(uci)
+
+
+class TestSanNotation:
+    @pytest.mark.parametrize(
+        'fen,san,uci',
+        [
+            ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 'e4', 'e2e4'),
+            ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 'Nf3', 'g1f3'),
+            ('rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2', 'exd5', 'e4d5'),
+            ('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3', 'Nxe5', 'f3e5'),
+            ('rnbqk2r/pppp1ppp/5n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4', 'O-O', 'e1g1'),
+            ('r3kbnr/pppqpppp/2n5/3p1b2/3P1B2/2N5/PPPQPPPP/R3KBNR b KQkq - 6 5', 'O-O-O', 'e8c8'),
+            ('rnbqkb1r/ppp2ppp/4pn2/3p4/3P4/5NP1/PPP1PPBP/RNBQK2R b KQkq - 1 4', 'Nbd7', 'b8d7'),
+            ('rnbqkb1r/ppp2ppp/4pn2/3p4/3P4/5NP1/PPP1PPBP/RNBQK2R b KQkq - 1 4', 'Nfd7', 'f6d7'),
+            ('7k/8/8/8/R7/8/8/R6K w - - 0 1', 'R1a3', 'a1a3'),
+            ('6k1/8/8/8/8/8/8/Q1Q1K3 w - - 0 1', 'Qab2', 'a1b2'),
+            ('6k1/8/8/8/8/Q1Q5/8/Q3K3 w - - 0 1', 'Q1b2', 'a1b2'),
+            ('6k1/8/8/8/8/Q7/8/Q1Q1K3 w - - 0 1', 'Qa1b2', 'a1b2'),
+            ('8/4P2k/8/8/8/8/8/4K3 w - - 0 1', 'e8=Q', 'e7e8q'),
+            ('3r3k/4P3/8/8/8/8/8/4K3 w - - 0 1', 'exd8=N', 'e7d8n'),
+            ('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3', 'exf6', 'e5f6'),
+        ],
+    )
+    def test_parsing_and_formatting_san(self, fen, san, uci):
+        board = Board.from_fen(fen)
+        move = parse_san(board, san)
+        if uci is not None:
+            assert move == get_move(uci)
+        assert move_to_san(board, move) == san
+
+    @pytest.mark.parametrize(
+        'san,expected', [('Nbc3', 'Nc3'), ('Nf3g5', 'Ng5'), ('0-0', 'O-O'), ('Nc3+', 'Nc3'), ('Nc3!?', 'Nc3')]
+    )
+    def test_parsing_not_canonical_san(self, san, expected):
+        board = Board.from_fen('rnbqk2r/pppp1ppp/5n2/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4')
+        assert move_to_san(board, parse_san(board, san)) == expected
+
+    def test_formatting_san_adds_check_and_checkmate_suffixes(self):
+        board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        assert move_to_san(board, get_move('a1a8')) == 'Ra8#'
+        assert move_to_san(board, get_move('a1a7')) == 'Ra7'
+        board = Board.from_fen('6k1/8/8/8/8/8/8/R5K1 w - - 0 1')
+        assert move_to_san(board, get_move('a1a8')) == 'Ra8+'
+
+    def test_parsing_san_raises_error_if_move_is_illegal(self):
+        board = Board.from_fen()
+        with pytest.raises(IllegalMoveError, match=r'"e5" is not a legal move in this position.'):
+            parse_san(board, 'e5')
+        with pytest.raises(IllegalMoveError, match=r'"O-O" is not a legal move in this position.'):
+            parse_san(board, 'O-O')
+
+    def test_parsing_san_raises_error_if_move_is_ambiguous(self):
+        board = Board.from_fen('7k/8/8/8/R7/8/8/R6K w - - 0 1')
+        with pytest.raises(AmbiguousMoveError, match=r'"Ra3" is ambiguous in this position.'):
+            parse_san(board, 'Ra3')
+
+    @pytest.mark.parametrize('san', ['', 'Xe4', 'e9', 'Nf'])
+    def test_parsing_san_raises_error_if_notation_is_invalid(self, san):
+        with pytest.raises(InvalidNotationError, match=rf'"{san}" is not a valid SAN move.'):
+            parse_san(Board.from_fen(), san)
+
+    def test_formatting_san_raises_error_if_move_is_illegal(self):
+        with pytest.raises(IllegalMoveError, match=r'"e2e5" is not a legal move in this position.'):
+            move_to_san(Board.from_fen(), get_move('e2e5'))
+
+    def test_san_of_position_is_cached_by_position_key(self):
+        board = Board.from_fen()
+        parse_san(board, 'e4')
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(Board, 'get_legal_moves', lambda self: pytest.fail('SAN table is not cached.'))
+            assert parse_san(board, 'Nc3') == get_move('b1c3')
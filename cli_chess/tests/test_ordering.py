@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+import pytest
+
+from engine.ordering import HISTORY_LIMIT, MoveOrderer
+from engine.search import search
+from objects.board import Board
+from objects.enums import Color
+from objects.move import Move
+from objects.notation import parse_uci
+
+
+@pytest.fixture()
+def orderer() -> MoveOrderer:
+    return MoveOrderer(8)
+
+
+def pick_moves(board: Board, orderer: MoveOrderer, ply: int = 0, hash_move: int = 0) -> list[str]:
+    return [str(Move.from_int(move)) for move in orderer.pick_moves(board, ply, hash_move)]
+
+
+class TestMoveOrderer:
+    def test_captures_are_ordered_by_mvv_lva(self, orderer):
+        board = Board.from_fen('4k3/8/8/1q1r4/2Pn4/8/8/Q3K3 w - - 0 1')
+        moves = pick_moves(board, orderer)
+        assert moves[:2] == ['c4b5', 'c4d5']
+        assert moves[-1] == 'a1d4'
+
+    def test_en_passant_and_queen_promotion_are_ordered_as_captures(self, orderer):
+        board = Board.from_fen('4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        assert pick_moves(board, orderer)[:2] == ['b7b8q', 'e5d6']
+
+    def test_hash_move_is_first(self, orderer):
+        board = Board.from_fen()
+        hash_move = parse_uci('g2g3')
+        assert pick_moves(board, orderer, hash_move=hash_move)[0] == 'g2g3'
+
+    def test_killers_are_ordered_after_captures_and_before_quiet_moves(self, orderer):
+        board = Board.from_fen('4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1')
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('e1f2'), 1, 3)
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('e1d2'), 1, 3)
+        assert orderer.get_killers(1) == [parse_uci('e1d2'), parse_uci('e1f2')]
+        assert pick_moves(board, orderer, ply=1)[:3] == ['e4d5', 'e1d2', 'e1f2']
+        assert pick_moves(board, orderer, ply=0)[0] == 'e4d5'
+
+    def test_losing_captures_and_underpromotions_are_last(self, orderer):
+        board = Board.from_fen('4k3/1P6/2p5/3p4/8/8/8/3QK3 w - - 0 1')
+        moves = pick_moves(board, orderer)
+        assert moves[0] == 'b7b8q'
+        assert moves[-4:] == ['b7b8r', 'b7b8b', 'b7b8n', 'd1d5']
+
+    def test_picked_moves_are_pseudo_legal_moves_without_duplicates(self, orderer):
+        board = Board.from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('e1g1'), 0, 1)
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('e2a6'), 0, 1)
+        moves = list(orderer.pick_moves(board, 0, parse_uci('d5e6')))
+        assert sorted(moves) == sorted(board.get_pseudo_legal_moves())
+
+    def test_moves_of_other_positions_are_skipped(self, orderer):
+        board = Board.from_fen()
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('e4e5'), 0, 1)
+        moves = list(orderer.pick_moves(board, 0, parse_uci('d1h5')))
+        assert sorted(moves) == sorted(board.get_pseudo_legal_moves())
+
+    def test_picked_captures_dont_lose_material(self, orderer):
+        board = Board.from_fen('4k3/1P6/2p5/3p4/4P3/8/8/3QK3 w - - 0 1')
+        assert [str(Move.from_int(move)) for move in orderer.pick_captures(board)] == ['b7b8q', 'e4d5']
+
+    def test_quiet_moves_are_generated_only_after_captures(self, orderer):
+        board = Board.from_fen('4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1')
+        with patch.object(board, 'get_pseudo_legal_quiet_moves', wraps=board.get_pseudo_legal_quiet_moves) as mock:
+            moves = orderer.pick_moves(board, 0)
+            assert next(moves) == parse_uci('e4d5')
+            mock.assert_not_called()
+            next(moves)
+            mock.assert_called_once()
+
+    def test_quiet_moves_are_ordered_by_history(self, orderer):
+        board = Board.from_fen()
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('b1c3'), 5, 2)
+        orderer.update_quiet_cutoff(Color.WHITE, parse_uci('g1f3'), 5, 3)
+        assert orderer.get_history(Color.WHITE, parse_uci('g1f3')) == 9
+        assert orderer.get_history(Color.BLACK, parse_uci('g1f3')) == 0
+        assert pick_moves(board, orderer)[:2] == ['g1f3', 'b1c3']
+
+    def test_history_is_halved_at_limit(self, orderer):
+        move = parse_uci('g1f3')
+        orderer.update_quiet_cutoff(Color.WHITE, move, 0, 1)
+        orderer.update_quiet_cutoff(Color.WHITE, move, 0, 1024)
+        assert orderer.get_history(Color.WHITE, move) == (1 + 1024 * 1024) // 2 < HISTORY_LIMIT
+
+    def test_new_search_ages_history_and_clears_killers(self, orderer):
+        move = parse_uci('g1f3')
+        orderer.update_quiet_cutoff(Color.WHITE, move, 0, 4)
+        orderer.new_search()
+        assert orderer.get_killers(0) == [0, 0]
+        assert orderer.get_history(Color.WHITE, move) == 8
+
+
+class TestSearchOrdering:
+    def test_search_counts_first_move_cutoffs(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        stats = search(Board.from_fen(fen), depth=3).stats
+        assert 0 < stats.first_move_cutoffs <= stats.cutoffs
+        assert stats.first_move_cutoff_rate == stats.first_move_cutoffs * 100 / stats.cutoffs
+        assert stats.first_move_cutoff_rate > 80
+
+    def test_first_move_cutoff_rate_is_zero_without_cutoffs(self):
+        stats = search(Board.from_fen('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1'), depth=2).stats
+        assert stats.cutoffs == 0
+        assert stats.first_move_cutoff_rate == 0.0
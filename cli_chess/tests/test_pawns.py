@@ -0,0 +1,78 @@
+import pytest
+
+from engine.pawns import (
+    DOUBLED_PAWN_PENALTY,
+    ISOLATED_PAWN_PENALTY,
+    PASSED_PAWN_EG_BONUSES,
+    PASSED_PAWN_MG_BONUSES,
+    PawnHashTable,
+    evaluate_pawns,
+)
+from engine.search import search
+from errors import EvaluationError
+from objects.board import Board
+from objects.notation import parse_uci
+
+
+class TestPawnEvaluation:
+    def test_starting_position_is_equal(self):
+        assert evaluate_pawns(Board.from_fen()) == (0, 0)
+
+    def test_doubled_pawns_are_penalized(self):
+        board = Board.from_fen('4k3/pp6/8/8/8/1P6/PP6/4K3 w - - 0 1')
+        assert evaluate_pawns(board) == (-DOUBLED_PAWN_PENALTY[0], -DOUBLED_PAWN_PENALTY[1])
+
+    def test_isolated_pawns_are_penalized(self):
+        board = Board.from_fen('4k3/p1p5/1p6/8/8/8/P1P5/4K3 w - - 0 1')
+        assert evaluate_pawns(board) == (-2 * ISOLATED_PAWN_PENALTY[0], -2 * ISOLATED_PAWN_PENALTY[1])
+
+    def test_passed_pawns_get_bonus_by_rank(self):
+        board = Board.from_fen('4k3/8/1P6/8/8/8/6p1/4K3 w - - 0 1')
+        # Both pawns are isolated, the black pawn is more advanced.
+        assert evaluate_pawns(board) == (
+            PASSED_PAWN_MG_BONUSES[5] - PASSED_PAWN_MG_BONUSES[6],
+            PASSED_PAWN_EG_BONUSES[5] - PASSED_PAWN_EG_BONUSES[6],
+        )
+
+    def test_pawn_blocked_by_adjacent_enemy_pawn_isnt_passed(self):
+        board = Board.from_fen('4k3/8/p7/8/1P6/8/8/4K3 w - - 0 1')
+        assert evaluate_pawns(board) == (0, 0)
+
+
+class TestPawnHashTable:
+    def test_table_caches_pawn_scores_by_pawn_key(self):
+        table = PawnHashTable(16)
+        board = Board.from_fen('4k3/pp6/8/8/8/1P6/PP6/4K3 w - - 0 1')
+        assert table.evaluate(board) == evaluate_pawns(board)
+        board.make_move(parse_uci('e1d1'))
+        assert table.evaluate(board) == evaluate_pawns(board)
+        assert (table.probes, table.hits, table.hit_rate) == (2, 1, 50.0)
+
+    def test_table_replaces_entry_of_other_pawn_structure(self):
+        table = PawnHashTable(1)
+        board = Board.from_fen()
+        table.evaluate(board)
+        board.make_move(parse_uci('e2e4'))
+        assert table.evaluate(board) == evaluate_pawns(board)
+        board.unmake_move()
+        table.evaluate(board)
+        assert table.hits == 0
+
+    def test_clearing_table(self):
+        table = PawnHashTable(16)
+        board = Board.from_fen()
+        table.evaluate(board)
+        table.clear()
+        assert (table.probes, table.hits, table.hit_rate) == (0, 0, 0.0)
+        table.evaluate(board)
+        assert table.hits == 0
+
+    @pytest.mark.parametrize('size', [0, 3, 100])
+    def test_creating_table_raises_error_if_size_isnt_power_of_two(self, size):
+        with pytest.raises(EvaluationError, match=rf'Pawn hash table size must be a power of two, but got {size}.'):
+            PawnHashTable(size)
+
+    def test_search_reports_pawn_hash_hits(self):
+        stats = search(Board.from_fen(), depth=4).stats
+        assert stats.pawn_probes > 0
+        assert stats.pawn_hit_rate > 50
@@ -0,0 +1,62 @@
+from objects.board import Board
+from objects.notation import parse_san
+from objects.pgn import PgnGame, read_pgn
+
+PGN = """[Event "Test"]
+[White "A \\"Quoted\\" Name"]
+[Result "1-0"]
+
+1. e4 {best by test} e5 2. Nf3 (2. f4 exf4) Nc6 $1 3. Bb5 ; Ruy Lopez
+3... a6 1-0
+
+[Event "Second"]
+[Result "*"]
+[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+
+1.e3 Kd7 *
+"""
+
+
+class TestReadPgn:
+    def test_reads_games_with_tags(self):
+        games = list(read_pgn(PGN.splitlines()))
+
+        assert len(games) == 2
+        assert games[0].tags['Event'] == 'Test'
+        assert games[0].tags['White'] == 'A "Quoted" Name'
+        assert games[1].tags['FEN'] == '4k3/8/8/8/8/8/4P3/4K3 w - - 0 1'
+
+    def test_skips_comments_variations_and_glyphs(self):
+        game = next(read_pgn(PGN.splitlines()))
+
+        assert game.sans == ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6']
+        assert game.result == '1-0'
+
+    def test_reads_moves_with_attached_numbers(self):
+        game = list(read_pgn(PGN.splitlines()))[1]
+
+        assert game.sans == ['e3', 'Kd7']
+        assert game.result == '*'
+
+    def test_takes_result_from_tag_without_result_in_movetext(self):
+        game = next(read_pgn(['[Result "0-1"]', '', '1. f3 e5 2. g4 Qh4#']))
+
+        assert game.result == '0-1'
+        assert game.sans == ['f3', 'e5', 'g4', 'Qh4#']
+
+
+class TestPgnGame:
+    def test_get_record_plays_moves(self):
+        game = next(read_pgn(PGN.splitlines()))
+        record = game.get_record()
+        board = Board.from_fen()
+        for san in game.sans:
+            board.make_move(parse_san(board, san))
+
+        assert len(record) == 6
+        assert record.get_board().get_fen() == board.get_fen()
+
+    def test_get_record_starts_from_fen_tag(self):
+        game = PgnGame({'FEN': '4k3/8/8/8/8/8/4P3/4K3 w - - 0 1'}, ['e4'], '*')
+
+        assert game.get_record().fen == '4k3/8/8/8/8/8/4P3/4K3 w - - 0 1'
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from engine.ponder import PonderingSearcher
+from engine.timing import TimeManager
+from engine.transposition import TranspositionTable
+from objects.board import Board
+from objects.notation import parse_uci
+
+
+@pytest.fixture
+def searcher():
+    with PonderingSearcher(TranspositionTable(1)) as searcher:
+        yield searcher
+
+
+def get_board(*moves: str) -> Board:
+    board = Board.from_fen()
+    for move in moves:
+        board.make_move(parse_uci(move))
+    return board
+
+
+class TestPonderingSearcher:
+    def test_search_without_pondering(self, searcher):
+        result = searcher.search(get_board(), depth=2)
+
+        assert result.stats.depth == 2
+        assert result.best_move in get_board().get_legal_moves()
+        assert searcher.ponder_hits == searcher.ponder_misses == 0
+
+    def test_ponder_does_not_change_board(self, searcher):
+        board = get_board('e2e4')
+        fen = board.get_fen()
+
+        searcher.ponder(board, parse_uci('e7e5'))
+
+        assert searcher.is_pondering
+        assert board.get_fen() == fen
+
+    def test_ponder_hit_answers_at_once_after_long_pondering(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+        time.sleep(0.5)
+        board = get_board('e2e4', 'e7e5')
+
+        start_time = time.monotonic()
+        result = searcher.search(board, 0.3)
+
+        # A new search would take the movetime, the ponder search has been running since before the sleep.
+        assert time.monotonic() - start_time < 0.3
+        assert result.stats.elapsed >= 0.5
+        assert result.best_move in board.get_legal_moves()
+        assert searcher.ponder_hits == 1
+        assert not searcher.is_pondering
+
+    def test_ponder_hit_counts_pondering_time_of_time_manager(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+        time.sleep(0.3)
+        time_manager = TimeManager(0.1, 0.2)
+
+        start_time = time.monotonic()
+        result = searcher.search(get_board('e2e4', 'e7e5'), time_manager=time_manager)
+
+        assert time.monotonic() - start_time < time_manager.hard_limit
+        assert result.stats.elapsed >= 0.3
+        assert time_manager.start_time < start_time - 0.25
+
+    def test_ponder_hit_after_soft_limit_answers_at_once(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+        time.sleep(0.5)
+        time_manager = TimeManager(0.3, 3.0)
+
+        start_time = time.monotonic()
+        result = searcher.search(get_board('e2e4', 'e7e5'), time_manager=time_manager)
+
+        # Pondering is between the soft and the hard limit, the current iteration isn't waited for.
+        assert time.monotonic() - start_time < 0.3
+        assert result.stats.elapsed >= 0.5
+        assert result.best_move is not None
+
+    def test_ponder_hit_goes_on_until_movetime(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+
+        start_time = time.monotonic()
+        result = searcher.search(get_board('e2e4', 'e7e5'), 0.3)
+
+        assert 0.2 < time.monotonic() - start_time < 0.6
+        assert result.best_move is not None
+
+    def test_ponder_miss_searches_played_position(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+        time.sleep(0.1)
+        board = get_board('e2e4', 'c7c5')
+
+        result = searcher.search(board, depth=2)
+
+        assert result.best_move in board.get_legal_moves()
+        assert searcher.ponder_misses == 1
+        assert not searcher.is_pondering
+
+    def test_ponder_warms_transposition_table(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+        time.sleep(0.2)
+        searcher.stop()
+
+        assert searcher.tt.probe(get_board('e2e4', 'e7e5').key) is not None
+
+    def test_ponder_move_completing_repetition_keeps_game_history(self, searcher):
+        # Black is a rook up, but White draws by repeating the position after its first king move.
+        board = Board.from_fen('r5k1/8/8/8/8/8/8/6K1 w - - 0 1')
+        for move in ('g1h1', 'g8h8', 'h1g1'):
+            board.make_move(parse_uci(move))
+        searcher.ponder(board, parse_uci('h8g8'))
+        time.sleep(0.1)
+        board.make_move(parse_uci('h8g8'))
+
+        result = searcher.search(board, 0.2)
+
+        assert searcher.ponder_hits == 1
+        assert result.best_move == parse_uci('g1h1')
+        assert result.score == 0
+
+    def test_depth_limited_search_does_not_take_over_ponder_search(self, searcher):
+        searcher.ponder(get_board('e2e4'), parse_uci('e7e5'))
+
+        result = searcher.search(get_board('e2e4', 'e7e5'), depth=1)
+
+        assert result.stats.depth == 1
+        assert searcher.ponder_hits == 0
+
+    def test_stop_without_pondering(self, searcher):
+        searcher.stop()
+
+        assert not searcher.is_pondering
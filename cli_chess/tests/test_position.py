@@ -27,6 +27,25 @@ class TestPosition:
     def test_position_is_hashed(self):
         assert hash(Position(20, 30)) == hash((20, 30))
 
+    @pytest.mark.parametrize(
+        'index,pos,notation', [(0, Position(0, 0), 'a1'), (12, Position(4, 1), 'e2'), (63, Position(7, 7), 'h8')]
+    )
+    def test_position_index_and_notation(self, index, pos, notation):
+        assert pos.index == index
+        assert pos.notation == notation
+        assert Position.from_index(index) == pos
+        assert Position.from_notation(notation) == pos
+
+    @pytest.mark.parametrize('index', [-1, 64])
+    def test_getting_position_from_index_raises_error_if_index_is_out_of_board(self, index):
+        with pytest.raises(ValueError, match=rf'Expected 0 <= index < 64, but got index={index}.'):
+            Position.from_index(index)
+
+    @pytest.mark.parametrize('notation', ['', 'e', 'e9', 'i1', 'e22'])
+    def test_getting_position_from_notation_raises_error_if_notation_is_invalid(self, notation):
+        with pytest.raises(ValueError, match=r'Expected square in algebraic notation'):
+            Position.from_notation(notation)
+
     def test_position_is_iterable(self):
         x, y = Position(20, 30)
         assert x == 20
@@ -0,0 +1,262 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from engine.bench import count_nodes
+from engine.evaluation import evaluate
+from engine.search import MATE_SCORE, Searcher, SearchOptions, search, search_multipv
+from engine.transposition import TranspositionTable
+from errors import SearchError
+from objects.board import Board
+from objects.notation import parse_uci
+
+
+class TestSearch:
+    @pytest.mark.parametrize(
+        'fen,expected',
+        [
+            ('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1', 'd1d8'),
+            ('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 4 4', 'f3f7'),
+        ],
+    )
+    def test_search_finds_checkmate_in_one(self, fen, expected):
+        best_move, score, pv, _ = search(Board.from_fen(fen), depth=3)
+        assert str(best_move) == expected
+        assert score == MATE_SCORE - 1
+        assert [str(move) for move in pv] == [expected]
+
+    def test_search_finds_checkmate_in_two(self):
+        board = Board.from_fen('r5k1/5ppp/8/8/8/8/3R1PPP/3R2K1 w - - 0 1')
+        best_move, score, pv, _ = search(board, depth=4)
+        assert score == MATE_SCORE - 3
+        assert [str(move) for move in pv] == ['d2d8', 'a8d8', 'd1d8']
+
+    def test_search_captures_hanging_queen(self):
+        board = Board.from_fen('4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1')
+        best_move, score, _, _ = search(board, depth=2)
+        assert best_move == parse_uci('d2d5')
+        assert score > 0
+
+    def test_search_returns_no_move_if_there_are_no_legal_moves(self):
+        best_move, score, pv, stats = search(Board.from_fen('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1'), depth=2)
+        assert best_move is None
+        assert score == 0
+        assert pv == []
+
+    def test_search_restores_board(self):
+        board = Board.from_fen()
+        fen, key = board.get_fen(), board.key
+        search(board, depth=3)
+        search(board, nodes=100)
+        assert board.get_fen() == fen
+        assert board.key == key
+
+    def test_search_stops_by_depth(self):
+        _, _, pv, stats = search(Board.from_fen(), depth=2)
+        assert stats.depth == 2
+        assert len(pv) == 2
+
+    def test_search_stops_by_node_limit(self):
+        best_move, _, _, stats = search(Board.from_fen(), nodes=500)
+        assert stats.nodes == 500
+        assert best_move in Board.from_fen().get_legal_moves()
+
+    def test_search_stops_by_movetime(self):
+        start = time.monotonic()
+        best_move, _, _, _ = search(Board.from_fen(), movetime=0.1)
+        assert 0.1 <= time.monotonic() - start < 0.5
+        assert best_move is not None
+
+    @pytest.mark.parametrize('limit', ['depth', 'movetime', 'nodes'])
+    def test_search_raises_error_if_limit_is_not_positive(self, limit):
+        with pytest.raises(SearchError, match=rf'Search {limit} must be positive, but got 0.'):
+            search(Board.from_fen(), **{limit: 0})
+
+    def test_search_doesnt_capture_defended_pawn_by_queen(self):
+        board = Board.from_fen('4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1')
+        best_move, score, _, stats = search(board, depth=1)
+        assert best_move != parse_uci('d1d5')
+        assert score > 0
+        assert stats.qnodes > 0
+
+    def test_quiescence_search_resolves_exchange_at_horizon(self):
+        board = Board.from_fen('4k3/8/8/3r4/8/8/3R4/3RK3 w - - 0 1')
+        best_move, score, _, _ = search(board, depth=1)
+        assert best_move == parse_uci('d2d5')
+        board.make_move(parse_uci('d2d5'))
+        assert score == -evaluate(board)
+
+
+class TestSelectiveSearch:
+    @pytest.mark.parametrize(
+        'options',
+        [
+            SearchOptions(null_move=False, lmr=False, futility=False),
+            SearchOptions(null_move=True, lmr=False, futility=False),
+            SearchOptions(null_move=False, lmr=True, futility=False),
+            SearchOptions(null_move=False, lmr=False, futility=True),
+            SearchOptions(),
+        ],
+    )
+    def test_search_finds_checkmate_in_two_with_options(self, options):
+        board = Board.from_fen('r5k1/5ppp/8/8/8/8/3R1PPP/3R2K1 w - - 0 1')
+        _, score, pv, _ = search(board, depth=4, options=options)
+        assert score == MATE_SCORE - 3
+        assert [str(move) for move in pv] == ['d2d8', 'a8d8', 'd1d8']
+
+    @pytest.mark.parametrize(
+        'options,counter',
+        [
+            (SearchOptions(null_move=True, lmr=False, futility=False), 'null_move_cutoffs'),
+            (SearchOptions(null_move=False, lmr=True, futility=False), 'reductions'),
+            (SearchOptions(null_move=False, lmr=False, futility=True), 'futility_prunes'),
+        ],
+    )
+    def test_each_technique_searches_fewer_nodes(self, options, counter):
+        fen = 'r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8'
+        plain_stats = search(Board.from_fen(fen), depth=4, options=SearchOptions(False, False, False)).stats
+        stats = search(Board.from_fen(fen), depth=4, options=options).stats
+        assert stats.nodes < plain_stats.nodes
+        assert getattr(stats, counter) > 0
+        assert getattr(plain_stats, counter) == 0
+
+    def test_null_move_is_not_tried_with_only_pawns(self):
+        board = Board.from_fen('8/5k2/8/5p2/5P2/8/5K2/8 w - - 0 1')
+        stats = search(board, depth=6, options=SearchOptions(null_move=True, lmr=False, futility=False)).stats
+        assert stats.null_move_cutoffs == 0
+
+
+class TestPrincipalVariationSearch:
+    fen = 'r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8'
+    plain_options = SearchOptions(null_move=False, lmr=False, futility=False, pvs=False, aspiration_delta=0)
+
+    @pytest.mark.parametrize('fen', [fen, 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'])
+    def test_pvs_and_aspiration_windows_dont_change_score_of_full_search(self, fen):
+        plain_result = search(Board.from_fen(fen), depth=3, options=self.plain_options)
+        options = SearchOptions(null_move=False, lmr=False, futility=False, aspiration_delta=10, aspiration_growth=2)
+        result = search(Board.from_fen(fen), depth=3, options=options)
+        assert result.score == plain_result.score
+        assert result.stats.nodes <= plain_result.stats.nodes
+
+    def test_search_counts_pvs_researches(self):
+        fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+        assert search(Board.from_fen(fen), depth=4).stats.pvs_researches > 0
+        assert search(Board.from_fen(fen), depth=4, options=self.plain_options).stats.pvs_researches == 0
+
+    def test_search_widens_aspiration_window_after_failure(self):
+        # The score drops at the fifth iteration, out of the window around the score of the fourth one.
+        fen = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+        options = SearchOptions(null_move=False, lmr=False, futility=False, aspiration_delta=10, aspiration_growth=2)
+        best_move, score, _, stats = search(Board.from_fen(fen), depth=5, options=options)
+        assert stats.aspiration_researches > 0
+        assert best_move == parse_uci('b4f4')
+        assert score == search(Board.from_fen(fen), depth=5, options=self.plain_options).score
+
+    def test_search_uses_full_window_after_score_swing(self):
+        # The score of the opening swings by the tempo between iterations, more than the delta.
+        options = SearchOptions(aspiration_delta=10, aspiration_growth=2)
+        assert search(Board.from_fen(), depth=4, options=options).stats.aspiration_researches == 0
+
+    def test_aspiration_windows_save_nodes_on_bench_positions(self):
+        options = SearchOptions()
+        assert count_nodes(options, 4) < count_nodes(replace(options, aspiration_delta=0), 4)
+
+    def test_pv_is_sequence_of_legal_moves(self):
+        board = Board.from_fen(self.fen)
+        _, _, pv, stats = search(board, depth=5)
+        assert len(pv) >= stats.depth - 1
+        for move in pv:
+            assert move in board.get_legal_moves()
+            board.make_move(move)
+
+    @pytest.mark.parametrize(
+        'options,error',
+        [
+            ({'aspiration_delta': -1}, r'Aspiration delta must be non-negative, but got -1.'),
+            ({'aspiration_growth': 0}, r'Aspiration growth must be at least 1, but got 0.'),
+        ],
+    )
+    def test_options_raise_error_if_aspiration_policy_is_invalid(self, options, error):
+        with pytest.raises(SearchError, match=error):
+            SearchOptions(**options)
+
+
+class TestMultiPV:
+    fen = 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3'
+
+    def test_returns_distinct_moves_ranked_by_score(self):
+        lines = search_multipv(Board.from_fen(self.fen), 4, depth=3)
+        assert len(lines) == 4
+        assert len({line.move for line in lines}) == 4
+        assert [line.score for line in lines] == sorted((line.score for line in lines), reverse=True)
+        assert all(line.pv[0] == line.move for line in lines)
+
+    def test_first_line_is_best_move_of_search(self):
+        board = Board.from_fen(self.fen)
+        result = search(board, depth=3)
+        lines = search_multipv(board, 3, depth=3)
+        assert (lines[0].move, lines[0].score) == (result.best_move, result.score)
+
+    def test_returns_all_legal_moves_if_fewer(self):
+        board = Board.from_fen('7k/8/8/8/8/8/8/K7 w - - 0 1')
+        lines = search_multipv(board, 10, depth=2)
+        assert sorted(line.move for line in lines) == sorted(board.get_legal_moves())
+
+    def test_node_limit_is_shared_by_passes(self):
+        lines = search_multipv(Board.from_fen(self.fen), 20, nodes=2000)
+        assert 0 < len(lines) < 20
+
+    def test_passes_are_one_search_of_table(self):
+        tt = TranspositionTable(1)
+        age = tt.age
+        search_multipv(Board.from_fen(self.fen), 3, depth=2, tt=tt)
+        assert tt.age == age + 1
+
+    def test_raises_error_for_non_positive_multipv(self):
+        with pytest.raises(SearchError, match=r'Number of principal variations must be positive, but got 0.'):
+            search_multipv(Board.from_fen(self.fen), 0, depth=1)
+
+    def test_excluded_moves_are_not_searched_at_root(self):
+        board = Board.from_fen('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1')
+        result = Searcher(board, TranspositionTable(1), excluded_moves=[parse_uci('d1d8')]).search(3)
+        assert str(result.best_move) != 'd1d8'
+        assert result.score < MATE_SCORE - 10
+
+    def test_excluded_root_is_not_stored(self):
+        board = Board.from_fen('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1')
+        tt = TranspositionTable(1)
+        Searcher(board, tt, excluded_moves=[parse_uci('d1d8')]).search(3)
+        assert tt.probe(board.key) is None
+
+
+class TestSearchDraws:
+    fen = '7k/8/8/3q4/8/8/8/K7 w - - 0 1'
+
+    def test_repetition_is_draw(self):
+        board = Board.from_fen(self.fen)
+        for move in ('a1b1', 'd5d6', 'b1a1', 'd6d5'):
+            board.make_move(parse_uci(move))
+        best_move, score, _, _ = search(board, depth=3)
+        assert str(best_move) == 'a1b1'
+        assert score == 0
+
+    def test_repetition_is_not_draw_without_history(self):
+        _, score, _, _ = search(Board.from_fen(self.fen), depth=3)
+        assert score < -500
+
+    def test_fifty_move_rule_is_draw(self):
+        best_move, score, _, _ = search(Board.from_fen('k7/8/8/8/8/8/5q2/K7 w - - 99 80'), depth=3)
+        assert str(best_move) == 'a1b1'
+        assert score == 0
+
+    def test_checkmate_wins_over_fifty_move_rule(self):
+        best_move, score, _, _ = search(Board.from_fen('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 99 80'), depth=3)
+        assert str(best_move) == 'd1d8'
+        assert score == MATE_SCORE - 1
+
+    def test_search_does_not_take_checkmate_for_fifty_move_draw(self):
+        # The knight move makes the halfmove clock 99, the back-rank mate on the 100th halfmove isn't a draw.
+        best_move, score, _, _ = search(Board.from_fen('n6k/2p3pp/8/8/2B5/8/8/3R2K1 b - - 98 80'), depth=4)
+        assert str(best_move) != 'a8b6'
+        assert score < 0
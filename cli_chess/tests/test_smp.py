@@ -0,0 +1,71 @@
+import multiprocessing
+
+import pytest
+
+from engine.search import SearchOptions
+from engine.smp import LazySMPSearcher, _get_worker_options, _search_in_worker
+from engine.transposition import TranspositionTable
+from errors import SearchError
+from objects.board import Board
+from objects.game import GameRecord
+from objects.notation import parse_uci
+
+
+@pytest.fixture(scope='module')
+def smp_searcher():
+    with LazySMPSearcher(2, 1) as searcher:
+        yield searcher
+
+
+class TestLazySMPSearcher:
+    def test_creating_searcher_raises_error_if_worker_count_isnt_positive(self):
+        with pytest.raises(SearchError, match=r'Worker count must be at least 1, but got 0.'):
+            LazySMPSearcher(0)
+
+    def test_search_finds_mate_in_one(self, smp_searcher):
+        board = Board.from_fen('6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1')
+        result = smp_searcher.search(board, depth=3)
+        assert str(result.best_move) == 'd1d8'
+        assert board.get_fen() == '6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1'
+
+    def test_workers_share_transposition_table(self, smp_searcher):
+        board = Board.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        result = smp_searcher.search(board, depth=3, options=SearchOptions(aspiration_delta=0))
+        entry = smp_searcher.tt.probe(board.key)
+        assert entry is not None
+        assert entry.move == result.best_move
+        assert result.stats.depth >= 3
+
+    def test_workers_find_repetitions_of_game(self, smp_searcher):
+        # Black is a rook up, but White draws by repeating the position after its first king move.
+        board = Board.from_fen('r5k1/8/8/8/8/8/8/6K1 w - - 0 1')
+        for move in ('g1h1', 'g8h8', 'h1g1', 'h8g8'):
+            board.make_move(parse_uci(move))
+        result = smp_searcher.search(board, depth=2)
+        assert str(result.best_move) == 'g1h1'
+        assert result.score == 0
+
+    def test_only_main_worker_stops_other_workers(self, monkeypatch):
+        stop_event = multiprocessing.get_context('spawn').Event()
+        monkeypatch.setattr('engine.smp._worker_tt', TranspositionTable(1))
+        monkeypatch.setattr('engine.smp._worker_stop_event', stop_event)
+        _search_in_worker(GameRecord(), 2, None, None, SearchOptions(), 1, False)
+        assert not stop_event.is_set()
+        _search_in_worker(GameRecord(), 1, None, None, SearchOptions(), 1, True)
+        assert stop_event.is_set()
+
+    @pytest.mark.parametrize('aspiration_delta', [0, 50])
+    def test_helpers_differ_from_main_worker_by_depth_or_window(self, aspiration_delta):
+        options = SearchOptions(aspiration_delta=aspiration_delta)
+        settings = {(index % 2, _get_worker_options(options, index)) for index in range(4)}
+        assert len(settings) == 4
+        assert _get_worker_options(options, 0) == options
+
+    def test_search_is_stopped_by_movetime(self, smp_searcher):
+        result = smp_searcher.search(Board.from_fen(), movetime=0.5)
+        assert result.best_move in Board.from_fen().get_legal_moves()
+        assert result.stats.elapsed < 2.5
+
+    def test_search_raises_error_if_limit_isnt_positive(self, smp_searcher):
+        with pytest.raises(SearchError, match=r'Search depth must be positive, but got 0.'):
+            smp_searcher.search(Board.from_fen(), depth=0)
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from engine.search import MATE_SCORE, Searcher
+from engine.tablebase import (
+    ILLEGAL_VALUE,
+    Tablebase,
+    TablebaseEntry,
+    generate,
+    generate_table,
+    get_material_piece_types,
+    load_table,
+    write_table,
+)
+from engine.transposition import TranspositionTable
+from errors import TablebaseError
+from objects.board import Board
+from objects.enums import PieceType
+
+
+@pytest.fixture(scope='module')
+def tablebase_directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tablebases')
+    generate(directory, ['KPK'])
+    return directory
+
+
+@pytest.fixture(scope='module')
+def tablebase(tablebase_directory) -> Tablebase:
+    return Tablebase(tablebase_directory)
+
+
+def get_fen(name: str, index: int) -> str:
+    """
+    Returns the FEN of the position of the table index.
+    """
+    piece_types = get_material_piece_types(name)
+    squares = []
+    for _ in range(2 + len(piece_types)):
+        squares.append(index % 64)
+        index //= 64
+    squares.reverse()
+    symbols = ['K', 'k'] + [piece_type.symbol for piece_type in piece_types]
+    board = ['1'] * 64
+    for square, symbol in zip(squares, symbols):
+        board[square] = symbol
+    ranks = [''.join(board[rank * 8 : rank * 8 + 8]) for rank in range(7, -1, -1)]
+    return f'{"/".join(ranks)} {"wb"[index]} - - 0 1'
+
+
+class TestGeneration:
+    def test_materials_the_pawn_promotes_to_are_generated_first(self, tablebase_directory, tablebase):
+        assert sorted(path.name for path in tablebase_directory.iterdir()) == ['KPK.tb', 'KQK.tb', 'KRK.tb']
+        assert sorted(tablebase.materials) == ['KPK', 'KQK', 'KRK']
+
+    @pytest.mark.parametrize('name, longest_mate', [('KQK', 19), ('KRK', 31), ('KPK', 55)])
+    def test_longest_mates_have_known_length(self, tablebase_directory, name, longest_mate):
+        values = load_table(tablebase_directory / f'{name}.tb')[1]
+        assert values[: len(values) // 2].max() == longest_mate
+
+    def test_pawn_endgame_has_known_number_of_wins(self, tablebase_directory):
+        values = load_table(tablebase_directory / 'KPK.tb')[1]
+        white_values = values[: len(values) // 2]
+        assert (white_values > 0).sum() == 124_960
+        assert (white_values != ILLEGAL_VALUE).sum() == 163_328
+
+    def test_small_chunks_give_same_values(self, tablebase_directory, monkeypatch):
+        monkeypatch.setattr('engine.tablebase.CHUNK_SIZE', 1000)
+        values = generate_table('KRK')
+        assert np.array_equal(values, load_table(tablebase_directory / 'KRK.tb')[1])
+
+    @pytest.mark.parametrize('name', ['KQK', 'KPK'])
+    def test_values_agree_with_values_after_every_move(self, tablebase_directory, tablebase, name):
+        values = load_table(tablebase_directory / f'{name}.tb')[1]
+        rng = np.random.default_rng(0)
+        indexes = rng.choice(np.flatnonzero(values != ILLEGAL_VALUE), 200, replace=False)
+        for index in indexes:
+            board = Board.from_fen(get_fen(name, int(index)))
+            entry = tablebase.probe(board)
+            child_entries = []
+            for move in board.get_legal_moves():
+                board.make_move(move)
+                child_entry = tablebase.probe(board)
+                board.unmake_move()
+                # Captures and underpromotions lead to drawn materials out of the tablebase.
+                child_entries.append(child_entry or TablebaseEntry(0, 0))
+            if not child_entries:
+                expected_entry = TablebaseEntry(-1, 0) if board.is_in_check() else TablebaseEntry(0, 0)
+            elif any(child.wdl < 0 for child in child_entries):
+                expected_entry = TablebaseEntry(1, 1 + min(child.dtm for child in child_entries if child.wdl < 0))
+            elif all(child.wdl > 0 for child in child_entries):
+                expected_entry = TablebaseEntry(-1, 1 + max(child.dtm for child in child_entries))
+            else:
+                expected_entry = TablebaseEntry(0, 0)
+            assert entry == expected_entry, board.get_fen()
+
+    def test_loading_raises_error_if_file_isnt_tablebase(self, tmp_path):
+        path = tmp_path / 'KQK.tb'
+        path.write_bytes(b'not a tablebase')
+        with pytest.raises(TablebaseError, match=r'is not a tablebase file'):
+            load_table(path)
+
+    def test_loading_raises_error_if_file_is_truncated(self, tmp_path):
+        path = tmp_path / 'KQK.tb'
+        write_table(path, 'KQK', np.zeros(10, dtype=np.int8))
+        with pytest.raises(TablebaseError, match=r'must have 524288 positions, but has 10'):
+            load_table(path)
+
+    @pytest.mark.parametrize('name', ['KQ', 'QK', 'KXK', 'KKK'])
+    def test_unknown_material_raises_error(self, name):
+        with pytest.raises(TablebaseError, match=r'Unknown tablebase material'):
+            get_material_piece_types(name)
+
+    def test_material_piece_types(self):
+        assert get_material_piece_types('KBNK') == (PieceType.BISHOP, PieceType.KNIGHT)
+
+
+class TestTablebase:
+    @pytest.mark.parametrize(
+        'fen, entry',
+        [
+            ('6k1/8/6K1/8/8/8/8/Q7 w - - 0 1', TablebaseEntry(1, 1)),
+            ('Q5k1/8/6K1/8/8/8/8/8 b - - 1 1', TablebaseEntry(-1, 0)),
+            ('q7/8/8/8/8/6k1/8/6K1 b - - 0 1', TablebaseEntry(1, 1)),
+            ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', TablebaseEntry(0, 0)),
+            ('k7/8/1K6/P7/8/8/8/8 w - - 0 1', TablebaseEntry(0, 0)),
+            ('8/8/8/8/8/5k2/4p3/6K1 b - - 0 1', TablebaseEntry(1, 3)),
+        ],
+    )
+    def test_probing_position(self, tablebase, fen, entry):
+        assert tablebase.probe(Board.from_fen(fen)) == entry
+
+    @pytest.mark.parametrize(
+        'fen', ['4k3/8/8/8/8/8/8/R3K3 w Q - 0 1', '4k3/8/8/8/8/8/8/RR2K3 w - - 0 1', '4k3/8/8/8/8/8/8/B3K3 w - - 0 1']
+    )
+    def test_probing_position_out_of_tablebase_returns_none(self, tablebase, fen):
+        assert tablebase.probe(Board.from_fen(fen)) is None
+
+    def test_search_takes_scores_from_tablebase(self, tablebase):
+        board = Board.from_fen('8/8/8/4k3/8/8/8/R3K3 w - - 0 1')
+        result = Searcher(board, TranspositionTable(1), tablebase=tablebase).search(2)
+        assert result.stats.tb_hits > 0
+        assert result.score == MATE_SCORE - tablebase.probe(board).dtm
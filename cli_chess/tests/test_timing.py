@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from engine.search import Searcher
+from engine.timing import (
+    DEFAULT_MOVES_TO_GO,
+    HARD_LIMIT_FACTOR,
+    INCREMENT_SHARE,
+    MAX_TIME_SHARE,
+    MIN_MOVE_TIME,
+    MOVE_OVERHEAD,
+    STABILITY_FACTORS,
+    TimeManager,
+)
+from engine.transposition import TranspositionTable
+from errors import SearchError
+from objects.board import Board
+
+
+class TestTimeManager:
+    def test_from_clock_shares_out_remaining_time(self):
+        time_manager = TimeManager.from_clock(60.0)
+
+        assert time_manager.soft_limit == pytest.approx((60.0 - MOVE_OVERHEAD) / DEFAULT_MOVES_TO_GO)
+        assert time_manager.hard_limit == pytest.approx(time_manager.soft_limit * HARD_LIMIT_FACTOR)
+
+    def test_from_clock_adds_share_of_increment(self):
+        time_manager = TimeManager.from_clock(60.0, 2.0, 20)
+
+        assert time_manager.soft_limit == pytest.approx((60.0 - MOVE_OVERHEAD) / 20 + 2.0 * INCREMENT_SHARE)
+
+    def test_from_clock_keeps_hard_limit_within_share_of_remaining_time(self):
+        time_manager = TimeManager.from_clock(10.0, moves_to_go=1)
+
+        assert time_manager.hard_limit == pytest.approx((10.0 - MOVE_OVERHEAD) * MAX_TIME_SHARE)
+        assert time_manager.soft_limit == time_manager.hard_limit
+
+    def test_from_clock_gives_least_time_without_remaining_time(self):
+        time_manager = TimeManager.from_clock(0.0)
+
+        assert time_manager.soft_limit == time_manager.hard_limit == MIN_MOVE_TIME
+
+    def test_from_clock_raises_error_for_non_positive_moves_to_go(self):
+        with pytest.raises(SearchError):
+            TimeManager.from_clock(60.0, moves_to_go=0)
+
+    @pytest.mark.parametrize('soft_limit, hard_limit', [(0.0, 1.0), (2.0, 1.0)])
+    def test_raises_error_for_invalid_limits(self, soft_limit, hard_limit):
+        with pytest.raises(SearchError):
+            TimeManager(soft_limit, hard_limit)
+
+    def test_deadline_is_hard_limit_from_start(self):
+        time_manager = TimeManager(1.0, 2.0)
+
+        assert time_manager.deadline == time_manager.start_time + 2.0
+
+    def test_stable_best_move_shortens_soft_limit(self):
+        time_manager = TimeManager(1.0, 10.0)
+        limits = []
+        for _ in range(len(STABILITY_FACTORS) + 1):
+            time_manager.update(1)
+            limits.append(time_manager.get_soft_limit())
+
+        assert limits == [pytest.approx(factor) for factor in (*STABILITY_FACTORS, STABILITY_FACTORS[-1])]
+
+    def test_changed_best_move_resets_stability(self):
+        time_manager = TimeManager(1.0, 10.0)
+        time_manager.update(1)
+        time_manager.update(1)
+
+        time_manager.update(2)
+
+        assert time_manager.get_soft_limit() == pytest.approx(STABILITY_FACTORS[0])
+
+    def test_update_stops_after_soft_limit(self):
+        time_manager = TimeManager(1.0, 10.0)
+
+        assert not time_manager.update(1)
+        time_manager.start_time -= STABILITY_FACTORS[1]
+        assert time_manager.update(1)
+
+    def test_start_resets_time_and_stability(self):
+        time_manager = TimeManager(1.0, 10.0)
+        time_manager.update(1)
+        time_manager.start_time -= 5.0
+
+        time_manager.start()
+
+        assert time_manager.elapsed < 1.0
+        assert time_manager.get_soft_limit() == pytest.approx(STABILITY_FACTORS[0])
+
+
+class TestSearcherTimeManager:
+    def test_search_stops_after_soft_limit(self):
+        searcher = Searcher(Board.from_fen(), TranspositionTable(1), time_manager=TimeManager(1e-6, 10.0))
+
+        result = searcher.search(20)
+
+        assert result.stats.depth == 1
+        assert result.best_move is not None
+
+    def test_hard_limit_is_deadline(self):
+        time_manager = TimeManager(0.2, 0.2)
+        start_time = time.monotonic()
+
+        result = Searcher(Board.from_fen(), TranspositionTable(1), time_manager=time_manager).search(20)
+
+        assert time.monotonic() - start_time < 0.5
+        assert result.best_move is not None
+
+    def test_time_manager_keeps_earlier_deadline(self):
+        deadline = time.monotonic() + 0.1
+        searcher = Searcher(
+            Board.from_fen(), TranspositionTable(1), deadline=deadline, time_manager=TimeManager(1.0, 2.0)
+        )
+
+        assert searcher.deadline == deadline
@@ -0,0 +1,124 @@
+import pytest
+
+from engine.search import MATE_SCORE, search
+from engine.transposition import (
+    BOUND_EXACT,
+    BOUND_LOWER,
+    BOUND_UPPER,
+    BUCKET_SIZE,
+    BUCKET_WORDS,
+    SharedTranspositionTable,
+    TranspositionEntry,
+    TranspositionTable,
+)
+from errors import TranspositionTableError
+from objects.board import Board
+
+
+@pytest.fixture()
+def tt() -> TranspositionTable:
+    """
+    Transposition table of 4 buckets
+    """
+    return TranspositionTable(4 * BUCKET_SIZE / 1024 / 1024)
+
+
+class TestTranspositionTable:
+    def test_table_size_is_power_of_two_buckets_within_budget(self):
+        assert TranspositionTable(1).size == 1024 * 1024
+        assert TranspositionTable(1.5).size == 1024 * 1024
+        assert TranspositionTable(1 / 1024).size == 1024
+
+    def test_creating_table_raises_error_if_size_is_too_small(self):
+        with pytest.raises(TranspositionTableError, match=r'Transposition table size must be at least'):
+            TranspositionTable(0)
+
+    @pytest.mark.parametrize('score', [0, 150, -150, MATE_SCORE, -MATE_SCORE])
+    @pytest.mark.parametrize('bound', [BOUND_EXACT, BOUND_LOWER, BOUND_UPPER])
+    def test_storing_and_probing_entry(self, tt, score, bound):
+        key = 0xDEADBEEF12345678
+        tt.store(key, 7, score, bound, 0x1234)
+        assert tt.probe(key) == TranspositionEntry(0x1234, score, 7, bound)
+        assert tt.probe(key ^ 1 << 40) is None
+        assert (tt.probes, tt.hits) == (2, 1)
+
+    def test_torn_entry_fails_verification(self, tt):
+        tt.store(1, 4, 10, BOUND_EXACT, 1)
+        # Another process overwrites the data word only.
+        tt._table[BUCKET_WORDS + 1] ^= 1 << 20
+        assert tt.probe(1) is None
+
+    def test_deeper_entry_is_kept_and_shallower_goes_to_always_replace_entry(self, tt):
+        tt.store(1, 8, 10, BOUND_EXACT, 1)
+        tt.store(1 + 4, 2, 20, BOUND_EXACT, 2)
+        tt.store(1 + 8, 3, 30, BOUND_EXACT, 3)
+        assert tt.probe(1) == TranspositionEntry(1, 10, 8, BOUND_EXACT)
+        assert tt.probe(1 + 4) is None
+        assert tt.probe(1 + 8) == TranspositionEntry(3, 30, 3, BOUND_EXACT)
+
+    def test_deeper_or_equal_entry_replaces_depth_preferred_entry(self, tt):
+        tt.store(1, 4, 10, BOUND_EXACT, 1)
+        tt.store(1 + 4, 4, 20, BOUND_EXACT, 2)
+        assert tt.probe(1 + 4) == TranspositionEntry(2, 20, 4, BOUND_EXACT)
+        # The replaced entry of the same bucket isn't moved to the always-replace entry.
+        assert tt.probe(1) is None
+
+    def test_entry_of_previous_search_is_replaced(self, tt):
+        tt.store(1, 8, 10, BOUND_EXACT, 1)
+        tt.new_search()
+        tt.store(1 + 4, 1, 20, BOUND_EXACT, 2)
+        assert tt.probe(1 + 4) == TranspositionEntry(2, 20, 1, BOUND_EXACT)
+        assert tt.probe(1) is None
+
+    def test_storing_without_move_keeps_move_of_position(self, tt):
+        tt.store(1, 4, 10, BOUND_EXACT, 0x777)
+        tt.store(1, 5, -10, BOUND_UPPER)
+        assert tt.probe(1) == TranspositionEntry(0x777, -10, 5, BOUND_UPPER)
+
+    def test_clearing_table(self, tt):
+        tt.store(1, 4, 10, BOUND_EXACT, 1)
+        tt.new_search()
+        tt.clear()
+        assert tt.probe(1) is None
+        assert tt.age == 0
+
+    def test_hashfull(self, tt):
+        assert tt.get_hashfull() == 0
+        for key in range(4):
+            tt.store(key, 1, 0, BOUND_EXACT)
+        assert tt.get_hashfull() == 500
+        tt.new_search()
+        assert tt.get_hashfull() == 0
+
+    def test_memory_of_table_stays_flat(self, tt):
+        size = tt.size
+        search(Board.from_fen(), depth=3, tt=tt)
+        assert tt.size == size
+
+    def test_search_reuses_table_between_searches(self):
+        tt = TranspositionTable(1)
+        board = Board.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3')
+        first = search(board, depth=4, tt=tt)
+        second = search(board, depth=4, tt=tt)
+        assert second.stats.nodes < first.stats.nodes
+        assert second.best_move == first.best_move
+
+
+class TestSharedTranspositionTable:
+    def test_entries_are_shared_between_attached_tables(self):
+        tt = SharedTranspositionTable(1 / 1024)
+        try:
+            attached_tt = SharedTranspositionTable(tt.size_mb, name=tt.name)
+            attached_tt.store(1, 4, 10, BOUND_EXACT, 1)
+            assert tt.probe(1) == TranspositionEntry(1, 10, 4, BOUND_EXACT)
+            attached_tt.close()
+        finally:
+            tt.unlink()
+
+    def test_attaching_raises_error_if_memory_is_too_small(self):
+        tt = SharedTranspositionTable(1 / 1024)
+        try:
+            with pytest.raises(TranspositionTableError, match=r'is smaller than 1048576 bytes'):
+                SharedTranspositionTable(1, name=tt.name)
+        finally:
+            tt.unlink()
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from engine.bench import BENCH_FENS
+from engine.evaluation import evaluate
+from engine.tuning import (
+    PARAMETER_COUNT,
+    SQUARE_PARAMETER_COUNT,
+    center_square_parameters,
+    evaluate_features,
+    extract_features,
+    find_scaling_constant,
+    format_parameters,
+    get_gradient,
+    get_initial_parameters,
+    get_loss,
+    load_features,
+    parse_labeled_position,
+    tune,
+)
+from errors import EvaluationError
+from objects.board import Board
+from objects.enums import Color
+
+LABELED_POSITIONS = (
+    ('4k3/8/8/8/8/8/8/QQ2K3 w - - 0 1', 1.0),
+    ('4k3/8/8/8/8/8/8/RR2K3 b - - 0 1', 1.0),
+    ('qq2k3/8/8/8/8/8/8/4K3 w - - 0 1', 0.0),
+    ('rr2k3/8/8/8/8/8/8/4K3 b - - 0 1', 0.0),
+    ('4k3/pppp4/8/8/8/8/PPPP4/4K3 w - - 0 1', 0.5),
+)
+
+
+@pytest.fixture
+def labeled_file(tmp_path):
+    path = tmp_path / 'positions.txt'
+    path.write_text(''.join(f'{fen} {result}\n' for fen, result in LABELED_POSITIONS))
+    return path
+
+
+class TestLabeledPositions:
+    @pytest.mark.parametrize(
+        'line, result',
+        [
+            (f'{BENCH_FENS[0]} 1-0', 1.0),
+            (f'{BENCH_FENS[0]} "0-1";', 0.0),
+            (f'{BENCH_FENS[0]} [1/2-1/2]', 0.5),
+            (f'{BENCH_FENS[0]} 0.25\n', 0.25),
+        ],
+    )
+    def test_line_is_parsed_to_fen_and_result(self, line, result):
+        assert parse_labeled_position(line) == (BENCH_FENS[0], result)
+
+    @pytest.mark.parametrize('line', [f'{BENCH_FENS[0]} 2-0', f'{BENCH_FENS[0]} 1.5', '1-0'])
+    def test_invalid_line_raises_error(self, line):
+        with pytest.raises(EvaluationError, match=r'Cannot parse the labeled position'):
+            parse_labeled_position(line)
+
+
+class TestFeatures:
+    def test_initial_parameters_give_scores_of_evaluation(self):
+        features = extract_features(BENCH_FENS, np.full(len(BENCH_FENS), 0.5))
+        scores = evaluate_features(features, get_initial_parameters())
+        for fen, score in zip(BENCH_FENS, scores):
+            board = Board.from_fen(fen)
+            expected_score = evaluate(board) if board.moving_pieces_color == Color.WHITE else -evaluate(board)
+            assert score == pytest.approx(expected_score, abs=1)
+
+    def test_features_are_cached_to_disk(self, labeled_file, monkeypatch):
+        features = load_features(labeled_file)
+        assert (labeled_file.parent / 'positions.txt.features.npz').exists()
+
+        def fail(*args):
+            raise AssertionError('Features were extracted again.')
+
+        monkeypatch.setattr('engine.tuning.extract_features', fail)
+        cached_features = load_features(labeled_file)
+        assert all(np.array_equal(array, cached_array) for array, cached_array in zip(features, cached_features))
+
+    def test_features_are_extracted_again_if_file_changes(self, labeled_file):
+        load_features(labeled_file)
+        labeled_file.write_text(f'{BENCH_FENS[0]} 1/2-1/2\n')
+        features = load_features(labeled_file)
+        assert features.position_count == 1
+        assert features.results.tolist() == [0.5]
+
+
+class TestTuning:
+    def test_gradient_matches_finite_differences(self, labeled_file):
+        features = load_features(labeled_file)
+        parameters = get_initial_parameters()
+        gradient = get_gradient(features, parameters, 1.0)
+        assert gradient.shape == (2, PARAMETER_COUNT)
+        for stage, column in [(0, PARAMETER_COUNT - 2), (1, PARAMETER_COUNT - 3), (0, 8)]:
+            shifted = parameters.copy()
+            shifted[stage, column] += 1e-3
+            numeric_gradient = (get_loss(features, shifted, 1.0) - get_loss(features, parameters, 1.0)) / 1e-3
+            assert gradient[stage, column] == pytest.approx(numeric_gradient, rel=1e-3, abs=1e-9)
+
+    def test_tuning_decreases_loss(self, labeled_file):
+        features = load_features(labeled_file)
+        parameters = get_initial_parameters()
+        k = find_scaling_constant(features, parameters)
+        tuned_parameters = tune(features, parameters, k, epochs=50)
+        assert get_loss(features, tuned_parameters, k) < get_loss(features, parameters, k)
+        assert not tuned_parameters[:, -1].any()
+
+    def test_centering_keeps_scores(self, labeled_file):
+        features = load_features(labeled_file)
+        parameters = get_initial_parameters()
+        centered_parameters = center_square_parameters(parameters)
+        tables = centered_parameters[:, :SQUARE_PARAMETER_COUNT].reshape(2, 6, 64)
+        assert np.allclose(tables.mean(axis=2), 0)
+        assert np.allclose(evaluate_features(features, centered_parameters), evaluate_features(features, parameters))
+
+    def test_tuned_tables_have_zero_mean(self, labeled_file):
+        features = load_features(labeled_file)
+        parameters = get_initial_parameters()
+        tuned_parameters = tune(features, parameters, 1.0, epochs=10)
+        tables = tuned_parameters[:, :SQUARE_PARAMETER_COUNT].reshape(2, 6, 64)
+        assert np.allclose(tables.mean(axis=2), 0)
+
+    def test_parameters_are_formatted_as_tables(self):
+        text = format_parameters(get_initial_parameters())
+        assert 'MG_PIECE_VALUES = (82, 337, 365, 477, 1025, 0)' in text
+        assert text.count('(  # king') == 2
@@ -0,0 +1,278 @@
+import asyncio
+import time
+
+import pytest
+
+from engine.book import build_book
+from engine.search import MATE_SCORE
+from engine.uci import (
+    GoParameters,
+    UCIEngine,
+    format_score,
+    get_time_manager,
+    measure_overhead,
+    parse_go,
+)
+from engine.timing import TimeManager
+from errors import InvalidNotationError
+from objects.board import Board
+from objects.enums import Color
+from objects.game import GameRecord
+from objects.notation import move_to_uci, parse_uci
+
+
+def run_commands(*lines: str) -> list[str]:
+    """
+    Returns the output of the engine for the input lines.
+    """
+    output: list[str] = []
+
+    async def run():
+        reader = asyncio.StreamReader()
+        for line in lines:
+            reader.feed_data(f'{line}\n'.encode())
+        reader.feed_eof()
+        await UCIEngine(output.append).run(reader)
+
+    asyncio.run(run())
+    return output
+
+
+async def wait_for_output(output: list[str], prefix: str, timeout: float = 5.0) -> float:
+    """
+    Waits for an output line with the prefix, returns the time it took.
+    """
+    start_time = time.monotonic()
+    while not any(line.startswith(prefix) for line in output):
+        if time.monotonic() - start_time > timeout:
+            raise TimeoutError(f'No output line starts with {prefix!r}.')
+        await asyncio.sleep(0.001)
+    return time.monotonic() - start_time
+
+
+class TestParseGo:
+    def test_parses_times_in_seconds(self):
+        parameters = parse_go(['wtime', '60000', 'btime', '30000', 'winc', '1000', 'binc', '500', 'movestogo', '20'])
+
+        assert parameters == GoParameters(wtime=60.0, btime=30.0, winc=1.0, binc=0.5, movestogo=20)
+
+    def test_parses_limits_and_flags(self):
+        parameters = parse_go(['depth', '5', 'nodes', '1000', 'movetime', '250', 'infinite', 'ponder'])
+
+        assert parameters == GoParameters(depth=5, nodes=1000, movetime=0.25, infinite=True, ponder=True)
+
+    def test_raises_error_for_missing_value(self):
+        with pytest.raises(InvalidNotationError):
+            parse_go(['depth'])
+
+
+class TestGetTimeManager:
+    def test_returns_time_manager_of_clock_of_moving_color(self):
+        parameters = GoParameters(wtime=60.0, btime=20.0, binc=1.0, movestogo=10)
+
+        white = get_time_manager(parameters, Color.WHITE)
+        black = get_time_manager(parameters, Color.BLACK)
+
+        assert white is not None and black is not None
+        assert white.soft_limit == TimeManager.from_clock(60.0, 0.0, 10).soft_limit
+        assert black.soft_limit == TimeManager.from_clock(20.0, 1.0, 10).soft_limit
+
+    def test_returns_none_without_clock(self):
+        assert get_time_manager(GoParameters(movetime=1.0), Color.WHITE) is None
+
+
+class TestFormatScore:
+    @pytest.mark.parametrize(
+        'score, expected',
+        [
+            (35, 'cp 35'),
+            (-120, 'cp -120'),
+            (MATE_SCORE - 1, 'mate 1'),
+            (MATE_SCORE - 3, 'mate 2'),
+            (-MATE_SCORE + 2, 'mate -1'),
+        ],
+    )
+    def test_formats_score(self, score, expected):
+        assert format_score(score) == expected
+
+
+class TestUCIEngine:
+    def test_uci_sends_id_and_options(self):
+        output = run_commands('uci')
+
+        assert output[0].startswith('id name ')
+        assert any(line.startswith('option name Hash') for line in output)
+        assert output[-1] == 'uciok'
+
+    def test_isready_sends_readyok(self):
+        assert run_commands('isready') == ['readyok']
+
+    def test_sends_info_string_for_unknown_command(self):
+        assert run_commands('foo', '', 'isready') == ['info string Unknown command: foo', 'readyok']
+
+    def test_go_sends_info_and_legal_bestmove(self):
+        output = run_commands('position startpos moves e2e4', 'go depth 2')
+
+        board = Board.from_fen()
+        board.make_move(parse_uci('e2e4'))
+        assert output[0].startswith('info depth 1 score ')
+        assert output[-1].startswith('bestmove ')
+        assert parse_uci(output[-1].split()[1]) in board.get_legal_moves()
+
+    def test_go_sends_null_move_without_legal_moves(self):
+        output = run_commands('position fen 7k/5QQ1/8/8/8/8/8/K7 b - - 0 1', 'go depth 1')
+
+        assert output == ['bestmove 0000']
+
+    def test_setoption_hash_resizes_table(self):
+        async def run():
+            engine = UCIEngine(lambda line: None)
+            await engine.handle('setoption name Hash value 2')
+            size = engine.tt.size
+            await engine.close()
+            return size
+
+        assert asyncio.run(run()) == 2 * 1024 * 1024
+
+    def test_setoption_sends_info_string_for_invalid_hash(self):
+        assert run_commands('setoption name Hash value 0')[0].startswith('info string ')
+
+    def test_go_plays_book_move(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        record = GameRecord()
+        record.append(parse_uci('d2d4'))
+        build_book([(record, '1-0')], path)
+
+        output = run_commands(f'setoption name BookFile value {path}', 'position startpos', 'go depth 3')
+
+        assert output == ['bestmove d2d4']
+
+
+class TestPosition:
+    async def play(self, *lines: str) -> tuple[str, list[str]]:
+        output: list[str] = []
+        engine = UCIEngine(output.append)
+        for line in lines:
+            await engine.handle(line)
+        fen = engine.board.get_fen()
+        await engine.close()
+        return fen, output
+
+    def test_sets_position_from_fen_with_moves(self):
+        fen, _ = asyncio.run(self.play('position fen 4k3/8/8/8/8/8/4P3/4K3 w - - 0 1 moves e2e4 e8d7'))
+
+        assert fen == '8/3k4/8/8/4P3/8/8/4K3 w - - 1 2'
+
+    def test_continued_position_equals_replayed_one(self):
+        continued, _ = asyncio.run(
+            self.play('position startpos moves e2e4', 'position startpos moves e2e4 e7e5 g1f3', 'isready')
+        )
+        replayed, _ = asyncio.run(self.play('position startpos moves e2e4 e7e5 g1f3'))
+
+        assert continued == replayed
+
+    def test_other_position_is_played_from_start(self):
+        fen, _ = asyncio.run(self.play('position startpos moves e2e4 e7e5', 'position startpos moves d2d4'))
+
+        assert fen == 'rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1'
+
+    @pytest.mark.parametrize(
+        'lines',
+        [
+            ('position startpos moves e2e4', 'position startpos moves e2e4 e7e5 g1f3 e8e6'),
+            ('position startpos moves e2e4', 'position fen 4k3/8/8/8/8/8/4P3/4K3 w - - 0 1 moves e2e4 e8e6'),
+        ],
+    )
+    def test_board_is_unchanged_by_position_with_illegal_move(self, lines):
+        fen, output = asyncio.run(self.play(*lines))
+
+        assert output == ['info string "e8e6" is not a legal move in this position.']
+        assert fen == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+
+    @pytest.mark.parametrize('move', ['e2e5', 'e1e2'])
+    def test_sends_info_string_for_illegal_move(self, move):
+        fen, output = asyncio.run(self.play(f'position startpos moves {move}', 'position startpos moves d2d4'))
+
+        assert output == [f'info string "{move}" is not a legal move in this position.']
+        assert fen == 'rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1'
+
+
+class TestSearchControl:
+    def test_infinite_search_sends_bestmove_only_after_stop(self):
+        async def run():
+            output: list[str] = []
+            engine = UCIEngine(output.append)
+            await engine.handle('position startpos')
+            await engine.handle('go infinite depth 1')
+            await asyncio.sleep(0.2)
+            has_bestmove = any(line.startswith('bestmove') for line in output)
+            await engine.handle('stop')
+            await wait_for_output(output, 'bestmove')
+            await engine.close()
+            return has_bestmove
+
+        assert asyncio.run(run()) is False
+
+    def test_stop_is_handled_within_milliseconds(self):
+        async def run():
+            output: list[str] = []
+            engine = UCIEngine(output.append)
+            await engine.handle('position startpos')
+            await engine.handle('go infinite')
+            await asyncio.sleep(0.2)
+            await engine.handle('isready')
+            await wait_for_output(output, 'readyok')
+            await engine.handle('stop')
+            latency = await wait_for_output(output, 'bestmove')
+            await engine.close()
+            return latency
+
+        assert asyncio.run(run()) < 0.2
+
+    def test_ponderhit_turns_ponder_search_into_timed_search(self):
+        async def run():
+            output: list[str] = []
+            engine = UCIEngine(output.append)
+            await engine.handle('position startpos moves e2e4')
+            await engine.handle('go ponder movetime 100')
+            await asyncio.sleep(0.3)
+            has_bestmove = any(line.startswith('bestmove') for line in output)
+            await engine.handle('ponderhit')
+            latency = await wait_for_output(output, 'bestmove')
+            await engine.close()
+            return has_bestmove, latency
+
+        has_bestmove, latency = asyncio.run(run())
+        assert not has_bestmove
+        assert latency < 1.0
+
+    def test_go_with_clock_sends_bestmove_within_hard_limit(self):
+        async def run():
+            output: list[str] = []
+            engine = UCIEngine(output.append)
+            await engine.handle('position startpos')
+            await engine.handle('go wtime 3000 btime 3000 movestogo 10')
+            latency = await wait_for_output(output, 'bestmove')
+            await engine.close()
+            return latency
+
+        assert asyncio.run(run()) < TimeManager.from_clock(3.0, 0.0, 10).hard_limit + 0.2
+
+    def test_quit_stops_search(self):
+        output = run_commands('position startpos', 'go infinite', 'quit', 'isready')
+
+        assert output[-1].startswith('bestmove ')
+        assert 'readyok' not in output
+
+
+class TestMeasureOverhead:
+    def test_commands_take_less_than_millisecond(self):
+        board = Board.from_fen()
+        moves = []
+        for _ in range(40):
+            move = board.get_legal_moves()[0]
+            board.make_move(move)
+            moves.append(move_to_uci(move))
+        commands = ['isready', f'position startpos moves {" ".join(moves)}', 'stop']
+
+        assert asyncio.run(measure_overhead(commands, repeat=20)) < 0.001